@@ -29,16 +29,16 @@ def case_add_b():
 
 
 def case_head_1():
-    return _head_1, "23b362418a183441"
+    return _head_1, "7d294beb2c0c74ed"
 
 
 def case_head_2():
-    return _head_2, "2368d8afb89a6e79"
+    return _head_2, "e0344152c79000c7"
 
 
 def case_tail_1():
-    return _tail_1, "b17afcbd2bd14646"
+    return _tail_1, "e3c8d0a2850238da"
 
 
 def case_tail_2():
-    return _tail_2, "13bd182422f49e24"
+    return _tail_2, "72046accbf73c431"
@@ -2,8 +2,22 @@
 import pathlib
 
 import cachelib
+import pytest
 from pytest_cases import fixture
 
+from wingline.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path_factory, monkeypatch):
+    """Keep gzip indexes out of the user's cache directory."""
+
+    path = tmp_path_factory.mktemp("index")
+    monkeypatch.setattr(settings, "index_dir", path)
+    # For worker processes, which read their settings afresh.
+    monkeypatch.setenv("WL_INDEX_DIR", str(path))
+    return path
+
 
 @fixture
 def testing_cache():
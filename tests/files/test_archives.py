@@ -0,0 +1,61 @@
+"""Test reading archives member by member."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from wingline.files import containers, filetype, reader
+from wingline.files.containers import _parallel
+
+MEMBERS = {
+    f"drop/{i:02}.jsonl": b"".join(
+        b'{"file": %d, "line": %d}\n' % (i, j) for j in range(i * 100)
+    )
+    for i in range(10)
+}
+EXPECTED = [{"file": i, "line": j} for i in range(10) for j in range(i * 100)]
+
+
+def _write_tar(path, mode):
+    with tarfile.open(path, mode) as archive:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo("drop/README")
+        readme = b"Not data.\n"
+        info.size = len(readme)
+        archive.addfile(info, io.BytesIO(readme))
+
+
+def _write_zip(path, mode):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+        archive.writestr("drop/README", b"Not data.\n")
+
+
+@pytest.mark.parametrize(
+    "suffix,write,mode,container_type",
+    [
+        (".tar", _write_tar, "w", containers.Tar),
+        (".tar.gz", _write_tar, "w:gz", containers.Tar),
+        (".tar.bz2", _write_tar, "w:bz2", containers.Tar),
+        (".tar.xz", _write_tar, "w:xz", containers.Tar),
+        (".zip", _write_zip, None, containers.Zip),
+    ],
+)
+def test_archive(tmp_path, monkeypatch, suffix, write, mode, container_type):
+    """Members are detected and read in order, skipping unknown ones."""
+
+    monkeypatch.setattr(_parallel, "THREADS", 3)
+    path = tmp_path / f"drop{suffix}"
+    write(path, mode)
+
+    assert filetype.sniff(path) == (container_type, None)
+    with reader.Reader(path, fields={"line"}) as payloads:
+        result = list(payloads)
+
+    assert result == [{"line": payload["line"]} for payload in EXPECTED]
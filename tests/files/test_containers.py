@@ -0,0 +1,93 @@
+"""Test the compression containers."""
+
+import bz2
+import io
+import lzma
+
+import pytest
+
+from wingline.exceptions import UnsupportedContainerError
+from wingline.files import containers, filetype
+from wingline.files.containers import _parallel
+
+DATA = b"".join(b'{"id": %d}\n' % i for i in range(200000))
+
+
+def _container_types():
+    yield containers.Bz2, ".bz2"
+    yield containers.Xz, ".xz"
+    yield pytest.param(
+        containers.Zstd,
+        ".zst",
+        marks=pytest.mark.skipif(
+            containers.zstd.zstandard is None, reason="zstandard not installed"
+        ),
+    )
+    yield pytest.param(
+        containers.Lz4,
+        ".lz4",
+        marks=pytest.mark.skipif(
+            containers.lz4.lz4 is None, reason="lz4 not installed"
+        ),
+    )
+
+
+@pytest.mark.parametrize("container_type,suffix", _container_types())
+def test_roundtrip(tmp_path, container_type, suffix):
+    """Content written through a container reads back and is detected."""
+
+    path = tmp_path / f"data.jl{suffix}"
+    with container_type(path).write_handle() as handle:
+        handle.write(DATA)
+
+    with container_type(path).handle() as handle:
+        assert handle.read() == DATA
+    container, format = filetype.sniff(path)
+    assert container is container_type
+    assert format is not None
+
+
+def test_multistream_compatible(tmp_path, monkeypatch):
+    """Chunked writes are ordinary concatenated streams."""
+
+    monkeypatch.setattr(containers.bz2, "CHUNK_SIZE", 100000)
+    monkeypatch.setattr(containers.xz, "CHUNK_SIZE", 100000)
+    bz2_path = tmp_path / "data.bz2"
+    xz_path = tmp_path / "data.xz"
+    with containers.Bz2(bz2_path).write_handle() as handle:
+        handle.write(DATA)
+    with containers.Xz(xz_path).write_handle() as handle:
+        handle.write(DATA)
+
+    assert bz2.decompress(bz2_path.read_bytes()) == DATA
+    assert lzma.decompress(xz_path.read_bytes()) == DATA
+
+
+def test_unsupported_container(tmp_path):
+    """A recognised archive we can't read raises rather than reading garbage."""
+
+    path = tmp_path / "data.7z"
+    path.write_bytes(b"7z\xbc\xaf\x27\x1c" + bytes(100))
+
+    with pytest.raises(UnsupportedContainerError):
+        filetype.sniff(path)
+
+
+def test_background_writer_order_and_errors():
+    """Buffers are written in order, and a failing handle's error surfaces."""
+
+    output = io.BytesIO()
+    with _parallel.BackgroundWriter(output, buffer_size=100) as handle:
+        for i in range(1000):
+            handle.write(b"%d\n" % i)
+    assert output.getvalue() == b"".join(b"%d\n" % i for i in range(1000))
+    assert not output.closed
+
+    class Broken(io.BytesIO):
+        def write(self, data):
+            raise OSError("Disk full")
+
+    with pytest.raises(OSError, match="Disk full"):
+        with _parallel.BackgroundWriter(Broken(), buffer_size=10) as handle:
+            for i in range(1000):
+                handle.write(b"%d\n" % i)
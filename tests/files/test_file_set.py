@@ -0,0 +1,120 @@
+"""Test reading sets of files."""
+
+import gzip
+
+import pytest
+
+from wingline import Pipeline
+from wingline.files import containers, file_set
+from wingline.files.containers import gzip_index
+from wingline.helpers import select
+from wingline.plumbing import file as file_tap
+
+
+@pytest.fixture
+def drop(tmp_path):
+    """A directory of jsonl shards, some gzipped, some nested."""
+
+    directory = tmp_path / "drop"
+    (directory / "nested").mkdir(parents=True)
+    for i in range(12):
+        lines = b"".join(b'{"file": %d, "line": %d}\n' % (i, j) for j in range(i * 50))
+        if i % 3:
+            (directory / f"{i:02}.jsonl").write_bytes(lines)
+        else:
+            with gzip.open(directory / "nested" / f"{i:02}.jsonl.gz", "wb") as handle:
+                handle.write(lines)
+    return directory
+
+
+def test_expand(drop):
+    """Directories, globs and manifests expand to the same files."""
+
+    paths = file_set.expand(drop)
+    assert len(paths) == 12
+    assert file_set.expand(f"{drop}/**/*.jsonl*") == paths
+
+    manifest = drop.parent / "manifest.txt"
+    manifest.write_text("\n".join(str(path.relative_to(drop.parent)) for path in paths))
+    assert file_set.expand(manifest) == paths
+
+
+def test_read_twice(tmp_path):
+    """Reading blocked gzip files leaves nothing behind to read next time."""
+
+    directory = tmp_path / "drop"
+    directory.mkdir()
+    for i in range(2):
+        with containers.Gzip(directory / f"{i}.jsonl.gz").write_handle() as handle:
+            handle.write(
+                b"".join(b'{"file": %d, "line": %d}\n' % (i, j) for j in range(10))
+            )
+    # A sidecar saved beside a file by an earlier version.
+    (directory / f"0.jsonl.gz{gzip_index.INDEX_SUFFIX}").write_bytes(b"\x80")
+
+    reads = [file_set.FileSet(directory) for _ in range(2)]
+    first, second = (list(files) for files in reads)
+
+    assert len(first) == 20
+    assert second == first
+    assert reads[1].content_hash == reads[0].content_hash
+    assert [path.name for path in reads[1].paths] == ["0.jsonl.gz", "1.jsonl.gz"]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_read(drop, ordered):
+    """Every payload of every file is read, file by file if ordered."""
+
+    files = file_set.FileSet(drop, readers=3, ordered=ordered)
+
+    payloads = list(files)
+
+    expected = [
+        {"file": i, "line": j}
+        for path in files.paths
+        for i in [int(path.name[:2])]
+        for j in range(i * 50)
+    ]
+    if ordered:
+        assert payloads == expected
+    else:
+        key = lambda payload: (payload["file"], payload["line"])
+        assert sorted(payloads, key=key) == sorted(expected, key=key)
+    progress = files.progress
+    assert all(entry.complete for entry in progress.values())
+    assert sum(entry.payloads for entry in progress.values()) == len(expected)
+
+
+def test_stop_early(drop):
+    """Abandoning the stream stops the readers."""
+
+    files = file_set.FileSet(drop, readers=2)
+    iterator = iter(files)
+    assert next(iterator) == {"file": 1, "line": 0}
+    iterator.close()
+
+    assert not all(entry.complete for entry in files.progress.values())
+
+
+def test_hash(drop):
+    """The hash follows the files' content, not their location or mtime."""
+
+    original = file_set.FileSet(drop).content_hash
+    moved = drop.rename(drop.parent / "moved")
+    assert file_set.FileSet(moved).content_hash == original
+
+    (moved / "01.jsonl").write_bytes(b'{"file": 1}\n')
+    assert file_set.FileSet(moved).content_hash != original
+
+
+def test_files_tap(drop):
+    """The tap runs in a pipeline and takes pushed-down projections."""
+
+    source = file_tap.Files(drop)
+    pipeline = Pipeline(source, select("line"))
+
+    result = list(pipeline)
+
+    assert len(result) == sum(i * 50 for i in range(12))
+    assert all(payload.keys() == {"line"} for payload in result)
+    assert source.reader.fields == {"line"}
@@ -1,8 +1,10 @@
 """Test filetype detection."""
 
+import gzip
+
 from pytest_cases import parametrize_with_cases
 
-from wingline.files import filetype
+from wingline.files import containers, filetype, formats
 
 
 @parametrize_with_cases(
@@ -35,3 +37,19 @@ def test_get_filetype(path, content_hash, container, format, line_count):
     actual_filetype = filetype.detect_format(actual_container)
 
     assert actual_filetype == format
+
+
+def test_sniff_cached(tmp_path):
+    """Detection is cached by path and stat."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(b'{"a": 1}\n')
+    assert filetype.sniff(path) == (containers.Mmap, formats.JsonLines)
+    hits = filetype._sniff.cache_info().hits
+    assert filetype.sniff(path) == (containers.Mmap, formats.JsonLines)
+    assert filetype._sniff.cache_info().hits == hits + 1
+
+    # A changed file is detected afresh.
+    with gzip.open(path, "wb") as handle:
+        handle.write(b'{"a": 1}\n')
+    assert filetype.sniff(path) == (containers.Gzip, formats.JsonLines)
@@ -1,8 +1,11 @@
 """Test format detection."""
 
+import io
+
+import pytest
 from pytest_cases import parametrize_with_cases
 
-from wingline.files import file
+from wingline.files import file, formats
 
 
 @parametrize_with_cases(
@@ -14,3 +17,20 @@ def test_dynamo_gz(path, content_hash, container, format, line_count):
     test_file = file.File(path)
     assert test_file.reader.format_type.mime_type == "application/json"
     assert test_file.reader.container.mime_type == "application/gzip"
+
+
+@pytest.mark.parametrize("format_type", [formats.JsonLines, formats.Msgpack])
+def test_write_many(format_type):
+    """Batched writes match record-at-a-time writes and read back."""
+
+    payloads = [{"id": i, "name": f"name {i}", "tags": ["a", "b"]} for i in range(100)]
+    single, batched = io.BytesIO(), io.BytesIO()
+
+    for payload in payloads:
+        format_type(single).writer(payload)
+    format_type(batched).batch_writer(payloads)
+    format_type(batched).batch_writer([])
+
+    assert batched.getvalue() == single.getvalue()
+    batched.seek(0)
+    assert list(format_type(batched).reader) == payloads
@@ -0,0 +1,150 @@
+"""Test the gzip container."""
+
+import gzip
+
+import pytest
+from pytest_cases import parametrize_with_cases
+
+from wingline import hasher
+from wingline.files import containers
+from wingline.files.containers import bgzf, gzip_index
+from wingline.settings import settings
+
+
+def test_blocked_roundtrip(tmp_path):
+    """Written files are multi-block, standard gzip and read back intact."""
+
+    path = tmp_path / "data.jl.gz"
+    data = b"".join(b'{"id": %d}\n' % i for i in range(100000))
+    assert len(data) > 2 * bgzf.BLOCK_SIZE
+
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(data)
+
+    assert bgzf.is_blocked(path)
+    assert gzip.decompress(path.read_bytes()) == data
+    with containers.Gzip(path).handle() as handle:
+        assert handle.read() == data
+    with containers.Gzip(path).handle() as handle:
+        assert list(handle) == data.splitlines(keepends=True)
+
+
+def test_blocked_then_plain_members(tmp_path):
+    """A plain gzip member after the blocks is still read."""
+
+    path = tmp_path / "data.jl.gz"
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(b"blocked\n")
+    with gzip.open(path, "ab") as handle:
+        handle.write(b"plain\n")
+
+    with containers.Gzip(path).handle() as handle:
+        assert handle.read() == b"blocked\nplain\n"
+
+
+@parametrize_with_cases(
+    "path,content_hash,container,format,line_count", cases="tests.cases.files"
+)
+def test_unblocked(path, content_hash, container, format, line_count):
+    """Ordinary gzip files are read sequentially."""
+
+    assert not bgzf.is_blocked(path)
+    with containers.Gzip(path).handle() as handle:
+        assert len(list(handle)) == line_count
+
+
+def test_is_blocked_cached(tmp_path):
+    """The header is read once per version of a file."""
+
+    path = tmp_path / "data.jl.gz"
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(b"blocked\n")
+    assert bgzf.is_blocked(path)
+    hits = bgzf._is_blocked.cache_info().hits
+    assert bgzf.is_blocked(path)
+    assert bgzf._is_blocked.cache_info().hits == hits + 1
+
+    path.write_bytes(gzip.compress(b"plain and rewritten\n"))
+    assert not bgzf.is_blocked(path)
+
+
+def test_index_built_on_first_read(tmp_path):
+    """Reading a blocked file to the end saves an index, not beside it."""
+
+    path = tmp_path / "data.jl.gz"
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(b"".join(b'{"id": %d}\n' % i for i in range(100000)))
+    index_path = gzip_index.GzipIndex.index_path(path)
+    assert not index_path.exists()
+
+    with containers.Gzip(path).handle() as handle:
+        for _ in handle:
+            pass
+    assert index_path.exists()
+    assert list(tmp_path.iterdir()) == [path]
+    index = gzip_index.GzipIndex.load(path)
+    assert index is not None
+    assert index.lines == 100000
+    assert index.content_hash == hasher.hash_file(path)
+
+
+def test_index_disabled(tmp_path, monkeypatch):
+    """With the setting off, no index is built or saved."""
+
+    monkeypatch.setattr(settings, "gzip_index", False)
+    path = tmp_path / "data.jl.gz"
+    data = b"".join(b'{"id": %d}\n' % i for i in range(100000))
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(data)
+
+    with containers.Gzip(path).handle() as handle:
+        assert handle.read() == data
+    assert containers.Gzip(path).index().lines == 100000
+    assert not gzip_index.GzipIndex.index_path(path).exists()
+    assert gzip_index.GzipIndex.load(path) is None
+
+
+def test_index_not_writable(tmp_path, monkeypatch):
+    """A file reads the same where its index can't be saved."""
+
+    monkeypatch.setattr(settings, "index_dir", tmp_path / "file")
+    (tmp_path / "file").write_bytes(b"")
+    path = tmp_path / "data.jl.gz"
+    with containers.Gzip(path).write_handle() as handle:
+        handle.write(b"".join(b'{"id": %d}\n' % i for i in range(1000)))
+
+    for _ in range(2):
+        with containers.Gzip(path).handle() as handle:
+            assert len(list(handle)) == 1000
+    assert gzip_index.GzipIndex.load(path) is None
+
+
+@pytest.mark.parametrize("blocked", [True, False])
+def test_random_access(tmp_path, blocked):
+    """Handles can start at any line or offset."""
+
+    path = tmp_path / "data.jl.gz"
+    lines = [b'{"id": %d}\n' % i for i in range(100000)]
+    data = b"".join(lines)
+    if blocked:
+        with containers.Gzip(path).write_handle() as handle:
+            handle.write(data)
+    else:
+        # Several plain members, as from concatenated gzip files.
+        path.write_bytes(
+            b"".join(
+                gzip.compress(data[i : i + 100000]) for i in range(0, len(data), 100000)
+            )
+        )
+
+    container = containers.Gzip(path)
+    index = container.index(span=50000)
+    assert len(index.points) > 2
+    assert index.size == len(data)
+
+    for line in (0, 1, 4321, 54321, 99999):
+        with container.handle_at_line(line) as handle:
+            assert handle.readline() == lines[line]
+    for offset in (0, 17, 123456, len(data) - 3):
+        with container.handle_at(offset) as handle:
+            assert handle.read(3) == data[offset : offset + 3]
@@ -0,0 +1,50 @@
+"""Test the memory-mapped container."""
+
+import mmap
+import os
+import threading
+
+import pytest
+
+from wingline.files import containers, formats, reader
+
+DATA = b"".join(b'{"id": %d}\n' % i for i in range(1000)) + b'{"id": 1000}'
+
+
+def test_mapped_lines(tmp_path):
+    """Plain files are mapped and read line by line, last line unterminated."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(DATA)
+
+    with containers.Mmap(path).handle() as handle:
+        assert isinstance(handle, mmap.mmap)
+        assert list(formats._base.lines(handle)) == DATA.splitlines(keepends=True)
+    with reader.Reader(path) as payloads:
+        assert [payload["id"] for payload in payloads] == list(range(1001))
+
+
+def test_empty_file(tmp_path):
+    """Empty files can't be mapped, so are opened normally."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(b"")
+
+    with containers.Mmap(path).handle() as handle:
+        assert not isinstance(handle, mmap.mmap)
+        assert handle.read() == b""
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="No named pipes")
+def test_pipe(tmp_path):
+    """Non-regular files are opened normally."""
+
+    path = tmp_path / "data.jsonl"
+    os.mkfifo(path)
+    writer = threading.Thread(target=path.write_bytes, args=(DATA,))
+    writer.start()
+
+    with containers.Mmap(path).handle() as handle:
+        assert not isinstance(handle, mmap.mmap)
+        assert handle.read() == DATA
+    writer.join()
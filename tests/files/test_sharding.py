@@ -0,0 +1,69 @@
+"""Test sharded reading of single files."""
+
+import gzip
+
+import pytest
+
+from wingline.files import containers, file, sharding
+from wingline.plumbing import file as file_tap
+
+LINES = [b'{"id": %d, "pad": "%s"}\n' % (i, b"x" * (i % 37)) for i in range(5000)]
+DATA = b"".join(LINES)
+
+
+@pytest.mark.parametrize("shard_size", [1, 7, 100, 4096, len(DATA)])
+def test_shards_cover_lines(tmp_path, shard_size):
+    """Every line is read exactly once, whatever the shard boundaries."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(DATA)
+    container = containers.Mmap(path)
+
+    shards = sharding.plan(len(DATA), shard_size)
+    data = b"".join(sharding.read_shard_bytes(container, shard) for shard in shards)
+
+    assert data == DATA
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_sharded_file(tmp_path, monkeypatch, ordered, suffix):
+    """A sharded read yields the same payloads as a sequential one."""
+
+    monkeypatch.setattr(sharding, "SHARD_SIZE", 10000)
+    path = tmp_path / f"data{suffix}"
+    container_type = containers.Gzip if suffix.endswith(".gz") else containers.Mmap
+    with container_type(path).write_handle() as handle:
+        handle.write(DATA)
+    source = file.File(path, workers=2, ordered=ordered)
+    assert sharding.is_splittable(source.reader)
+
+    payloads = list(source)
+
+    expected = list(file.File(path))
+    assert len(payloads) == len(expected) == len(LINES)
+    if ordered:
+        assert payloads == expected
+    else:
+        assert sorted(payloads, key=lambda p: p["id"]) == expected
+
+
+def test_unordered_hash(tmp_path):
+    """Unordered taps don't share a hash with the file."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(DATA)
+
+    assert file_tap.File(path, workers=2).hash == file_tap.File(path).hash
+    assert (
+        file_tap.File(path, workers=2, ordered=False).hash != file_tap.File(path).hash
+    )
+    assert file_tap.File(path, ordered=False).hash == file_tap.File(path).hash
+
+    # A file that can't be split is read in order whatever is asked.
+    path = tmp_path / "data.jsonl.gz"
+    with gzip.open(path, "wb") as handle:
+        handle.write(DATA)
+    assert (
+        file_tap.File(path, workers=2, ordered=False).hash == file_tap.File(path).hash
+    )
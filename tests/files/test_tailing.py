@@ -0,0 +1,66 @@
+"""Test reading the tails of files."""
+
+import io
+
+import pytest
+
+from wingline import Pipeline, helpers
+from wingline.files import containers, file, tailing
+from wingline.plumbing import file as file_tap
+
+LINES = [b'{"id": %d, "pad": "%s"}\n' % (i, b"x" * (i % 37)) for i in range(5000)]
+DATA = b"".join(LINES)
+PAYLOADS = [{"id": i, "pad": "x" * (i % 37)} for i in range(5000)]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 4096])
+@pytest.mark.parametrize("trailing", [b"", b"\n"])
+def test_line_start(monkeypatch, read_size, trailing):
+    monkeypatch.setattr(tailing, "READ_SIZE", read_size)
+    data = b"a\nbb\nccc" + trailing
+    handle = io.BytesIO(data)
+    starts = [tailing.line_start(handle, len(data), lines) for lines in range(1, 5)]
+    assert starts == [5, 2, 0, 0]
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+@pytest.mark.parametrize("count", [0, 1, 10, 5000, 6000])
+def test_tail_pushed_down(tmp_path, suffix, count):
+    """A tail straight after a file tap reads only the end of the file."""
+
+    path = tmp_path / f"data{suffix}"
+    container_type = containers.Gzip if suffix.endswith(".gz") else containers.Mmap
+    with container_type(path).write_handle() as handle:
+        handle.write(DATA)
+    source = file_tap.File(path)
+    pipeline = Pipeline(source, helpers.tail(count))
+
+    result = list(pipeline)
+
+    assert source.reader.tail == count
+    assert result == (PAYLOADS[-count:] if count else [])
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_tail_no_final_newline(tmp_path, suffix):
+    path = tmp_path / f"data{suffix}"
+    container_type = containers.Gzip if suffix.endswith(".gz") else containers.Mmap
+    with container_type(path).write_handle() as handle:
+        handle.write(DATA.rstrip(b"\n"))
+    source = file.File(path)
+    source.reader.tail = 3
+    assert list(source) == PAYLOADS[-3:]
+
+
+def test_tail_after_filter(tmp_path):
+    """A tail after a filter is the tail of the filtered payloads."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(DATA)
+    source = file_tap.File(path)
+    pipeline = Pipeline(source, helpers.where(pad=""), helpers.tail(2))
+
+    result = list(pipeline)
+
+    assert source.reader.tail is None
+    assert result == [payload for payload in PAYLOADS if not payload["pad"]][-2:]
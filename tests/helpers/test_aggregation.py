@@ -0,0 +1,70 @@
+import collections
+import random
+
+import pytest
+
+from wingline import Pipeline, helpers
+
+
+def test_group_by(simple_data):
+
+    test_pipe = Pipeline(
+        simple_data,
+        helpers.group_by("first_aired").aggregate(count=helpers.count()),
+    )
+    result = list(test_pipe)
+    expected = collections.Counter(item["first_aired"] for item in simple_data)
+    assert {item["first_aired"]: item["count"] for item in result} == expected
+
+
+@pytest.mark.parametrize("max_groups", [1000, 2])
+def test_aggregate(tmp_path, max_groups):
+    """Rollups are the same in memory and spilled to disk."""
+
+    payloads = [
+        {"key": i % 50, "parity": i % 2, "value": i, "tag": i % 7} for i in range(2000)
+    ]
+    payloads.append({"key": 0, "parity": 0})
+    random.shuffle(payloads)
+    operation = helpers.group_by(
+        ("key", "parity"), max_groups=max_groups, temp_dir=tmp_path
+    ).aggregate(
+        count=helpers.count(),
+        values=helpers.count("value"),
+        total=helpers.total("value"),
+        minimum=helpers.minimum("value"),
+        maximum=helpers.maximum("value"),
+        mean=helpers.mean("value"),
+        tags=helpers.distinct("tag"),
+    )
+    result = sorted(operation(iter(payloads)), key=lambda item: item["key"])
+
+    assert len(result) == 50
+    first = result[0]
+    values = list(range(0, 2000, 50))
+    assert first == {
+        "key": 0,
+        "parity": 0,
+        "count": 41,
+        "values": 40,
+        "total": sum(values),
+        "minimum": 0,
+        "maximum": 1950,
+        "mean": sum(values) / 40,
+        "tags": 7,
+    }
+    assert not list(tmp_path.iterdir())
+
+
+def test_distinct_estimate():
+    """Large groups switch to HyperLogLog, within its expected error."""
+
+    distinct = helpers.distinct("value", precision=12)
+    halves = []
+    for start in (0, 50_000):
+        state = distinct.initial()
+        for value in range(start, start + 60_000):
+            state = distinct.add(state, {"value": value})
+        halves.append(state)
+    estimate = distinct.result(distinct.merge(*halves))
+    assert abs(estimate - 110_000) < 110_000 * 0.05
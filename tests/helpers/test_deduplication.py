@@ -0,0 +1,44 @@
+import pytest
+
+from wingline import Pipeline, hasher, helpers
+from wingline.helpers import deduplication
+
+
+def test_dedupe(simple_data):
+
+    test_pipe = Pipeline(simple_data + simple_data, helpers.dedupe())
+    result = list(test_pipe)
+    assert result == simple_data
+
+
+@pytest.mark.parametrize("mode", deduplication.MODES)
+@pytest.mark.parametrize(
+    "key", ["id", ("id", "parity"), lambda payload: payload["id"] % 1000]
+)
+def test_dedupe_key(mode, key):
+    """The first payload for each key is kept, past a digest set resize."""
+
+    payloads = [{"id": i % 1000, "parity": i % 2, "n": i} for i in range(200_000)]
+    dedupe = helpers.dedupe(key, mode=mode, capacity=2000)
+    result = list(dedupe(iter(payloads)))
+    assert result == payloads[:1000]
+
+
+def test_digest_set_grows():
+    digests = deduplication.DigestSet(8)
+    assert all(digests.add(digest) for digest in range(1, 101))
+    assert not any(digests.add(digest) for digest in range(1, 101))
+    assert len(digests) == 100
+
+
+def _digest(number):
+    return int.from_bytes(hasher.hasher(b"%d" % number, digest_size=16).digest(), "big")
+
+
+def test_bloom_false_positive_rate():
+    bloom = deduplication.BloomFilter(10_000, 0.01)
+    for number in range(10_000):
+        bloom.add(_digest(number))
+    assert all(_digest(number) in bloom for number in range(10_000))
+    false_positives = sum(_digest(number) in bloom for number in range(10_000, 20_000))
+    assert false_positives < 10_000 * 0.02
@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+from wingline import Pipeline, hasher, helpers
+from wingline.files import formats, writer
+from wingline.plumbing.tap import Tap
+
+SHOWS = [
+    {"show_id": 1, "name": "Doctor Who"},
+    {"show_id": 2, "name": "24"},
+    {"show_id": 2, "name": "24: Legacy"},
+]
+CASTS = [
+    {"show_id": 1, "actor": "Jodie Whittaker"},
+    {"show_id": 2, "actor": "Kiefer Sutherland"},
+    {"show_id": 3, "actor": "Nobody"},
+    {"actor": "Anonymous"},
+]
+
+
+@pytest.mark.parametrize("memory_rows", [1000, 0])
+def test_join(memory_rows):
+
+    test_pipe = Pipeline(
+        CASTS, helpers.join(SHOWS, on="show_id", memory_rows=memory_rows)
+    )
+    assert list(test_pipe) == [
+        {"show_id": 1, "name": "Doctor Who", "actor": "Jodie Whittaker"},
+        {"show_id": 2, "name": "24", "actor": "Kiefer Sutherland"},
+        {"show_id": 2, "name": "24: Legacy", "actor": "Kiefer Sutherland"},
+    ]
+
+
+@pytest.mark.parametrize("memory_rows", [1000, 0])
+def test_left_join_on_fields(memory_rows):
+
+    join = helpers.join(
+        SHOWS, on=("show_id", "name"), how="left", memory_rows=memory_rows
+    )
+    casts = [{"show_id": 2, "name": "24", "actor": "Kiefer Sutherland"}, *CASTS]
+    assert list(join(iter(casts))) == casts
+
+
+def test_join_file_cached(tmp_path):
+    """A file side's index is kept in the cache dir by content hash."""
+
+    path = tmp_path / "shows.jsonl"
+    with writer.Writer(path, formats.JsonLines) as write:
+        for show in SHOWS:
+            write(show)
+    cache_dir = tmp_path / "cache"
+    join = helpers.join(path, on="show_id", cache_dir=cache_dir)
+    first = list(join(iter(CASTS)))
+
+    content_hash = hasher.hash_file(path)
+    (index,) = cache_dir.glob("*/*.join")
+    assert index.name == f"{content_hash}.show_id.join"
+
+    # A new join over the same content reuses the index.
+    path.unlink()
+    join = helpers.join(SHOWS, on="show_id", cache_dir=cache_dir)
+    join.other_hash = content_hash
+    assert list(join(iter(CASTS))) == first
+
+
+def test_join_pipeline_without_hash(tmp_path):
+    """A pipeline side over in-memory data is hashed by its content."""
+
+    join = helpers.join(Pipeline(SHOWS), on="show_id", cache_dir=tmp_path)
+    assert join.other_hash == helpers.join(SHOWS, on="show_id").other_hash
+    assert list(join(iter(CASTS))) == list(
+        helpers.join(SHOWS, on="show_id")(iter(CASTS))
+    )
+
+
+@pytest.mark.parametrize(
+    "make_side", [lambda: Tap(SHOWS, "shows"), lambda: iter(SHOWS)]
+)
+def test_join_one_shot_side(make_side):
+    """A side that can only be read once is read into memory once."""
+
+    expected = helpers.join(SHOWS, on="show_id")
+    join = helpers.join(make_side(), on="show_id")
+    assert join.other_hash == expected.other_hash
+    assert list(join(iter(CASTS))) == list(expected(iter(CASTS)))
+    # Likewise if the index is built before the side is hashed.
+    join = helpers.join(make_side(), on="show_id")
+    assert list(join(iter(CASTS))) == list(expected(iter(CASTS)))
+    assert join.other_hash == expected.other_hash
+
+
+def test_join_pickles_light():
+    """Hashing a join doesn't pickle the side."""
+
+    shows = [{"show_id": i, "name": "x" * 100} for i in range(10_000)]
+    join = helpers.join(shows, on="show_id")
+    assert len(pickle.dumps(join)) < 1000
+    assert hasher.hash_callable(join) == hasher.hash_callable(
+        helpers.join(list(shows), on="show_id")
+    )
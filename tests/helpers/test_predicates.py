@@ -0,0 +1,90 @@
+"""Test the declarative filter helpers."""
+
+from pytest_cases import parametrize_with_cases
+
+from wingline import Pipeline, helpers
+from wingline.files import reader
+from wingline.plumbing import file
+
+
+def test_where_equals(simple_data):
+
+    test_pipe = Pipeline(simple_data, helpers.where(name="24"))
+    assert list(test_pipe) == [simple_data[1]]
+
+
+def test_where_predicates(simple_data):
+
+    where = helpers.where(
+        helpers.one_of("first_aired", ["1963", "1999"]),
+        helpers.prefix("name", "The "),
+        helpers.exists("name"),
+    )
+    test_pipe = Pipeline(simple_data, where)
+    assert list(test_pipe) == [simple_data[2]]
+
+
+def test_where_nested():
+
+    data = [{"type": {"S": "item"}}, {"type": {"N": "1"}}, {"type": "item"}]
+    test_pipe = Pipeline(data, helpers.where(helpers.equals(("type", "S"), "item")))
+    assert list(test_pipe) == data[:1]
+
+
+def test_prefilter():
+
+    where = helpers.where(helpers.prefix("name", "Doc"), first_aired="1963")
+    assert where.prefilter(b'{"name": "Doctor Who", "first_aired": "1963"}')
+    assert not where.prefilter(b'{"name": "24", "first_aired": "1963"}')
+    # Values that could be escaped or reformatted are never prefiltered.
+    assert helpers.where(name="Döctor").prefilter(b'{"name": "D\\u00f6ctor"}')
+    assert helpers.where(count=1).prefilter(b'{"count": 1.0}')
+    assert helpers.where(flag=True).prefilter(b'{"flag": 1}')
+
+
+def test_where_bool_pushed_down(tmp_path):
+    """Booleans match the numbers they equal, pushed down or not."""
+
+    path = tmp_path / "flags.jsonl"
+    path.write_bytes(
+        b'{"flag": 1}\n{"flag": true}\n{"flag": 1.0}\n{"flag": 0}\n{"flag": false}\n'
+    )
+    where = helpers.where(helpers.equals("flag", True))
+    with reader.Reader(path) as file_reader:
+        expected = list(where(file_reader))
+    assert len(expected) == 3
+
+    source = file.File(path)
+    assert list(Pipeline(source, where)) == expected
+    assert source.file.reader.prefilter is not None
+
+
+def test_where_then_select_pushed_down(tmp_path):
+    """A select after a pushed-down where keeps the fields it tests."""
+
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(b'{"a": 1, "b": 1, "c": 1}\n{"a": 2, "b": 2, "c": 2}\n')
+    source = file.File(path)
+    test_pipe = Pipeline(source, helpers.where(b=1), helpers.select("a"))
+    assert list(test_pipe) == [{"a": 1}]
+    assert source.file.reader.fields == {"a", "b"}
+
+
+@parametrize_with_cases(
+    "path,content_hash,container,format,item_count", cases="tests.cases.files"
+)
+def test_where_pushed_down(path, content_hash, container, format, item_count):
+    """A where directly after a file prefilters the raw lines."""
+
+    where = helpers.where(
+        helpers.prefix(("title", "S"), "Q4"), helpers.equals(("type", "S"), "item")
+    )
+    with reader.Reader(path) as file_reader:
+        expected = list(where(file_reader))
+    assert 0 < len(expected) < item_count
+
+    source = file.File(path)
+    test_pipe = Pipeline(source, where)
+    result = list(test_pipe)
+    assert source.file.reader.prefilter is not None
+    assert result == expected
@@ -0,0 +1,59 @@
+"""Test the projection helpers."""
+
+from pytest_cases import parametrize_with_cases
+
+from wingline import Pipeline, helpers
+from wingline.files import formats, reader, writer
+from wingline.plumbing import file
+
+
+def test_select(simple_data):
+
+    test_pipe = Pipeline(simple_data, helpers.select("name"))
+    result = list(test_pipe)
+    assert result == [{"name": item["name"]} for item in simple_data]
+
+
+def test_pipeline_fields(simple_data):
+
+    test_pipe = Pipeline(simple_data, fields=["first_aired", "missing"])
+    result = list(test_pipe)
+    assert result == [{"first_aired": item["first_aired"]} for item in simple_data]
+
+
+@parametrize_with_cases(
+    "path,content_hash,container,format,item_count", cases="tests.cases.files"
+)
+def test_select_pushed_down(path, content_hash, container, format, item_count):
+    """A select directly after a file is pushed into the reader."""
+
+    source = file.File(path)
+    test_pipe = Pipeline(source, helpers.select("title", "pageid"))
+    plan = test_pipe.execution_plan
+    assert plan.source is source
+    assert source.file.reader.fields == {"title", "pageid"}
+
+    result = list(test_pipe)
+    assert len(result) == item_count
+    assert all(set(item) == {"title", "pageid"} for item in result)
+
+
+@parametrize_with_cases(
+    "path,content_hash,container,format,item_count", cases="tests.cases.files"
+)
+def test_reader_fields(path, content_hash, container, format, item_count, tmp_path):
+    """Every format returns only the requested fields."""
+
+    output_path = tmp_path / "projected.wingline"
+    with reader.Reader(path) as file_reader:
+        with writer.Writer(output_path, formats.Msgpack) as file_write:
+            for line in file_reader:
+                file_write(line)
+
+    fields = frozenset(("title", "type", "missing"))
+    for test_path in (path, output_path):
+        with reader.Reader(path) as full_reader, reader.Reader(
+            test_path, fields
+        ) as projected_reader:
+            for full, projected in zip(full_reader, projected_reader, strict=True):
+                assert projected == {"title": full["title"], "type": full["type"]}
@@ -0,0 +1,73 @@
+import collections
+
+import pytest
+
+from wingline import Pipeline, hasher, helpers
+
+PAYLOADS = [{"id": i, "group": i % 3} for i in range(100_000)]
+
+
+def test_sample(simple_data):
+
+    test_pipe = Pipeline(simple_data, helpers.sample(2))
+    result = list(test_pipe)
+    assert len(result) == 2
+    assert result == [item for item in simple_data if item in result]
+
+
+def test_sample_seeded():
+    """A sample is reproducible, in input order, and spread across the input."""
+
+    sample = helpers.sample(1000, seed=1)
+    result = list(sample(iter(PAYLOADS)))
+    assert result == list(sample(iter(PAYLOADS)))
+    assert result != list(helpers.sample(1000, seed=2)(iter(PAYLOADS)))
+    ids = [payload["id"] for payload in result]
+    assert len(ids) == 1000
+    assert ids == sorted(set(ids))
+    assert 40_000 < sum(ids) / len(ids) < 60_000
+    assert list(helpers.sample(10)(iter(PAYLOADS[:5]))) == PAYLOADS[:5]
+
+
+@pytest.mark.parametrize("key", [None, "id"])
+def test_sample_fraction(key):
+
+    sample = helpers.sample_fraction(0.01, seed=1, key=key)
+    result = list(sample(iter(PAYLOADS)))
+    assert result == list(sample(iter(PAYLOADS)))
+    assert 800 < len(result) < 1200
+    assert list(helpers.sample_fraction(0)(iter(PAYLOADS))) == []
+    assert list(helpers.sample_fraction(1, key=key)(iter(PAYLOADS))) == PAYLOADS
+
+
+def test_sample_fraction_by_key_ignores_order():
+    sample = helpers.sample_fraction(0.01, seed=1, key="id")
+    forwards = list(sample(iter(PAYLOADS)))
+    backwards = list(sample(reversed(PAYLOADS)))
+    assert forwards == backwards[::-1]
+
+
+def test_sample_stratified():
+    sample = helpers.sample_stratified("group", 10, seed=1)
+    result = list(sample(iter(PAYLOADS)))
+    assert result == list(sample(iter(PAYLOADS)))
+    assert collections.Counter(payload["group"] for payload in result) == {
+        0: 10,
+        1: 10,
+        2: 10,
+    }
+    assert result == sorted(result, key=lambda payload: payload["id"])
+
+
+def test_sample_empty():
+    assert list(helpers.sample(0)(iter(PAYLOADS))) == []
+    assert list(helpers.sample_stratified("group", 0)(iter(PAYLOADS))) == []
+
+
+def test_samplers_hash_by_seed():
+    assert hasher.hash_callable(helpers.sample(10, seed=1)) == hasher.hash_callable(
+        helpers.sample(10, seed=1)
+    )
+    assert hasher.hash_callable(helpers.sample(10, seed=1)) != hasher.hash_callable(
+        helpers.sample(10, seed=2)
+    )
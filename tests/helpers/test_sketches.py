@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from wingline import Pipeline, helpers
+
+VALUES = list(range(100_000))
+
+
+def test_top_k(simple_data):
+
+    test_pipe = Pipeline(simple_data, helpers.top_k(2, "first_aired"))
+    result = list(test_pipe)
+    assert result == sorted(simple_data, key=lambda item: item["first_aired"])[::-1][:2]
+
+
+@pytest.mark.parametrize("smallest", [False, True])
+def test_top_k_aggregator(smallest):
+    """Partial top-k states merge to the top k of the whole stream."""
+
+    payloads = [{"value": value} for value in random.sample(VALUES, 5000)]
+    payloads.append({"other": 1})
+    top_k = helpers.top_k(10, "value", smallest=smallest)
+    expected = list(top_k(iter(payloads)))
+    assert (
+        expected
+        == sorted(payloads[:-1], key=lambda p: p["value"], reverse=not smallest)[:10]
+    )
+
+    states = []
+    for part in (payloads[:2000], payloads[2000:]):
+        state = top_k.initial()
+        for payload in part:
+            state = top_k.add(state, payload)
+        states.append(state)
+    assert top_k.result(top_k.merge(*states)) == expected
+
+
+def test_quantiles():
+    values = VALUES[:]
+    random.Random(1).shuffle(values)
+    quantiles = helpers.quantiles("value", (0, 0.5, 0.99, 1))
+    (summary,) = quantiles(iter({"value": value} for value in values))
+    assert summary.keys() == {"p0", "p50", "p99", "p100"}
+    for label, quantile in [("p50", 0.5), ("p99", 0.99)]:
+        assert abs(summary[label] - quantile * len(values)) < 0.02 * len(values)
+    assert list(helpers.quantiles("value")(iter([]))) == [
+        {"p50": None, "p90": None, "p99": None}
+    ]
+
+
+def test_quantiles_merge():
+    """A sketch merged from parts answers like one over the whole."""
+
+    quantiles = helpers.quantiles("value", (0.5,), k=100)
+    states = []
+    for start in range(0, len(VALUES), 25_000):
+        state = quantiles.initial()
+        for value in VALUES[start : start + 25_000]:
+            state = quantiles.add(state, {"value": value})
+        # Partial states survive a msgpack round trip as tuples.
+        states.append(tuple(tuple(level) for level in state))
+    merged = states[0]
+    for state in states[1:]:
+        merged = quantiles.merge(merged, state)
+    assert sum(len(level) for level in merged) < 1000
+    assert abs(quantiles.result(merged)["p50"] - 50_000) < 0.03 * len(VALUES)
+
+
+def test_quantiles_by_group():
+    payloads = [{"group": value % 2, "value": value} for value in VALUES]
+    operation = helpers.group_by("group").aggregate(
+        latency=helpers.quantiles("value", (0.5,))
+    )
+    result = {item["group"]: item["latency"]["p50"] for item in operation(payloads)}
+    assert result.keys() == {0, 1}
+    assert all(abs(p50 - 50_000) < 2_000 for p50 in result.values())
@@ -0,0 +1,26 @@
+import operator
+import random
+
+import pytest
+
+from wingline import Pipeline, helpers
+from wingline.helpers import sorting
+
+
+def test_sort(simple_data):
+
+    test_pipe = Pipeline(simple_data, helpers.sort("first_aired"))
+    result = list(test_pipe)
+    assert result == sorted(simple_data, key=lambda item: item["first_aired"])
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_spills(tmp_path, monkeypatch, reverse):
+    """Input over the memory limit is sorted in runs and merged, stably."""
+
+    monkeypatch.setattr(sorting, "MERGE_WIDTH", 3)
+    payloads = [{"key": random.randrange(50), "id": i} for i in range(2000)]
+    sort = helpers.sort("key", reverse=reverse, memory_limit=1000, temp_dir=tmp_path)
+    result = list(sort(iter(payloads)))
+    assert result == sorted(payloads, key=operator.itemgetter("key"), reverse=reverse)
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,101 @@
+import datetime
+
+import pytest
+
+from wingline import Pipeline, helpers
+
+
+def test_tumbling():
+
+    events = [{"at": seconds, "user": seconds % 2} for seconds in range(0, 300, 7)]
+    test_pipe = Pipeline(
+        events,
+        helpers.tumbling("at", 60, key="user").aggregate(count=helpers.count()),
+    )
+    result = list(test_pipe)
+    expected = {}
+    for event in events:
+        start = event["at"] // 60 * 60
+        group = (start, start + 60, event["user"])
+        expected[group] = expected.get(group, 0) + 1
+    assert {
+        (item["window_start"], item["window_end"], item["user"]): item["count"]
+        for item in result
+    } == expected
+    # Windows are emitted as they close, so in order of their end.
+    assert [item["window_end"] for item in result] == sorted(
+        item["window_end"] for item in result
+    )
+
+
+def test_tumbling_iso_and_lateness(caplog):
+    """Out-of-order payloads within the lateness are kept, later ones dropped."""
+
+    start = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+    offsets = [0, 61, 30, 125, 70, 10, 190]
+    events = [
+        {"at": (start + datetime.timedelta(seconds=offset)).isoformat()}
+        for offset in offsets
+    ]
+    windows = helpers.tumbling(
+        "at", datetime.timedelta(minutes=1), lateness=60
+    ).aggregate(count=helpers.count())
+    result = list(windows(iter(events)))
+    assert [(item["window_start"], item["count"]) for item in result] == [
+        ("2022-01-01T00:00:00+00:00", 2),
+        ("2022-01-01T00:01:00+00:00", 2),
+        ("2022-01-01T00:02:00+00:00", 1),
+        ("2022-01-01T00:03:00+00:00", 1),
+    ]
+    assert "Dropped 1 payloads" in caplog.text
+
+
+@pytest.mark.parametrize("size,step", [(60, 20), (60, 60), (50, 20)])
+def test_sliding(size, step):
+    events = [{"at": seconds, "value": seconds} for seconds in range(0, 200, 3)]
+    windows = helpers.sliding("at", size, step).aggregate(
+        count=helpers.count(), total=helpers.total("value")
+    )
+    result = list(windows(iter(events)))
+    assert result
+    for item in result:
+        values = [
+            event["value"]
+            for event in events
+            if item["window_start"] <= event["at"] < item["window_end"]
+        ]
+        assert item["window_end"] - item["window_start"] == size
+        assert item["window_start"] % step == 0
+        assert (item["count"], item["total"]) == (len(values), sum(values))
+    # Every payload is in every window that covers it.
+    windows_per_payload = -(-size // step)
+    assert sum(item["count"] for item in result) in range(
+        len(events) * (windows_per_payload - 1), len(events) * windows_per_payload + 1
+    )
+
+
+def test_session():
+    events = [
+        {"at": at, "user": user}
+        for at, user in [(0, "a"), (5, "b"), (8, "a"), (30, "a"), (12, "a"), (50, "b")]
+    ]
+    windows = helpers.session("at", gap=10, key="user", lateness=20).aggregate(
+        count=helpers.count()
+    )
+    result = list(windows(iter(events)))
+    assert sorted(
+        (item["user"], item["window_start"], item["window_end"], item["count"])
+        for item in result
+    ) == [("a", 0, 12, 3), ("a", 30, 30, 1), ("b", 5, 5, 1), ("b", 50, 50, 1)]
+
+
+def test_session_joins_sessions():
+    """A payload landing between two sessions joins them."""
+
+    events = [{"at": at} for at in [0, 20, 10]]
+    windows = helpers.session("at", gap=10, lateness=100).aggregate(
+        count=helpers.count()
+    )
+    assert list(windows(iter(events))) == [
+        {"window_start": 0, "window_end": 20, "count": 3}
+    ]
@@ -1,3 +1,9 @@
+import itertools
+import logging
+
+import pytest
+
+from wingline.helpers import head
 from wingline.plumbing import pipeline, tap
 
 
@@ -136,3 +142,63 @@ def test_pipeline_joined():
     )
     result = list(pipeline_2)
     assert result == expected
+
+
+def endless():
+    for i in itertools.count():
+        yield {"id": i}
+
+
+def test_head_stops_source():
+    """Once `head` has enough, the plumbing upstream stops reading."""
+
+    source = tap.Tap(endless(), name="Tap")
+    pipe = pipeline.Pipeline(source, append_key("a"), head(10))
+    result = list(pipe)
+    assert result == [{"id": i, "a": "a"} for i in range(10)]
+    source.join()
+    assert source.cancelled.is_set()
+
+
+def test_stop_iterating_stops_source():
+    """Abandoning a pipeline's iterator winds the pipeline down."""
+
+    source = tap.Tap(endless(), name="Tap")
+    iterator = iter(pipeline.Pipeline(source, append_key("a")))
+    assert next(iterator) == {"id": 0, "a": "a"}
+    iterator.close()
+    source.join()
+    assert source.cancelled.is_set()
+
+
+def test_error_is_raised():
+    """An operation's error stops the pipeline and is raised from it."""
+
+    def fail(items):
+        for item in items:
+            if item["id"] == 5:
+                raise ValueError("Failed.")
+            yield item
+
+    with pytest.raises(ValueError, match="Failed."):
+        list(pipeline.Pipeline(endless(), fail))
+
+
+def logged(caplog):
+    return [
+        record for record in caplog.records if record.name == "wingline.plumbing.hooks"
+    ]
+
+
+def test_payloads_logged_in_debug(caplog):
+    """Payloads are only logged one by one with debug logging on."""
+
+    input = [{"id": i} for i in range(3)]
+    with caplog.at_level(logging.INFO, logger="wingline.plumbing.hooks"):
+        assert list(pipeline.Pipeline(input, append_key("a"))) == input
+    assert not logged(caplog)
+
+    with caplog.at_level(logging.DEBUG, logger="wingline.plumbing.hooks"):
+        list(pipeline.Pipeline(input, append_key("b")))
+    # Once out of the tap, into and out of the pipe, and into the sink.
+    assert len(logged(caplog)) == 4 * len(input)
@@ -0,0 +1,103 @@
+"""Test the sharded writer."""
+
+import json
+
+import pytest
+
+from wingline import Pipeline
+from wingline.files import containers, formats, reader
+from wingline.plumbing import sharded_writer
+
+PAYLOADS = [{"id": i, "group": i % 7} for i in range(1000)]
+
+
+def _read_back(directory):
+    manifest = json.loads((directory / sharded_writer.MANIFEST_NAME).read_text())
+    files = {}
+    for entry in manifest["files"]:
+        with reader.Reader(directory / entry["path"]) as payloads:
+            files[entry["path"]] = list(payloads)
+        assert len(files[entry["path"]]) == entry["records"]
+    return manifest["files"], files
+
+
+@pytest.mark.parametrize(
+    "format,container", [(formats.JsonLines, None), (formats.Msgpack, containers.Gzip)]
+)
+def test_round_robin(tmp_path, format, container):
+    """Payloads are dealt evenly across shards."""
+
+    pipeline = Pipeline(PAYLOADS).write_sharded(
+        tmp_path, format, container, shards=4, batch_size=10
+    )
+    assert list(pipeline) == PAYLOADS
+
+    entries, files = _read_back(tmp_path)
+    assert [entry["records"] for entry in entries] == [250] * 4
+    assert (
+        sorted(
+            (payload for payloads in files.values() for payload in payloads),
+            key=lambda payload: payload["id"],
+        )
+        == PAYLOADS
+    )
+
+
+def test_hash_partitioned(tmp_path):
+    """Payloads with the same key land in the same shard."""
+
+    list(
+        Pipeline(PAYLOADS).write_sharded(
+            tmp_path, formats.JsonLines, shards=3, key="group"
+        )
+    )
+
+    _, files = _read_back(tmp_path)
+    shards_by_group = {}
+    for path, payloads in files.items():
+        for payload in payloads:
+            shards_by_group.setdefault(payload["group"], set()).add(path)
+    assert all(len(paths) == 1 for paths in shards_by_group.values())
+    assert sum(len(payloads) for payloads in files.values()) == len(PAYLOADS)
+
+
+def test_rotation(tmp_path):
+    """Shards start new files once they hold max_records payloads."""
+
+    list(
+        Pipeline(PAYLOADS).write_sharded(
+            tmp_path, formats.JsonLines, shards=2, max_records=150, batch_size=64
+        )
+    )
+
+    entries, _ = _read_back(tmp_path)
+    assert [(entry["shard"], entry["records"]) for entry in entries] == [
+        (0, 150),
+        (0, 150),
+        (0, 150),
+        (0, 50),
+        (1, 150),
+        (1, 150),
+        (1, 150),
+        (1, 50),
+    ]
+    assert entries[0]["path"] == "part-0000-0000.jsonl"
+    assert all(entry["hash"] and entry["bytes"] for entry in entries)
+
+
+def test_rotation_by_size(tmp_path):
+    """Shards start new files once max_bytes have been written to them."""
+
+    payloads = [{"id": i, "name": "Doctor Who" * 10} for i in range(10000)]
+    list(
+        Pipeline(payloads).write_sharded(
+            tmp_path, formats.JsonLines, max_bytes=100_000, batch_size=100
+        )
+    )
+
+    entries, files = _read_back(tmp_path)
+    assert len(entries) > 10
+    # Each file overshoots by at most one batch.
+    assert all(entry["bytes"] < 115_000 for entry in entries)
+    assert all(entry["bytes"] >= 100_000 for entry in entries[:-1])
+    assert sum(map(len, files.values())) == len(payloads)
@@ -0,0 +1,82 @@
+"""Test that importing wingline stays quick."""
+
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import wingline
+from wingline import helpers, plumbing
+
+# Modules that take a while to import, and which `import wingline`
+# should leave until they're needed.
+HEAVY = {
+    "dill",
+    "importlib.metadata",
+    "msgpack",
+    "pydantic",
+    "sqlite3",
+    "wingline.files",
+    "wingline.helpers",
+    "wingline.plumbing",
+}
+
+
+def imported(statement: str) -> dict[str, int]:
+    """Return the cumulative microseconds of each module a statement imports."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_is_light():
+    modules = imported("import wingline")
+    assert "wingline" in modules
+    assert not HEAVY & modules.keys()
+
+
+def test_helpers_import_alone():
+    """A helper's module is imported without the others."""
+
+    statement = "import sys; from wingline.helpers import head; print(*sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", statement], capture_output=True, check=True, text=True
+    )
+    modules = set(result.stdout.split())
+    assert "wingline.helpers.ranges" in modules
+    assert not {"wingline.helpers.joins", "sqlite3", "wingline.plumbing"} & modules
+
+
+# Every module, bar the CLI entry point, which runs the CLI.
+MODULES = [
+    module.name
+    for module in pkgutil.walk_packages(wingline.__path__, "wingline.")
+    if module.name != "wingline.__main__"
+]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_imports_first(module):
+    """Each module imports on its own, in whatever order its imports run."""
+
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+
+
+def test_lazy_names():
+    assert wingline.Pipeline is plumbing.Pipeline
+    assert wingline.__version__
+    assert helpers.head is helpers.ranges.Head
+    assert "top_k" in dir(helpers)
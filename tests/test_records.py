@@ -0,0 +1,82 @@
+"""Test compact records."""
+
+import io
+import pickle
+
+import msgpack
+import pytest
+
+from wingline import Pipeline, helpers, records
+from wingline.files import formats
+from wingline.plumbing import file as file_tap
+
+PAYLOADS = [{"id": i, "name": f"show {i}", "tags": {"n": i % 3}} for i in range(1000)]
+
+
+def test_record_is_a_mapping():
+    record = records.compact({"name": "Doctor Who", "first_aired": "1963"})
+    assert record["name"] == "Doctor Who"
+    assert record.get("missing") is None
+    assert record.get("missing", 1) == 1
+    assert "first_aired" in record and "missing" not in record
+    assert list(record) == ["name", "first_aired"]
+    assert len(record) == 2
+    assert dict(record) == {"name": "Doctor Who", "first_aired": "1963"}
+    assert {**record, "seen": True}["seen"]
+    assert record == {"first_aired": "1963", "name": "Doctor Who"}
+    assert {"first_aired": "1963", "name": "Doctor Who"} == record
+    assert record != {"name": "Doctor Who"}
+    assert helpers.equals(("tags", "n"), 1)(records.compact(PAYLOADS[1]))
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(TypeError):
+        record["name"] = "24"  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        record.__dict__
+
+
+def test_records_share_schemas():
+    first, second = map(records.compact, PAYLOADS[:2])
+    assert first.schema is second.schema
+    assert records.compact(first) is first
+    assert records.compact({"name": "24", "id": 1}).schema is not first.schema
+
+    copy = pickle.loads(pickle.dumps(first))
+    assert copy == first
+    assert copy.schema is first.schema
+
+
+@pytest.mark.parametrize("format_type", [formats.JsonLines, formats.Msgpack])
+def test_formats_write_records(format_type):
+    handle = io.BytesIO()
+    format_type(handle).batch_writer(map(records.compact, PAYLOADS[:500]))
+    for payload in PAYLOADS[500:]:
+        format_type(handle).writer(records.compact(payload))
+    handle.seek(0)
+    assert list(format_type(handle).reader) == PAYLOADS
+    assert msgpack.packb(
+        [records.compact(PAYLOADS[0])], default=records.default
+    ) == msgpack.packb([PAYLOADS[0]])
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".msgpack"])
+def test_compact_file(tmp_path, suffix):
+    """A compact source is the same stream, and hashes the same."""
+
+    path = tmp_path / f"data{suffix}"
+    with path.open("wb") as handle:
+        formats.get_format_by_mime_type(formats.get_mime_type_by_path(path))(
+            handle
+        ).batch_writer(PAYLOADS)
+    plain = Pipeline(file_tap.File(path))
+    compact = Pipeline(file_tap.File(path, compact=True))
+    assert compact.hash == plain.hash
+
+    odd = helpers.where(helpers.one_of("id", range(1, 1000, 2)))
+    result = list(compact.pipe(odd))
+
+    assert all(isinstance(record, records.Record) for record in result)
+    assert result == PAYLOADS[1::2]
+    # Records spill to disk like any payload.
+    sort = helpers.sort("id", reverse=True, memory_limit=1000)
+    assert list(sort(iter(result))) == PAYLOADS[1::2][::-1]
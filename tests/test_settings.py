@@ -0,0 +1,35 @@
+"""Test the settings."""
+
+import pathlib
+
+import pytest
+
+from wingline.settings import Settings
+
+
+def test_defaults():
+    settings = Settings({})
+    assert settings.debug is False
+    assert settings.testing is False
+    assert settings.log_dir is None
+    assert settings.gzip_index is True
+
+
+def test_environment():
+    settings = Settings(
+        {
+            "WL_DEBUG": "yes",
+            "wl_testing": "0",
+            "WL_LOG_DIR": "/tmp/wl",
+            "WL_GZIP_INDEX": "off",
+        }
+    )
+    assert settings.debug is True
+    assert settings.testing is False
+    assert settings.log_dir == pathlib.Path("/tmp/wl")
+    assert settings.gzip_index is False
+
+
+def test_invalid():
+    with pytest.raises(ValueError, match="WL_DEBUG"):
+        Settings({"WL_DEBUG": "maybe"})
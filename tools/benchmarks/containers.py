@@ -0,0 +1,65 @@
+"""Benchmark container write/read throughput and compression ratio.
+
+Usage: python tools/benchmarks/containers.py [--lines 500000]
+
+Writes the same jsonl content through every container and reads it
+back, reporting MB/s of content each way and the compressed size.
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+
+from wingline.exceptions import MissingDependencyError
+from wingline.files import containers
+
+LINE = b'{"id": %d, "name": {"S": "Doctor Who"}, "first_aired": {"N": "1963"}}\n'
+READ_SIZE = 1024 * 1024
+
+
+def bench(
+    container_type: type[containers.Container], path: pathlib.Path, data: bytes
+) -> tuple[float, float, int]:
+    """Return write seconds, read seconds and compressed size."""
+
+    container = container_type(path)
+    start = time.perf_counter()
+    with container.write_handle() as handle:
+        handle.write(data)
+    written = time.perf_counter()
+    with container.handle() as handle:
+        while handle.read(READ_SIZE):
+            pass
+    read = time.perf_counter()
+    return written - start, read - written, path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=500000)
+    args = parser.parse_args()
+
+    data = b"".join(LINE % i for i in range(args.lines))
+    megabytes = len(data) / 1e6
+    print(f"{megabytes:.1f}MB of content")
+    with tempfile.TemporaryDirectory() as directory:
+        for container_type in sorted(
+            containers.CONTAINERS.values(), key=lambda c: c.__name__
+        ):
+            path = pathlib.Path(directory) / container_type.__name__
+            try:
+                write, read, size = bench(container_type, path, data)
+            except MissingDependencyError as exc:
+                print(f"{container_type.__name__}: skipped ({exc})")
+                continue
+            print(
+                f"{container_type.__name__:>10}: "
+                f"write {megabytes / write:7.1f}MB/s, "
+                f"read {megabytes / read:7.1f}MB/s, "
+                f"ratio {len(data) / size:5.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark filetype detection over a directory of small files.
+
+Usage: python tools/benchmarks/detection.py [--files 10000]
+
+Reports the per-file cost of building a Reader (which detects the
+container and format) on a cold detection cache and again on a warm one.
+"""
+
+import argparse
+import gzip
+import pathlib
+import tempfile
+import time
+
+from wingline.files import filetype, reader
+
+LINE = b'{"name": {"S": "Doctor Who"}, "first_aired": {"N": "1963"}}\n'
+
+
+def make_files(directory: pathlib.Path, count: int) -> list[pathlib.Path]:
+    """Write a mix of plain and gzipped small jsonl files."""
+
+    paths = []
+    for i in range(count):
+        if i % 2:
+            path = directory / f"{i}.jsonl.gz"
+            with gzip.open(path, "wb") as handle:
+                handle.write(LINE * 10)
+        else:
+            path = directory / f"{i}.jsonl"
+            path.write_bytes(LINE * 10)
+        paths.append(path)
+    return paths
+
+
+def time_readers(paths: list[pathlib.Path]) -> float:
+    """Return the seconds taken to build a reader for every path."""
+
+    start = time.perf_counter()
+    for path in paths:
+        reader.Reader(path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_files(pathlib.Path(directory), args.files)
+        filetype._sniff.cache_clear()
+        cold = time_readers(paths)
+        warm = time_readers(paths)
+
+    for label, seconds in (("cold", cold), ("warm", warm)):
+        print(
+            f"{label}: {seconds:.3f}s for {args.files} files "
+            f"({seconds / args.files * 1e6:.1f}µs per file)"
+        )
+
+
+if __name__ == "__main__":
+    main()
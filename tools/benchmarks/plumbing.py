@@ -0,0 +1,42 @@
+"""Benchmark the per-stage, per-payload overhead of the plumbing.
+
+Usage: python tools/benchmarks/plumbing.py [--payloads 100000] [--stages 1 10 100]
+
+Runs payloads through pipelines of pass-through stages, so all the
+time is spent moving payloads between stages. Reports microseconds
+per payload per stage, and the time to build and start each pipeline.
+"""
+
+import argparse
+import time
+
+from wingline import Pipeline
+
+
+def identity(payloads):
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payloads", type=int, default=100000)
+    parser.add_argument("--stages", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    payloads = [{"id": i, "name": "Doctor Who"} for i in range(args.payloads)]
+    for stages in args.stages:
+        start = time.perf_counter()
+        pipeline = Pipeline(payloads, *[identity] * stages)
+        built = time.perf_counter()
+        count = sum(1 for _ in pipeline)
+        finished = time.perf_counter()
+        assert count == args.payloads
+        per_item = (finished - built) / args.payloads / stages * 1e6
+        print(
+            f"{stages:>4} stages: {per_item:.2f} µs per payload per stage,"
+            f" built in {(built - start) * 1e3:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
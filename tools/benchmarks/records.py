@@ -0,0 +1,80 @@
+"""Benchmark compact records against plain dict payloads.
+
+Usage: python tools/benchmarks/records.py [--records 1000000] [--fields 40]
+
+Reports the memory held by a million buffered payloads of each kind,
+and payloads per second read from jsonl and msgpack files.
+"""
+
+import argparse
+import gc
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from wingline import records as records_module
+from wingline.files import file, formats
+
+
+def payloads(count: int, fields: int) -> list[dict]:
+    return [
+        {f"field_{field:02}": i * fields + field for field in range(fields)}
+        for i in range(count)
+    ]
+
+
+def held_bytes(source: file.File) -> int:
+    """Return the bytes allocated to hold every payload of a source."""
+
+    gc.collect()
+    tracemalloc.start()
+    held = list(source)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def time_read(source: file.File) -> float:
+    """Return the seconds taken to read every payload."""
+
+    start = time.perf_counter()
+    for _ in source:
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--fields", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for suffix, format in (
+            (".jsonl", formats.JsonLines),
+            (".msgpack", formats.Msgpack),
+        ):
+            path = pathlib.Path(directory) / f"data{suffix}"
+            with path.open("wb") as handle:
+                format(handle).batch_writer(payloads(args.records, args.fields))
+            paths.append(path)
+
+        per_million = 1_000_000 / args.records / 1024**2
+        for compact in (False, True):
+            label = "records" if compact else "dicts"
+            size = held_bytes(file.File(paths[-1], compact=compact))
+            print(f"{label:>8}: {size * per_million:,.0f} MiB per million held")
+            for path in paths:
+                seconds = time_read(file.File(path, compact=compact))
+                print(
+                    f"{label:>8}: {args.records / seconds:,.0f} payloads/s"
+                    f" from {path.suffix[1:]}"
+                )
+        print(f"{len(records_module._SCHEMAS)} schema(s) interned")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark sharded reading of one large jsonl file.
+
+Usage: python tools/benchmarks/sharding.py [--lines 2000000] [--workers 4]
+
+Reports payloads per second read sequentially and across worker
+processes, ordered and unordered.
+"""
+
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+from wingline.files import file
+
+LINE = b'{"id": %d, "name": {"S": "Doctor Who"}, "first_aired": {"N": "1963"}}\n'
+
+
+def time_read(source: file.File) -> float:
+    """Return the seconds taken to read every payload."""
+
+    start = time.perf_counter()
+    for _ in source:
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2000000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "data.jsonl"
+        with path.open("wb") as handle:
+            for i in range(args.lines):
+                handle.write(LINE % i)
+        runs = (
+            ("sequential", file.File(path)),
+            ("ordered", file.File(path, args.workers)),
+            ("unordered", file.File(path, args.workers, ordered=False)),
+        )
+        for label, source in runs:
+            seconds = time_read(source)
+            print(f"{label:>10}: {args.lines / seconds:,.0f} payloads/s")
+
+
+if __name__ == "__main__":
+    main()
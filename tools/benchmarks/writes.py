@@ -0,0 +1,67 @@
+"""Benchmark writing records through the file writer.
+
+Usage: python tools/benchmarks/writes.py [--records 500000]
+
+Reports records per second written one at a time and in batches, as
+msgpack in gzip (the intermediate cache format) and as plain jsonl.
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+
+from wingline.files import containers, formats, writer
+from wingline.plumbing.writer import BATCH_SIZE
+
+TARGETS = (
+    ("msgpack+gzip", formats.Msgpack, containers.Gzip),
+    ("jsonl", formats.JsonLines, containers.Container),
+)
+
+
+def records(count: int) -> list[dict]:
+    return [
+        {"id": i, "name": {"S": "Doctor Who"}, "first_aired": {"N": "1963"}}
+        for i in range(count)
+    ]
+
+
+def time_write(
+    path: pathlib.Path,
+    format: type[formats.Format],
+    container: type[containers.Container],
+    payloads: list[dict],
+    batched: bool,
+) -> float:
+    """Return the seconds taken to write the payloads."""
+
+    start = time.perf_counter()
+    file_writer = writer.Writer(path, format, container)
+    with file_writer as write:
+        if batched:
+            for i in range(0, len(payloads), BATCH_SIZE):
+                file_writer.write_many(payloads[i : i + BATCH_SIZE])
+        else:
+            for payload in payloads:
+                write(payload)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500000)
+    args = parser.parse_args()
+
+    payloads = records(args.records)
+    with tempfile.TemporaryDirectory() as directory:
+        for label, format, container in TARGETS:
+            path = pathlib.Path(directory) / label
+            for batched in (False, True):
+                seconds = time_write(path, format, container, payloads, batched)
+                mode = "batched" if batched else "single"
+                print(f"{label:>12} {mode:>7}: {args.records / seconds:,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
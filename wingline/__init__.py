@@ -3,17 +3,37 @@
 A simple line-based data reader and translator
 """
 
-# Importlib_metadata dependency can be removed when python 3.8 reaches EOL.
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:  # pragma: no cover
-    import importlib_metadata  # type: ignore
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
 
 from wingline.json import json
-from wingline.plumbing import Pipeline
 from wingline.settings import settings
 
-__version__ = importlib_metadata.version(__name__)
+if TYPE_CHECKING:
+    from wingline.plumbing import Pipeline
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use, so a short run (e.g. of the CLI) that
+    # doesn't need them doesn't wait for them.
+    if name == "Pipeline":
+        from wingline.plumbing.pipeline import Pipeline
+
+        globals()[name] = Pipeline
+        return Pipeline
+    if name == "__version__":
+        # Importlib_metadata dependency can be removed when python 3.8 reaches EOL.
+        try:
+            import importlib.metadata as importlib_metadata
+        except ModuleNotFoundError:  # pragma: no cover
+            import importlib_metadata  # type: ignore
+
+        version = importlib_metadata.version(__name__)
+        globals()[name] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "__version__",
@@ -7,3 +7,11 @@ class WinglineError(Exception):
 
 class HashUnavailableError(WinglineError, RuntimeError):
     """Raised when a hash for a process is requested but is unavailable."""
+
+
+class UnsupportedContainerError(WinglineError, ValueError):
+    """Raised when a file is in an archive or compression format we can't read."""
+
+
+class MissingDependencyError(WinglineError, ImportError):
+    """Raised when an optional dependency is needed but not installed."""
@@ -0,0 +1,115 @@
+"""Read several payload sources at once on a bounded pool of threads."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable, Generator, Iterable, Iterator, Optional, TypeVar
+
+from wingline.types import Payload
+
+T = TypeVar("T")
+
+# Payloads handed from a reader thread to the consumer at a time,
+# and batches buffered per source before its reader waits.
+BATCH_SIZE = 1024
+QUEUE_SIZE = 8
+
+_DONE = object()
+
+# (source, batch), (source, _DONE) or (source, exception).
+Item = tuple[Any, Any]
+
+
+def _read_source(
+    source: T,
+    read: Callable[[T], Iterable[Payload]],
+    output: queue.Queue[Item],
+    stop: threading.Event,
+) -> None:
+    """Reader thread: put batches of a source's payloads on a queue."""
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        batch = []
+        for payload in read(source):
+            batch.append(payload)
+            if len(batch) >= BATCH_SIZE:
+                if not put((source, batch)):
+                    return
+                batch = []
+        if batch and not put((source, batch)):
+            return
+        put((source, _DONE))
+    except BaseException as exc:  # pylint: disable=broad-except
+        put((source, exc))
+
+
+def _consume(
+    output: queue.Queue[Item],
+) -> Iterator[tuple[Any, Optional[list[Payload]]]]:
+    """Yield batches from a queue up to and including one source's end."""
+
+    while True:
+        source, batch = output.get()
+        if batch is _DONE:
+            yield source, None
+            return
+        if isinstance(batch, BaseException):
+            raise batch
+        yield source, batch
+
+
+def read_concurrently(
+    sources: Iterable[T],
+    read: Callable[[T], Iterable[Payload]],
+    readers: int,
+    ordered: bool = True,
+) -> Generator[tuple[T, Optional[list[Payload]]], None, None]:
+    """Read up to `readers` sources at once.
+
+    Yields `(source, batch)` pairs, then `(source, None)` once a source
+    is finished. If `ordered`, each source's batches all come before
+    the next source's; otherwise they're interleaved as they're read.
+    Closing the iterator stops the readers.
+    """
+
+    stop = threading.Event()
+    executor = concurrent.futures.ThreadPoolExecutor(
+        readers, thread_name_prefix="wingline-reader"
+    )
+    try:
+        if ordered:
+            # One queue per source, with no more sources in flight than
+            # readers, so the source being consumed is always running.
+            queues: list[queue.Queue[Item]] = []
+            for source in sources:
+                queues.append(queue.Queue(QUEUE_SIZE))
+                executor.submit(_read_source, source, read, queues[-1], stop)
+                if len(queues) == readers:
+                    yield from _consume(queues.pop(0))
+            for output in queues:
+                yield from _consume(output)
+            return
+
+        shared: queue.Queue[Item] = queue.Queue(QUEUE_SIZE * readers)
+        remaining = 0
+        for source in sources:
+            executor.submit(_read_source, source, read, shared, stop)
+            remaining += 1
+        while remaining:
+            for item in _consume(shared):
+                yield item
+            remaining -= 1
+    finally:
+        stop.set()
+        executor.shutdown(cancel_futures=True)
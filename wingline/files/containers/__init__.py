@@ -1,14 +1,39 @@
 """Container formats."""
 from typing import Optional
 
+from wingline.exceptions import UnsupportedContainerError
 from wingline.files.containers._base import DEFAULT_CONTAINER_MIME_TYPE, Container
+from wingline.files.containers.archive import Archive, Tar, Zip
+from wingline.files.containers.bz2 import Bz2
 from wingline.files.containers.gzip import Gzip
+from wingline.files.containers.lz4 import Lz4
+from wingline.files.containers.mapped import Mmap
+from wingline.files.containers.xz import Xz
+from wingline.files.containers.zstd import Zstd
 
 _CONTAINER_TYPES: set[type[Container]] = {
-    Container,
+    Bz2,
     Gzip,
+    Lz4,
+    Mmap,
+    Tar,
+    Xz,
+    Zip,
+    Zstd,
 }
 
+# Compressed or archive formats we recognise but can't read through.
+UNSUPPORTED_MIME_TYPES = frozenset(
+    {
+        "application/x-brotli",
+        "application/x-7z-compressed",
+        "application/x-compress",
+        "application/x-lzip",
+        "application/x-lzop",
+        "application/x-rar-compressed",
+    }
+)
+
 
 CONTAINERS: dict[str, type[Container]] = {
     container.mime_type: container for container in _CONTAINER_TYPES
@@ -22,11 +47,21 @@ def get_container_by_mime_type(mime_type: Optional[str]) -> type[Container]:
 
     if not mime_type:
         return DEFAULT_CONTAINER
+    if mime_type in UNSUPPORTED_MIME_TYPES:
+        raise UnsupportedContainerError(f"Unsupported container: {mime_type}")
     return CONTAINERS.get(mime_type, DEFAULT_CONTAINER)
 
 
 __all__ = [
+    "Archive",
+    "Bz2",
     "Container",
     "Gzip",
+    "Lz4",
+    "Mmap",
+    "Tar",
+    "Xz",
+    "Zip",
+    "Zstd",
     "get_container_by_mime_type",
 ]
@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import contextlib
+import io
 import pathlib
-from typing import BinaryIO, Generator
+from typing import BinaryIO, Generator, cast
+
+from wingline.files.containers import _parallel
 
 DEFAULT_CONTAINER_MIME_TYPE = "_default"
 
@@ -16,6 +19,12 @@ class Container:
     def __init__(self, path: pathlib.Path):
         self.path = path
 
+    @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        return raw[:size]
+
     @staticmethod
     @contextlib.contextmanager
     def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
@@ -37,8 +46,25 @@ class Container:
         with self.__class__._get_handle(self.path) as handle:
             yield handle
 
+    @contextlib.contextmanager
+    def handle_at(self, offset: int) -> Generator[BinaryIO, None, None]:
+        """Return a file handle positioned at an offset into the content."""
+
+        with self.handle() as handle:
+            handle.seek(offset)
+            yield handle
+
     @contextlib.contextmanager
     def write_handle(self) -> Generator[BinaryIO, None, None]:
+        """Return a file handle for writing.
+
+        Writes are buffered and passed to the container's own handle on a
+        background thread, so the caller can carry on encoding payloads
+        while the previous buffer is compressed and written.
+        """
+
         self.path.parent.mkdir(parents=True, exist_ok=True)
         with self.__class__._get_write_handle(self.path) as handle:
-            yield handle
+            background = _parallel.BackgroundWriter(handle)
+            with io.BufferedWriter(background, _parallel.BUFFER_SIZE) as buffered:
+                yield cast(BinaryIO, buffered)
@@ -0,0 +1,188 @@
+"""Threads for (de)compressing and writing concurrently.
+
+The stdlib and optional codecs all release the GIL while they work, so
+compressing or inflating independent chunks on threads scales with
+cores. Writes are also handed off to a background thread, so encoding
+payloads, compressing and writing to disk all overlap.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import io
+import os
+import queue
+import threading
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+THREADS = os.cpu_count() or 1
+# Chunks in flight per reader/writer.
+WINDOW = THREADS * 4
+# Bytes gathered before a buffer is handed to the background writer,
+# and buffers queued for it before the producer waits.
+BUFFER_SIZE = 1024 * 1024
+BUFFERS = 2
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the thread pool shared by all parallel readers and writers."""
+
+    global _executor  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=THREADS, thread_name_prefix="wingline-codec"
+            )
+    return _executor
+
+
+def ordered_map(
+    func: Callable[[T], U], items: Iterable[T], window: int = WINDOW
+) -> Iterator[U]:
+    """Map a function over items on the pool, yielding results in order.
+
+    At most `window` items are in flight at once, so memory stays bounded
+    however long `items` is.
+    """
+
+    pool = executor()
+    pending: collections.deque[concurrent.futures.Future[U]] = collections.deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class ChunkWriter(io.RawIOBase):
+    """Raw writer compressing fixed-size chunks concurrently.
+
+    Each chunk is compressed independently and the results written in
+    order, so the output is a concatenation of complete streams (or gzip
+    members), which the standard readers of every supported codec accept.
+    """
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        compress: Callable[[bytes], bytes],
+        chunk_size: int,
+        trailer: bytes = b"",
+    ):
+        self._handle = handle
+        self._compress = compress
+        self._chunk_size = chunk_size
+        self._trailer = trailer
+        self._buffer = bytearray()
+        self._pool = executor()
+        self._pending: collections.deque[concurrent.futures.Future[bytes]] = (
+            collections.deque()
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._buffer += data
+        chunk_size = self._chunk_size
+        while len(self._buffer) >= chunk_size:
+            self._submit(bytes(self._buffer[:chunk_size]))
+            del self._buffer[:chunk_size]
+        return len(data)
+
+    def _submit(self, data: bytes) -> None:
+        pending = self._pending
+        pending.append(self._pool.submit(self._compress, data))
+        while pending and (len(pending) >= WINDOW or pending[0].done()):
+            self._handle.write(pending.popleft().result())
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                    self._buffer.clear()
+                while self._pending:
+                    self._handle.write(self._pending.popleft().result())
+                self._handle.write(self._trailer)
+            finally:
+                self._handle.close()
+        super().close()
+
+
+class BackgroundWriter(io.RawIOBase):
+    """Raw writer handing buffers to a dedicated thread to write.
+
+    Writes are gathered into buffers of about `BUFFER_SIZE` bytes; a
+    full buffer is queued for the thread, which writes it to the handle
+    (compressing it, for a compressing handle) while the next one fills.
+    At most `BUFFERS` buffers wait, so a slow handle applies
+    backpressure rather than using unbounded memory.
+
+    Closing flushes and waits for the thread, re-raising any error it
+    hit, but leaves the underlying handle open.
+    """
+
+    def __init__(self, handle: BinaryIO, buffer_size: int = BUFFER_SIZE):
+        self._handle = handle
+        self._buffer_size = buffer_size
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._queue: queue.Queue[Optional[list[bytes]]] = queue.Queue(BUFFERS)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="wingline-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while (chunks := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    self._handle.write(b"".join(chunks))
+                except BaseException as exc:  # pylint: disable=broad-except
+                    # Keep draining so the producer never blocks.
+                    self._error = exc
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        self._size += len(data)
+        if self._size >= self._buffer_size:
+            self._hand_off()
+        return len(data)
+
+    def _hand_off(self) -> None:
+        self._check()
+        if self._chunks:
+            self._queue.put(self._chunks)
+            self._chunks = []
+            self._size = 0
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._hand_off()
+            finally:
+                self._queue.put(None)
+                self._thread.join()
+            self._check()
+        super().close()
@@ -0,0 +1,108 @@
+"""Archive containers: several files in one."""
+
+from __future__ import annotations
+
+import contextlib
+import tarfile
+import zipfile
+from typing import BinaryIO, Generator, Iterator, cast
+
+from wingline.files.containers import _base
+
+# Enough of a tar file to see the "ustar" magic in its first header.
+TAR_HEADER_SIZE = 512
+_TAR_MAGIC_OFFSET = 257
+_TAR_MAGIC = b"ustar"
+
+Member = tuple[str, BinaryIO]
+
+
+def is_tar(header: bytes) -> bool:
+    """Whether content starts with a (POSIX or GNU) tar header."""
+
+    return header[_TAR_MAGIC_OFFSET : _TAR_MAGIC_OFFSET + len(_TAR_MAGIC)] == _TAR_MAGIC
+
+
+class Archive(_base.Container):
+    """Base class for a container of several member files.
+
+    Members are streamed straight out of the archive: nothing is
+    extracted to disk. `handle()` still gives the raw archive.
+    """
+
+    # Whether members can be opened independently, and so read at once.
+    random_access: bool = False
+
+    @contextlib.contextmanager
+    def members(self) -> Generator[Iterator[Member], None, None]:
+        """Return an iterator of (name, handle) for each member file.
+
+        A member's handle is only good until the next member is taken.
+        """
+
+        raise NotImplementedError
+
+    def names(self) -> list[str]:
+        """Return the names of the member files, if `random_access`."""
+
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def open_member(self, name: str) -> Generator[BinaryIO, None, None]:
+        """Return a handle on one member, if `random_access`."""
+
+        raise NotImplementedError
+
+
+class Tar(Archive):
+    """Tar archive, plain or compressed with gzip, bzip2 or xz.
+
+    Tar files are read as a stream, so members come one after another.
+    """
+
+    mime_type = "application/x-tar"
+
+    @contextlib.contextmanager
+    def members(self) -> Generator[Iterator[Member], None, None]:
+        with tarfile.open(self.path, "r|*") as archive:
+            yield (
+                (info.name, cast(BinaryIO, archive.extractfile(info)))
+                for info in archive
+                if info.isfile()
+            )
+
+
+class Zip(Archive):
+    """Zip archive.
+
+    Zip has a central directory, so members can be opened (and
+    inflated) independently.
+    """
+
+    mime_type = "application/zip"
+    random_access = True
+
+    def names(self) -> list[str]:
+        """Return the names of the member files."""
+
+        with zipfile.ZipFile(self.path) as archive:
+            return [info.filename for info in archive.infolist() if not info.is_dir()]
+
+    @contextlib.contextmanager
+    def open_member(self, name: str) -> Generator[BinaryIO, None, None]:
+        """Return a handle on one member."""
+
+        with zipfile.ZipFile(self.path) as archive, archive.open(name) as handle:
+            yield cast(BinaryIO, handle)
+
+    @staticmethod
+    def _members(archive: zipfile.ZipFile) -> Iterator[Member]:
+        for info in archive.infolist():
+            if not info.is_dir():
+                with archive.open(info) as handle:
+                    yield info.filename, cast(BinaryIO, handle)
+
+    @contextlib.contextmanager
+    def members(self) -> Generator[Iterator[Member], None, None]:
+        with zipfile.ZipFile(self.path) as archive:
+            yield self._members(archive)
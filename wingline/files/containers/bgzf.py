@@ -0,0 +1,204 @@
+"""Blocked gzip (BGZF) reading and writing on a thread pool.
+
+A BGZF file is a series of small, independently compressed gzip members,
+each recording its own compressed size in a "BC" extra field. Any gzip
+reader can read one as an ordinary multi-member file, but because the
+member boundaries are known up front the members can be inflated (and
+deflated, when writing) concurrently on the shared codec thread pool.
+
+https://samtools.github.io/hts-specs/SAMv1.pdf (section 4.1)
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import io
+import os
+import struct
+import zlib
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional
+
+from wingline.files.containers import _parallel
+
+if TYPE_CHECKING:
+    from wingline.files.containers.gzip_index import IndexBuilder
+
+# Uncompressed bytes per block. BGZF blocks must compress to at most
+# 64KiB; this leaves room for deflate's worst-case expansion.
+BLOCK_SIZE = 0xFF00
+COMPRESSION_LEVEL = 6
+
+# Number of (path, stat) `is_blocked` results to remember.
+BLOCKED_CACHE_SIZE = 16384
+
+_HEADER = struct.Struct("<4BI2BH")  # ID1 ID2 CM FLG MTIME XFL OS XLEN
+_SUBFIELD = struct.Struct("<2BH")  # SI1 SI2 SLEN
+_TRAILER = struct.Struct("<2I")  # CRC32 ISIZE
+_BC = (66, 67)
+_FEXTRA = 4
+_MAGIC = (0x1F, 0x8B, 8)
+
+
+def read_block_header(handle: BinaryIO) -> Optional[int]:
+    """Read a member header, returning the total block size.
+
+    Returns None if the member isn't a BGZF block. Either way the
+    handle is left where it started.
+    """
+
+    start = handle.tell()
+    try:
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        id1, id2, cm, flg, _, _, _, xlen = _HEADER.unpack(header)
+        if (id1, id2, cm) != _MAGIC or not flg & _FEXTRA:
+            return None
+        extra = handle.read(xlen)
+        offset = 0
+        while offset + _SUBFIELD.size <= len(extra):
+            si1, si2, slen = _SUBFIELD.unpack_from(extra, offset)
+            offset += _SUBFIELD.size
+            if (si1, si2) == _BC and slen == 2:
+                (bsize,) = struct.unpack_from("<H", extra, offset)
+                return bsize + 1
+            offset += slen
+        return None
+    finally:
+        handle.seek(start)
+
+
+@functools.lru_cache(maxsize=BLOCKED_CACHE_SIZE)
+def _is_blocked(
+    path: os.PathLike[str], size: int, modified_at: int, inode: int
+) -> bool:
+    """Whether a file starts with a BGZF block, caching by path and stat."""
+
+    with open(path, "rb") as handle:
+        return read_block_header(handle) is not None
+
+
+def is_blocked(path: os.PathLike[str]) -> bool:
+    """Whether a file starts with a BGZF block.
+
+    The header is only read again once the file has changed.
+    """
+
+    stat = os.stat(path)
+    return _is_blocked(path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def iter_blocks(handle: BinaryIO) -> Iterator[bytes]:
+    """Yield the raw BGZF blocks of a file without inflating them.
+
+    If a member without a BC field turns up (e.g. a plain gzip file
+    concatenated on the end), the rest of the file is yielded as one
+    chunk, to be inflated sequentially.
+    """
+
+    while True:
+        size = read_block_header(handle)
+        if size is None:
+            rest = handle.read()
+            if rest:
+                yield rest
+            return
+        yield handle.read(size)
+
+
+def inflate(block: bytes) -> bytes:
+    """Inflate a BGZF block (or any run of complete gzip members)."""
+
+    output = []
+    while block:
+        decompressor = zlib.decompressobj(wbits=31)
+        output.append(decompressor.decompress(block))
+        if not decompressor.eof:
+            raise EOFError("Compressed file ended before the end-of-stream marker.")
+        block = decompressor.unused_data
+    return b"".join(output)
+
+
+def deflate(data: bytes, level: int = COMPRESSION_LEVEL) -> bytes:
+    """Compress data as a single BGZF block."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    cdata = compressor.compress(data) + compressor.flush()
+    block_size = _HEADER.size + _SUBFIELD.size + 2 + len(cdata) + _TRAILER.size
+    return b"".join(
+        (
+            _HEADER.pack(*_MAGIC, _FEXTRA, 0, 0, 255, _SUBFIELD.size + 2),
+            _SUBFIELD.pack(*_BC, 2),
+            struct.pack("<H", block_size - 1),
+            cdata,
+            _TRAILER.pack(zlib.crc32(data), len(data) & 0xFFFFFFFF),
+        )
+    )
+
+
+# The empty block that conventionally terminates a BGZF file.
+EOF_BLOCK = deflate(b"")
+
+
+class BlockReader(io.RawIOBase):
+    """Raw reader inflating the blocks of a BGZF file concurrently.
+
+    Reading starts wherever the handle is, which must be the start of a
+    block. If an index builder is given, it's fed each block as it's
+    read; `complete` is set once the end of the file is reached.
+    """
+
+    def __init__(self, handle: BinaryIO, builder: Optional[IndexBuilder] = None):
+        self._handle = handle
+        self._builder = builder
+        # Blocks are read ahead of the inflated chunks being consumed,
+        # so their offsets wait here to be matched up with the content.
+        self._offsets: collections.deque[int] = collections.deque()
+        self._chunks = _parallel.ordered_map(inflate, self._blocks())
+        self._chunk = memoryview(b"")
+        self.complete = False
+
+    def _blocks(self) -> Iterator[bytes]:
+        builder = self._builder
+        offset = self._handle.tell()
+        for block in iter_blocks(self._handle):
+            if builder is not None:
+                self._offsets.append(offset)
+                builder.raw(block)
+            offset += len(block)
+            yield block
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:  # type: ignore[override]
+        while not self._chunk:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.complete = True
+                return 0
+            if self._builder is not None:
+                self._builder.member(self._offsets.popleft())
+                self._builder.content(chunk)
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._chunks.close()
+            self._handle.close()
+        super().close()
+
+
+class BlockWriter(_parallel.ChunkWriter):
+    """Raw writer deflating BGZF blocks concurrently, pigz-style."""
+
+    def __init__(self, handle: BinaryIO, level: int = COMPRESSION_LEVEL):
+        super().__init__(
+            handle, functools.partial(deflate, level=level), BLOCK_SIZE, EOF_BLOCK
+        )
@@ -0,0 +1,47 @@
+"""Bzip2 container."""
+
+import bz2
+import contextlib
+import pathlib
+from typing import BinaryIO, Generator, cast
+
+from wingline.files.containers import _base, _parallel
+
+# Content per independently compressed stream: four 900k bzip2 blocks.
+CHUNK_SIZE = 4 * 900_000
+
+
+class Bz2(_base.Container):
+    """Bzip2 container
+
+    Writes are split into independent streams compressed concurrently
+    (pbzip2-style); bz2 readers accept the concatenated streams.
+    """
+
+    mime_type = "application/x-bzip2"
+
+    @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        try:
+            return bz2.BZ2Decompressor().decompress(raw, size)
+        except (OSError, EOFError):
+            return b""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle."""
+
+        with bz2.open(path) as handle:
+            yield cast(BinaryIO, handle)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_write_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle for writing."""
+
+        raw = cast(BinaryIO, path.open("wb"))
+        with _parallel.ChunkWriter(raw, bz2.compress, CHUNK_SIZE) as handle:
+            yield cast(BinaryIO, handle)
@@ -2,29 +2,115 @@
 
 import contextlib
 import gzip
+import io
 import pathlib
-from typing import BinaryIO, Generator, cast
+import zlib
+from typing import BinaryIO, Generator, Optional, cast
 
-from wingline.files.containers import _base
+from wingline.files.containers import _base, bgzf, gzip_index
+from wingline.settings import settings
+
+SKIP_SIZE = 1024 * 1024
 
 
 class Gzip(_base.Container):
-    """Gzip container"""
+    """Gzip container
+
+    Files written here are blocked gzip (BGZF): standard multi-member gzip
+    that any gzip reader understands, but compressed on a thread pool.
+    Reading such files (ours or bgzip's) inflates the blocks concurrently;
+    any other gzip file is read sequentially.
+
+    The first complete read of a blocked file saves a random-access index
+    in the index directory (see `gzip_index`), which `handle_at` uses to
+    start reading part way through. Building it costs a hash of the
+    whole file on top of the read; set `WL_GZIP_INDEX=0` to save none.
+    """
 
     mime_type = "application/gzip"
 
-    @contextlib.contextmanager
     @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        try:
+            return zlib.decompressobj(wbits=31).decompress(raw, size)
+        except zlib.error:
+            return b""
+
+    @staticmethod
+    @contextlib.contextmanager
     def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
         """Return a file handle."""
 
-        with gzip.open(path) as handle:
+        compressed = cast(BinaryIO, path.open("rb"))
+        if bgzf.read_block_header(compressed) is None:
+            with compressed, gzip.GzipFile(fileobj=compressed) as handle:
+                yield cast(BinaryIO, handle)
+            return
+
+        builder: Optional[gzip_index.IndexBuilder] = None
+        if settings.gzip_index and not gzip_index.GzipIndex.index_path(path).exists():
+            builder = gzip_index.IndexBuilder()
+        raw = bgzf.BlockReader(compressed, builder)
+        with io.BufferedReader(raw) as handle:
             yield cast(BinaryIO, handle)
+        if builder is not None and raw.complete:
+            builder.finish(path).save(path)
 
     @staticmethod
     @contextlib.contextmanager
     def _get_write_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
         """Return a file handle for writing."""
 
-        with gzip.open(path, "wb") as handle:
+        with bgzf.BlockWriter(cast(BinaryIO, path.open("wb"))) as handle:
             yield cast(BinaryIO, handle)
+
+    def index(self, span: int = gzip_index.SPAN) -> gzip_index.GzipIndex:
+        """Return the file's random-access index, building it if need be."""
+
+        index = gzip_index.GzipIndex.load(self.path)
+        if index is None:
+            index = gzip_index.GzipIndex.build(self.path, span)
+            index.save(self.path)
+        return index
+
+    @contextlib.contextmanager
+    def _handle_from(
+        self, point: gzip_index.AccessPoint
+    ) -> Generator[BinaryIO, None, None]:
+        """Return a handle on the content from an access point."""
+
+        raw = cast(BinaryIO, self.path.open("rb"))
+        raw.seek(point.compressed_offset)
+        if bgzf.read_block_header(raw) is not None:
+            stream = io.BufferedReader(bgzf.BlockReader(raw))
+        else:
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")  # type: ignore
+        with raw, stream:
+            yield cast(BinaryIO, stream)
+
+    @contextlib.contextmanager
+    def handle_at(self, offset: int) -> Generator[BinaryIO, None, None]:
+        """Return a handle positioned at an offset into the content."""
+
+        point = self.index().locate_offset(offset)
+        with self._handle_from(point) as handle:
+            remaining = offset - point.offset
+            while remaining > 0:
+                skipped = len(handle.read(min(remaining, SKIP_SIZE)))
+                if not skipped:
+                    break
+                remaining -= skipped
+            yield handle
+
+    @contextlib.contextmanager
+    def handle_at_line(self, line: int) -> Generator[BinaryIO, None, None]:
+        """Return a handle positioned at the start of a (zero-based) line."""
+
+        point = self.index().locate_line(line)
+        with self._handle_from(point) as handle:
+            for _ in range(line - point.line):
+                if not handle.readline():
+                    break
+            yield handle
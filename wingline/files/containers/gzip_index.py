@@ -0,0 +1,217 @@
+"""Random-access index for gzip files.
+
+Gzip is a stream, so reaching the middle of a file normally means
+inflating everything before it. An index records access points at gzip
+member boundaries (every BGZF block is a member, and concatenated gzip
+files have one per part) roughly every `span` bytes of content, along
+with the number of lines before each, so a reader can start inflating
+from the nearest member instead of from byte zero.
+
+Deflate streams can only be resumed mid-member with a bit-level
+inflatePrime, which Python's zlib doesn't expose, so a single-member
+gzip file gets just the one access point at its start.
+
+Indexes are stored as `.wlidx` files in the index directory (the
+`index_dir` setting, or a per-user cache directory), named by the
+file's path and tagged with its content hash, so reading a file never
+writes beside it. With the `gzip_index` setting off (`WL_GZIP_INDEX=0`)
+none are saved, and random access builds its index afresh each time.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import pathlib
+import zlib
+from typing import BinaryIO, Iterable, NamedTuple, Optional
+
+import msgpack
+
+from wingline import hasher
+from wingline.files.containers import bgzf
+from wingline.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".wlidx"
+# Content bytes between access points.
+SPAN = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+
+def index_dir() -> pathlib.Path:
+    """Return the directory indexes are kept in."""
+
+    if settings.index_dir is not None:
+        return settings.index_dir
+    cache = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache) / "wingline" / "gzip-index"
+
+
+class AccessPoint(NamedTuple):
+    """A member boundary at which inflation can start."""
+
+    compressed_offset: int
+    offset: int
+    line: int
+
+
+class IndexBuilder:
+    """Accumulate access points as a gzip file is read from the start.
+
+    The raw bytes are hashed on the way through, so the finished
+    index carries the file's content hash without a second read.
+    """
+
+    def __init__(self, span: int = SPAN):
+        self.span = span
+        self.points: list[AccessPoint] = []
+        self.size = 0
+        self.lines = 0
+        self._hash = hasher.hasher()
+
+    def raw(self, data: bytes) -> None:
+        """Record raw (compressed) bytes, in file order."""
+
+        self._hash.update(data)
+
+    def member(self, compressed_offset: int) -> None:
+        """Record the start of a member at a compressed offset."""
+
+        if not self.points or self.size - self.points[-1].offset >= self.span:
+            self.points.append(AccessPoint(compressed_offset, self.size, self.lines))
+
+    def content(self, data: bytes) -> None:
+        """Record inflated content, in file order."""
+
+        self.size += len(data)
+        self.lines += data.count(b"\n")
+
+    def finish(self, path: pathlib.Path) -> GzipIndex:
+        return GzipIndex(
+            self.points, self.size, self.lines, self._hash.hexdigest(), path.stat()
+        )
+
+
+class GzipIndex:
+    """Access points into a gzip file."""
+
+    def __init__(
+        self,
+        points: Iterable[AccessPoint],
+        size: int,
+        lines: int,
+        content_hash: str,
+        stat: os.stat_result,
+    ):
+        self.points = list(points) or [AccessPoint(0, 0, 0)]
+        self.size = size
+        self.lines = lines
+        self.content_hash = content_hash
+        self._stat_key = (stat.st_size, stat.st_mtime_ns)
+        self._offsets = [point.offset for point in self.points]
+        self._lines = [point.line for point in self.points]
+
+    @classmethod
+    def build(cls, path: pathlib.Path, span: int = SPAN) -> GzipIndex:
+        """Build an index by inflating the whole file once."""
+
+        builder = IndexBuilder(span)
+        with path.open("rb") as handle:
+            if bgzf.read_block_header(handle) is not None:
+                with bgzf.BlockReader(handle, builder) as reader:
+                    while reader.read(READ_SIZE):
+                        pass
+            else:
+                _scan_members(handle, builder)
+        return builder.finish(path)
+
+    @staticmethod
+    def index_path(path: pathlib.Path) -> pathlib.Path:
+        """Return where the index of a file is kept."""
+
+        name = hasher.hasher(str(path.resolve()).encode("utf-8")).hexdigest()
+        return index_dir() / name[:2] / f"{name}{INDEX_SUFFIX}"
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> Optional[GzipIndex]:
+        """Load the index for a file, if there's a valid one."""
+
+        try:
+            data = msgpack.unpackb(cls.index_path(path).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        stat = path.stat()
+        if [stat.st_size, stat.st_mtime_ns] != data["stat"]:
+            # Touched or copied: still good if the content is the same.
+            if hasher.hash_file(path) != data["hash"]:
+                return None
+        return cls(
+            (AccessPoint(*point) for point in data["points"]),
+            data["size"],
+            data["lines"],
+            data["hash"],
+            stat,
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Save the index of a file, if the index directory is writable."""
+
+        if not settings.gzip_index:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "hash": self.content_hash,
+            "stat": list(self._stat_key),
+            "size": self.size,
+            "lines": self.lines,
+            "points": [list(point) for point in self.points],
+        }
+        index_path = self.index_path(path)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            index_path.write_bytes(msgpack.packb(data))
+        except OSError as exc:
+            logger.debug("Couldn't save gzip index for %s: %s", path, exc)
+
+    def locate_offset(self, offset: int) -> AccessPoint:
+        """The last access point at or before a content offset."""
+
+        return self.points[max(bisect.bisect_right(self._offsets, offset) - 1, 0)]
+
+    def locate_line(self, line: int) -> AccessPoint:
+        """The last access point strictly inside the lines before `line`.
+
+        Starting there and skipping `line - point.line` newlines lands on
+        the start of the line.
+        """
+
+        return self.points[max(bisect.bisect_left(self._lines, line) - 1, 0)]
+
+
+def _scan_members(handle: BinaryIO, builder: IndexBuilder) -> None:
+    """Index any gzip file member by member."""
+
+    decompressor = zlib.decompressobj(wbits=31)
+    builder.member(0)
+    consumed = 0
+    pending = b""
+    while True:
+        if not pending:
+            pending = handle.read(READ_SIZE)
+            if not pending:
+                return
+            consumed += len(pending)
+            builder.raw(pending)
+        builder.content(decompressor.decompress(pending, READ_SIZE))
+        if decompressor.eof:
+            pending = decompressor.unused_data
+            builder.member(consumed - len(pending))
+            decompressor = zlib.decompressobj(wbits=31)
+        else:
+            pending = decompressor.unconsumed_tail
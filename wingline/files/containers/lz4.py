@@ -0,0 +1,64 @@
+"""LZ4 container."""
+
+import contextlib
+import pathlib
+from typing import Any, BinaryIO, Generator, cast
+
+from wingline.exceptions import MissingDependencyError
+from wingline.files.containers import _base, _parallel
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover
+    lz4 = None
+
+# Content per independently compressed frame.
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _lz4_frame() -> Any:
+    if lz4 is None:
+        raise MissingDependencyError(
+            "LZ4 files need the lz4 package: pip install wingline[compression]"
+        )
+    return lz4.frame
+
+
+class Lz4(_base.Container):
+    """LZ4 (frame format) container
+
+    Writes are split into independent frames compressed concurrently;
+    LZ4 readers accept the concatenated frames.
+    """
+
+    mime_type = "application/x-lz4"
+
+    @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        if lz4 is None:
+            return b""
+        try:
+            decompressor = lz4.frame.LZ4FrameDecompressor()
+            return cast(bytes, decompressor.decompress(raw, size))
+        except RuntimeError:
+            return b""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle."""
+
+        with _lz4_frame().open(path, "rb") as handle:
+            yield cast(BinaryIO, handle)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_write_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle for writing."""
+
+        compress = _lz4_frame().compress
+        raw = cast(BinaryIO, path.open("wb"))
+        with _parallel.ChunkWriter(raw, compress, CHUNK_SIZE) as handle:
+            yield cast(BinaryIO, handle)
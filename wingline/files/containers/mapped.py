@@ -0,0 +1,42 @@
+"""Memory-mapped plain file container."""
+
+import contextlib
+import mmap
+import os
+import pathlib
+import stat
+from typing import BinaryIO, Generator, cast
+
+from wingline.files.containers import _base
+
+
+def _mappable(handle: BinaryIO) -> bool:
+    """Whether an open file can be memory-mapped."""
+
+    status = os.fstat(handle.fileno())
+    return stat.S_ISREG(status.st_mode) and status.st_size > 0
+
+
+class Mmap(_base.Container):
+    """Uncompressed file, read through a memory map.
+
+    Formats get the `mmap.mmap` itself as their handle, so lines are
+    sliced straight out of the page cache with no read() syscalls or
+    intermediate buffer. Empty and non-regular files (pipes, devices),
+    which can't be mapped, are opened normally.
+    """
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle."""
+
+        with path.open("rb") as handle:
+            if not _mappable(handle):
+                yield handle
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    # Read-ahead aggressively and drop pages once passed.
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                yield cast(BinaryIO, mapped)
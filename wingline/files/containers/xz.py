@@ -0,0 +1,48 @@
+"""Xz container."""
+
+import contextlib
+import lzma
+import pathlib
+from typing import BinaryIO, Generator, cast
+
+from wingline.files.containers import _base, _parallel
+
+# Content per independently compressed stream; the default preset's
+# dictionary size, so splitting costs little ratio.
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class Xz(_base.Container):
+    """Xz container
+
+    Writes are split into independent streams compressed concurrently;
+    xz readers accept the concatenated streams.
+    """
+
+    mime_type = "application/x-xz"
+
+    @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        try:
+            return lzma.LZMADecompressor().decompress(raw, size)
+        except (lzma.LZMAError, EOFError):
+            return b""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle."""
+
+        with lzma.open(path) as handle:
+            yield cast(BinaryIO, handle)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_write_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle for writing."""
+
+        raw = cast(BinaryIO, path.open("wb"))
+        with _parallel.ChunkWriter(raw, lzma.compress, CHUNK_SIZE) as handle:
+            yield cast(BinaryIO, handle)
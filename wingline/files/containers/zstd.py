@@ -0,0 +1,69 @@
+"""Zstandard container."""
+
+import contextlib
+import io
+import pathlib
+from types import ModuleType
+from typing import Any, BinaryIO, Generator, Optional, cast
+
+from wingline.exceptions import MissingDependencyError
+from wingline.files.containers import _base, _parallel
+
+zstandard: Optional[ModuleType]
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSION_LEVEL = 3
+
+
+def _zstandard() -> Any:
+    if zstandard is None:
+        raise MissingDependencyError(
+            "Zstandard files need the zstandard package: "
+            "pip install wingline[compression]"
+        )
+    return zstandard
+
+
+class Zstd(_base.Container):
+    """Zstandard container
+
+    Compression uses zstd's own worker threads.
+    """
+
+    mime_type = "application/zstd"
+
+    @staticmethod
+    def peek(raw: bytes, size: int) -> bytes:
+        """Return up to `size` bytes of content from the raw start of a file."""
+
+        if zstandard is None:
+            return b""
+        try:
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            return decompressor.decompress(raw)[:size]
+        except zstandard.ZstdError:
+            return b""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle."""
+
+        decompressor = _zstandard().ZstdDecompressor()
+        raw = decompressor.stream_reader(path.open("rb"), read_across_frames=True)
+        with io.BufferedReader(raw) as handle:
+            yield cast(BinaryIO, handle)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _get_write_handle(path: pathlib.Path) -> Generator[BinaryIO, None, None]:
+        """Return a file handle for writing."""
+
+        compressor = _zstandard().ZstdCompressor(
+            level=COMPRESSION_LEVEL, threads=_parallel.THREADS
+        )
+        with compressor.stream_writer(path.open("wb")) as handle:
+            yield cast(BinaryIO, handle)
@@ -1,21 +1,40 @@
 """Abstract reader/writer of line-delimited data."""
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import pathlib
 from typing import Any, Generator, Optional
 
 from wingline import hasher
-from wingline.files import filetype
+from wingline.files import filetype, sharding, tailing
 
 logger = logging.getLogger(__name__)
 
 
 class File:
-    def __init__(self, path: pathlib.Path):
+    """A source file.
+
+    If `workers` is given and the file is splittable (see `sharding`),
+    it's decoded in that many processes, in order unless `ordered` is
+    false. If the reader only wants a tail, and the file can be tailed
+    (see `tailing`), only the end of the file is read. With `compact`,
+    payloads come out as records (see `wingline.records`).
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        compact: bool = False,
+    ):
         self.path = path
         self.reader = filetype.get_reader(self.path)
+        self.reader.compact = compact
+        self.workers = workers
+        self.ordered = ordered
 
     @property
     def stat(self) -> Optional[os.stat_result]:
@@ -46,6 +65,16 @@ class File:
 
     def _iterator(self) -> Generator[dict[str, Any], None, None]:
         """Iterate over the lines in the file."""
+        if self.reader.tail is not None and tailing.is_tailable(self.reader):
+            payloads = tailing.read(self.reader, self.reader.tail)
+        elif self.workers and sharding.is_splittable(self.reader):
+            payloads = sharding.read(self.reader, self.workers, self.ordered)
+        else:
+            payloads = None
+        if payloads is not None:
+            with contextlib.closing(payloads):
+                yield from self.reader.compacted(payloads)
+            return
         with self.reader as reader:
             for line in reader:
                 yield line
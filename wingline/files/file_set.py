@@ -0,0 +1,144 @@
+"""A set of source files read as one stream."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import functools
+import glob
+import os
+import pathlib
+from typing import Any, Generator, Iterable, Iterator, NamedTuple, Union
+
+from wingline import hasher
+from wingline.files import _readers, reader
+from wingline.files.containers import gzip_index
+from wingline.files.formats import _base
+from wingline.types import Payload
+
+# Files read concurrently.
+READERS = 4
+
+# Number of (path, stat) content hashes to remember.
+HASH_CACHE_SIZE = 16384
+
+
+class Progress(NamedTuple):
+    """How far through a file the set has read."""
+
+    payloads: int
+    complete: bool
+
+
+@functools.lru_cache(maxsize=HASH_CACHE_SIZE)
+def _hash_file(path: pathlib.Path, size: int, modified_at: int, inode: int) -> str:
+    """Hash a file's content, caching by path and stat."""
+
+    return hasher.hash_file(path)
+
+
+def hash_file(path: pathlib.Path) -> str:
+    """Hash a file's content, skipping files unchanged since last time."""
+
+    stat = path.stat()
+    return _hash_file(path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def _is_source(path: pathlib.Path) -> bool:
+    return path.is_file() and not path.name.endswith(gzip_index.INDEX_SUFFIX)
+
+
+def expand(
+    source: Union[str, pathlib.Path, Iterable[pathlib.Path]],
+) -> list[pathlib.Path]:
+    """Expand a source into a sorted list of file paths.
+
+    The source is a directory (every file beneath it), a glob pattern
+    (`**` matches across directories), a manifest file listing one path
+    per line (relative to the manifest), or an iterable of paths.
+    Directories and globs skip gzip index sidecars, which earlier
+    versions saved beside the files they index.
+    """
+
+    if isinstance(source, str):
+        return sorted(
+            path
+            for path in map(pathlib.Path, glob.glob(source, recursive=True))
+            if _is_source(path)
+        )
+    if isinstance(source, pathlib.Path):
+        if source.is_dir():
+            return sorted(path for path in source.rglob("*") if _is_source(path))
+        lines = source.read_text().splitlines()
+        return [source.parent / line.strip() for line in lines if line.strip()]
+    return list(source)
+
+
+class FileSet:
+    """Files read concurrently by a bounded pool of reader threads.
+
+    Payloads come out file by file in path order, or if `ordered` is
+    false, interleaved as they're read. The set's hash combines the
+    files' content hashes, which are cached by path and stat so an
+    unchanged file isn't hashed twice.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, pathlib.Path, Iterable[pathlib.Path]],
+        readers: int = READERS,
+        ordered: bool = True,
+        compact: bool = False,
+    ):
+        self.paths = expand(source)
+        if not self.paths:
+            raise ValueError(f"No files found in {source}")
+        self.readers = readers
+        self.ordered = ordered
+        self.compact = compact
+        self.fields: _base.Fields = None
+        self.prefilter: _base.Prefilter = None
+        self._read: dict[pathlib.Path, int] = {}
+        self._complete: set[pathlib.Path] = set()
+
+    @functools.cached_property
+    def content_hash(self) -> str:
+        # Paths are relative, so the same tree hashes alike wherever it is.
+        root = pathlib.Path(os.path.commonpath(self.paths))
+        with concurrent.futures.ThreadPoolExecutor(self.readers) as executor:
+            hashes = executor.map(hash_file, self.paths)
+            combined = hasher.hasher()
+            for path, content_hash in zip(self.paths, hashes):
+                name = path.relative_to(root) if path != root else path.name
+                combined.update(f"{name}:{content_hash}\n".encode("utf-8"))
+        return combined.hexdigest()
+
+    @property
+    def progress(self) -> dict[pathlib.Path, Progress]:
+        """Payloads read so far from each file."""
+
+        return {
+            path: Progress(self._read.get(path, 0), path in self._complete)
+            for path in self.paths
+        }
+
+    def _read_file(self, path: pathlib.Path) -> Iterator[Payload]:
+        with reader.Reader(
+            path, self.fields, self.prefilter, compact=self.compact
+        ) as payloads:
+            yield from payloads
+
+    def __iter__(self) -> Generator[dict[str, Any], None, None]:
+        batches = _readers.read_concurrently(
+            self.paths, self._read_file, self.readers, self.ordered
+        )
+        with contextlib.closing(batches):
+            for path, batch in batches:
+                if batch is None:
+                    self._complete.add(path)
+                    continue
+                self._read[path] = self._read.get(path, 0) + len(batch)
+                yield from batch
+
+    def __str__(self) -> str:
+        return f"{len(self.paths)} files"
@@ -1,7 +1,10 @@
 """Detect filetype."""
 
+from __future__ import annotations
+
+import functools
 import pathlib
-from typing import BinaryIO
+from typing import Optional
 
 import filetype
 
@@ -10,13 +13,73 @@ from wingline.files import containers, formats, reader
 # https://github.com/h2non/filetype.py/blame/master/README.rst#L19
 HEADER_SIZE = 261
 
+# Enough of the raw file to decompress a header's worth of content.
+SNIFF_SIZE = 4096
+
+# Number of (path, stat) detection results to remember.
+SNIFF_CACHE_SIZE = 16384
+
+# Compressions tarfile can read through.
+_TAR_COMPRESSIONS = (containers.Gzip, containers.Bz2, containers.Xz)
+_TAR_SUFFIXES = {".tar", ".tgz", ".tbz2", ".txz"}
+
+Detection = tuple[type[containers.Container], Optional[type[formats.Format]]]
+
+
+def format_from_header(
+    header: bytes, path: pathlib.PurePath
+) -> Optional[type[formats.Format]]:
+    """Detect the format from the start of the content, or the path."""
+
+    format_type = filetype.guess(header) if header else None
+    if format_type:
+        format_mime_type = format_type.mime
+    else:
+        format_mime_type = formats.get_mime_type_by_path(path)
+    if not format_mime_type:
+        return None
+    return formats.FORMATS.get(format_mime_type)
+
+
+@functools.lru_cache(maxsize=SNIFF_CACHE_SIZE)
+def _sniff(path: pathlib.Path, size: int, modified_at: int, inode: int) -> Detection:
+    """Detect the container and format from a single read of the header.
+
+    The stat fields are only part of the cache key: a changed
+    file gets a fresh detection.
+    """
+
+    with path.open("rb") as handle:
+        raw = handle.read(SNIFF_SIZE)
+    container_type = filetype.archive_match(raw)
+    container = containers.get_container_by_mime_type(
+        container_type.mime if container_type else None
+    )
+    header = container.peek(raw, containers.archive.TAR_HEADER_SIZE)
+    if container in _TAR_COMPRESSIONS and (
+        # Bzip2 can't be peeked into without its whole first block.
+        containers.archive.is_tar(header)
+        or _TAR_SUFFIXES.intersection(path.suffixes)
+    ):
+        return containers.Tar, None
+    if issubclass(container, containers.Archive):
+        # Each member has its own format.
+        return container, None
+    return container, format_from_header(header[:HEADER_SIZE], path)
+
+
+def sniff(path: pathlib.Path) -> Detection:
+    """Detect the container and format of a file, caching by path and stat."""
+
+    stat = path.stat()
+    return _sniff(path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
 
 def detect_container(path: pathlib.Path) -> type[containers.Container]:
     """Detect the container of a file"""
 
-    container_type = filetype.archive_match(path)
-    container_mime_type = container_type.mime if container_type else None
-    return containers.get_container_by_mime_type(container_mime_type)
+    container, _ = sniff(path)
+    return container
 
 
 def get_container(path: pathlib.Path) -> containers.Container:
@@ -26,15 +89,14 @@ def get_container(path: pathlib.Path) -> containers.Container:
 
 
 def detect_format(container: containers.Container) -> type[formats.Format]:
-    """Detect the format of an open file object."""
-
-    with container.handle() as handle:
-        format_type = filetype.guess(handle)
-    if format_type:
-        format_mime_type = format_type.mime if format_type else None
-    else:
-        format_mime_type = formats.get_mime_type_by_path(container.path)
-    format = formats.get_format_by_mime_type(format_mime_type)
+    """Detect the format of a file in a container."""
+
+    detected_container, format = sniff(container.path)
+    if detected_container is not type(container):
+        # Not the container the file would be detected as,
+        # so the sniffed header doesn't apply.
+        with container.handle() as handle:
+            format = format_from_header(handle.read(HEADER_SIZE), container.path)
     if not format:
         raise ValueError("Couldn't determine format.")
     return format
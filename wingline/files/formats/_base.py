@@ -1,10 +1,34 @@
 """Format base class"""
 
 import abc
-from typing import Any, BinaryIO, Iterable, Iterator
+import mmap
+from typing import AbstractSet, Any, BinaryIO, Callable, Iterable, Iterator, Optional
 
 from wingline.types import Payload
 
+Fields = Optional[AbstractSet[str]]
+Prefilter = Optional[Callable[[bytes], bool]]
+
+
+def project(payload: Payload, fields: Fields) -> Payload:
+    """Return a payload containing only the requested top-level fields."""
+
+    if fields is None:
+        return payload
+    return {key: payload[key] for key in fields if key in payload}
+
+
+def lines(handle: BinaryIO) -> Iterable[bytes]:
+    """Iterate over the lines of a handle.
+
+    Memory maps aren't line-iterable, but their readline() finds each
+    newline in the mapped pages and slices the line straight out.
+    """
+
+    if isinstance(handle, mmap.mmap):
+        return iter(handle.readline, b"")
+    return handle
+
 
 class Format(metaclass=abc.ABCMeta):
     """Base class for a file format."""
@@ -12,23 +36,41 @@ class Format(metaclass=abc.ABCMeta):
     mime_type: str
     suffixes: Iterable[str] = set()
 
-    def __init__(self, handle: BinaryIO):
+    def __init__(
+        self, handle: BinaryIO, fields: Fields = None, prefilter: Prefilter = None
+    ):
         self._handle = handle
+        self.fields = fields
+        self.prefilter = prefilter
 
     @property
     def reader(self) -> Iterator[dict[str, Any]]:
         """Reader property"""
 
-        return self.read(self._handle)
+        return self.read(self._handle, self.fields, self.prefilter)
 
     def writer(self, payload: Payload) -> None:
         """Writer property"""
 
         self.write(self._handle, payload)
 
+    def batch_writer(self, payloads: Iterable[Payload]) -> None:
+        """Batch writer property"""
+
+        self.write_many(self._handle, payloads)
+
     @abc.abstractmethod
-    def read(self, handle: BinaryIO) -> Iterator[dict[str, Any]]:
-        """Yields dicts from a file handle."""
+    def read(
+        self, handle: BinaryIO, fields: Fields = None, prefilter: Prefilter = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yields dicts from a file handle.
+
+        If `fields` is given, only those top-level keys need be decoded
+        and returned. If `prefilter` is given, formats with a raw
+        representation of each record may drop records it rejects
+        without decoding them. Both are optimisations: callers must
+        still apply the projection and filter themselves.
+        """
 
         raise NotImplementedError
 
@@ -37,3 +79,13 @@ class Format(metaclass=abc.ABCMeta):
         """Writes a payload dict to a file handle."""
 
         raise NotImplementedError
+
+    def write_many(self, handle: BinaryIO, payloads: Iterable[Payload]) -> None:
+        """Writes several payload dicts to a file handle.
+
+        Formats should override this to encode the whole batch and hand
+        it to the handle in one write.
+        """
+
+        for payload in payloads:
+            self.write(handle, payload)
@@ -2,6 +2,7 @@
 
 from typing import Any, BinaryIO, Iterable
 
+from wingline import records
 from wingline.files.formats import _base
 from wingline.json import json
 from wingline.types import Payload
@@ -13,13 +14,44 @@ class JsonLines(_base.Format):
     mime_type = "application/json"
     suffixes = {".json", ".jl", ".jsonl"}
 
-    def read(self, handle: BinaryIO) -> Iterable[dict[str, Any]]:
+    def read(
+        self,
+        handle: BinaryIO,
+        fields: _base.Fields = None,
+        prefilter: _base.Prefilter = None,
+    ) -> Iterable[dict[str, Any]]:
         """Dict iterator."""
 
-        for line in handle:
-            yield json.loads(line)
+        lines = _base.lines(handle)
+        if prefilter is not None:
+            lines = filter(prefilter, lines)
+
+        if fields is None:
+            for line in lines:
+                yield json.loads(line)
+            return
+
+        # The JSON decoders can't skip fields, but projecting straight
+        # after decoding lets the unused values be freed before the
+        # payload is queued downstream.
+        for line in lines:
+            yield _base.project(json.loads(line), fields)
+
+    @staticmethod
+    def _encode(payload: Payload) -> str:
+        if isinstance(payload, records.Record):
+            # The encoders only sort the keys of dicts.
+            payload = payload.as_dict()
+        return json.dumps(payload, default=records.default_str, sort_keys=True)
 
     def write(self, handle: BinaryIO, payload: Payload) -> None:
         """Writer."""
 
-        handle.write(json.dumps(payload, default=str, sort_keys=True).encode("utf-8"))
+        handle.write(f"{self._encode(payload)}\n".encode("utf-8"))
+
+    def write_many(self, handle: BinaryIO, payloads: Iterable[Payload]) -> None:
+        """Batch writer."""
+
+        lines = "\n".join(map(self._encode, payloads))
+        if lines:
+            handle.write(f"{lines}\n".encode("utf-8"))
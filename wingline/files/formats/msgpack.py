@@ -4,24 +4,62 @@ from typing import Any, BinaryIO, Iterable
 
 import msgpack
 
+from wingline import records
 from wingline.files.formats import _base
 from wingline.types import Payload
 
 
+def _pack(packer: msgpack.Packer, payload: Payload) -> bytes:
+    if isinstance(payload, records.Record):
+        # Straight from the record's fields and values, with no dict.
+        return packer.pack_map_pairs(payload.pairs())
+    return packer.pack(payload)
+
+
 class Msgpack(_base.Format):
     """Msgpack format."""
 
     mime_type = "application/x-msgpack"
     suffixes = {".wingline", ".msgpack"}
 
-    def read(self, handle: BinaryIO) -> Iterable[dict[str, Any]]:
+    def read(
+        self,
+        handle: BinaryIO,
+        fields: _base.Fields = None,
+        prefilter: _base.Prefilter = None,
+    ) -> Iterable[dict[str, Any]]:
         """Dict iterator."""
 
         unpacker = msgpack.Unpacker(handle)
-        for item in unpacker:
+        if fields is None:
+            for item in unpacker:
+                yield item
+            return
+
+        # Walk each map key by key so the values of unwanted
+        # fields are skipped without ever being materialised.
+        while True:
+            try:
+                size = unpacker.read_map_header()
+            except msgpack.OutOfData:
+                return
+            item = {}
+            for _ in range(size):
+                key = unpacker.unpack()
+                if key in fields:
+                    item[key] = unpacker.unpack()
+                else:
+                    unpacker.skip()
             yield item
 
     def write(self, handle: BinaryIO, payload: Payload) -> None:
         """Writer."""
 
-        handle.write(msgpack.packb(payload))
+        packer = msgpack.Packer(default=records.default)
+        handle.write(_pack(packer, payload))
+
+    def write_many(self, handle: BinaryIO, payloads: Iterable[Payload]) -> None:
+        """Batch writer."""
+
+        packer = msgpack.Packer(autoreset=True, default=records.default)
+        handle.write(b"".join(_pack(packer, payload) for payload in payloads))
@@ -1,33 +1,114 @@
 """Reader class."""
 
 import contextlib
+import functools
+import io
+import logging
 import pathlib
-from typing import Any, Generator, Iterator
+from typing import (
+    AbstractSet,
+    Any,
+    BinaryIO,
+    Callable,
+    Generator,
+    Iterator,
+    Optional,
+    cast,
+)
 
-from wingline.files import filetype
+from wingline import records
+from wingline.files import _readers, containers, filetype
+from wingline.files.containers import _parallel
+
+logger = logging.getLogger(__name__)
 
 
 class Reader:
-    """An abstract reader that yields dicts from any source."""
+    """An abstract reader that yields dicts from any source.
+
+    Archives are read member by member, detecting each member's format
+    and skipping members in no known format. Zip members are decoded
+    concurrently. With `compact`, payloads come out as records (see
+    `wingline.records`).
+    """
 
     def __init__(
         self,
         path: pathlib.Path,
+        fields: Optional[AbstractSet[str]] = None,
+        prefilter: Optional[Callable[[bytes], bool]] = None,
+        tail: Optional[int] = None,
+        compact: bool = False,
     ):
         self.path = path
-        self.container = filetype.get_container(self.path)
-        self.format_type = filetype.detect_format(self.container)
+        self.fields = fields
+        self.prefilter = prefilter
+        # If set, only this many payloads from the end are needed.
+        self.tail = tail
+        self.compact = compact
+        container_type, format_type = filetype.sniff(self.path)
+        if format_type is None and not issubclass(container_type, containers.Archive):
+            raise ValueError("Couldn't determine format.")
+        self.container = container_type(self.path)
+        self.format_type = format_type
 
     @contextlib.contextmanager
     def _get_handle(self):
         with self.container.handle() as _handle:
             yield _handle
 
+    def _read_member(self, name: str, handle: BinaryIO) -> Iterator[dict[str, Any]]:
+        """Detect a member's format and read it."""
+
+        # Archive members are buffered, so the header can be peeked at.
+        buffered = cast(io.BufferedReader, handle)
+        header = buffered.peek(filetype.HEADER_SIZE)[: filetype.HEADER_SIZE]
+        format_type = filetype.format_from_header(header, pathlib.PurePath(name))
+        if format_type is None:
+            logger.warning("Skipping %s in %s: unknown format.", name, self.path)
+            return
+        yield from format_type(handle, self.fields, self.prefilter).reader
+
+    def _open_member(
+        self, archive: containers.Archive, name: str
+    ) -> Iterator[dict[str, Any]]:
+        with archive.open_member(name) as handle:
+            yield from self._read_member(name, handle)
+
+    def _iter_archive(
+        self, archive: containers.Archive
+    ) -> Generator[dict[str, Any], None, None]:
+        if archive.random_access:
+            batches = _readers.read_concurrently(
+                archive.names(),
+                functools.partial(self._open_member, archive),
+                _parallel.THREADS,
+            )
+            with contextlib.closing(batches):
+                for _, batch in batches:
+                    yield from batch or ()
+            return
+        with archive.members() as members:
+            for name, handle in members:
+                yield from self._read_member(name, handle)
+
+    def compacted(self, payloads: Iterator[dict[str, Any]]) -> Iterator[Any]:
+        """Return payloads as records if the reader is compact."""
+
+        return map(records.compact, payloads) if self.compact else payloads
+
     @contextlib.contextmanager
     def _get_iterator(self) -> Generator[Iterator[dict[str, Any]], None, None]:
+        if isinstance(self.container, containers.Archive):
+            archive = self._iter_archive(self.container)
+            with contextlib.closing(archive):
+                yield self.compacted(archive)
+            return
+        if self.format_type is None:
+            raise ValueError("Couldn't determine format.")
         with self._get_handle() as _handle:
-            iterator = self.format_type(_handle).reader
-            yield iterator
+            iterator = self.format_type(_handle, self.fields, self.prefilter).reader
+            yield self.compacted(iterator)
 
     def __enter__(self):
         """Context manager entrypoint."""
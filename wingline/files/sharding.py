@@ -0,0 +1,159 @@
+"""Read one large file as byte-range shards in parallel processes.
+
+The content is cut into ranges of about `SHARD_SIZE` bytes. A line
+belongs to the shard its first byte falls in, so each worker skips the
+partial line it starts in (unless it starts at zero) and finishes the
+line it ends in. Workers decode their shard and send it back packed as
+msgpack, which is quicker to ship between processes than pickle.
+
+Line formats in plain files are splittable, as are gzip files with
+access points to start from (blocked gzip, see `gzip_index`).
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import io
+import multiprocessing
+import os
+import pathlib
+from typing import TYPE_CHECKING, Generator, NamedTuple, Optional
+
+import msgpack
+
+from wingline.files import containers, formats
+from wingline.files.containers import bgzf
+from wingline.files.formats import _base
+
+if TYPE_CHECKING:
+    from wingline.files.reader import Reader
+    from wingline.types import Payload
+
+# Content bytes per shard: large enough to amortise the task overhead,
+# small enough that a decoded shard comfortably fits in memory.
+SHARD_SIZE = 16 * 1024 * 1024
+
+# Shards decoded ahead of the consumer, per worker.
+WINDOW = 2
+
+_LINE_FORMATS = (formats.JsonLines,)
+
+
+class Shard(NamedTuple):
+    """A byte range of a file's content."""
+
+    start: int
+    end: int
+
+
+def is_splittable(reader: Reader) -> bool:
+    """Whether a reader's source can be read in shards."""
+
+    if reader.format_type is None or not issubclass(reader.format_type, _LINE_FORMATS):
+        return False
+    if isinstance(reader.container, containers.Gzip):
+        return bgzf.is_blocked(reader.path)
+    return type(reader.container) in (containers.Container, containers.Mmap)
+
+
+def content_size(container: containers.Container) -> int:
+    """The size of a splittable container's content."""
+
+    if isinstance(container, containers.Gzip):
+        return container.index().size
+    return container.path.stat().st_size
+
+
+def plan(size: int, shard_size: int = SHARD_SIZE) -> list[Shard]:
+    """Cut content of a given size into shards."""
+
+    starts = range(0, size, shard_size)
+    return [Shard(start, min(start + shard_size, size)) for start in starts]
+
+
+def read_shard_bytes(container: containers.Container, shard: Shard) -> bytes:
+    """Return the complete lines that start within a shard."""
+
+    start, end = shard
+    with container.handle_at(max(start - 1, 0)) as handle:
+        position = 0
+        if start > 0:
+            # Skip to the end of the line holding the byte before the
+            # shard: if that byte is a newline, this lands on `start`.
+            position = start - 1 + len(handle.readline())
+        if position >= end:
+            return b""
+        data = handle.read(end - position)
+        if data and not data.endswith(b"\n"):
+            data += handle.readline()
+    return data
+
+
+def _decode_shard(
+    path: pathlib.Path,
+    container_type: type[containers.Container],
+    format_type: type[formats.Format],
+    fields: _base.Fields,
+    prefilter: _base.Prefilter,
+    shard: Shard,
+) -> bytes:
+    """Worker: decode a shard and pack the payloads."""
+
+    data = read_shard_bytes(container_type(path), shard)
+    payloads = format_type(io.BytesIO(data), fields, prefilter).reader
+    return msgpack.packb(list(payloads))
+
+
+def _executor(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    # Pipelines run in threads, which don't survive a fork safely.
+    context = multiprocessing.get_context("spawn")
+    return concurrent.futures.ProcessPoolExecutor(workers, mp_context=context)
+
+
+def read(
+    reader: Reader, workers: Optional[int] = None, ordered: bool = True
+) -> Generator[Payload, None, None]:
+    """Yield the payloads of a splittable source, decoded in parallel.
+
+    If `ordered` is false, shards are yielded as they're finished, so
+    a slow shard doesn't hold up the rest.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    shards = iter(plan(content_size(reader.container), SHARD_SIZE))
+    args = (
+        reader.path,
+        type(reader.container),
+        reader.format_type,
+        reader.fields,
+        reader.prefilter,
+    )
+    executor = _executor(workers)
+
+    def submit(count: int) -> list[concurrent.futures.Future[bytes]]:
+        return [
+            executor.submit(_decode_shard, *args, shard)
+            for _, shard in zip(range(count), shards)
+        ]
+
+    try:
+        if ordered:
+            pending = collections.deque(submit(workers * WINDOW))
+            while pending:
+                packed = pending.popleft().result()
+                pending.extend(submit(1))
+                yield from msgpack.unpackb(packed)
+            return
+
+        running = set(submit(workers * WINDOW))
+        while running:
+            done, running = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            running |= set(submit(len(done)))
+            for future in done:
+                yield from msgpack.unpackb(future.result())
+    finally:
+        # Stopped early or failed: don't decode the rest of the file.
+        executor.shutdown(cancel_futures=True)
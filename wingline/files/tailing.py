@@ -0,0 +1,89 @@
+"""Read the last payloads of a file without reading all of it.
+
+A plain line file is searched backwards from its end for the start of
+the last lines; an indexed gzip file is entered at the access point
+before them (see `gzip_index`). Either way only the tail is decoded.
+If the tail comes up short (the index counts newlines, and the last
+line may not have one), the search goes back twice as far.
+
+The sources that can be tailed are exactly those that can be sharded.
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import TYPE_CHECKING, BinaryIO, Generator
+
+from wingline.files import containers, sharding
+
+if TYPE_CHECKING:
+    from wingline.files.reader import Reader
+    from wingline.types import Payload
+
+# Bytes read at a time when searching backwards for line starts.
+READ_SIZE = 64 * 1024
+
+is_tailable = sharding.is_splittable
+
+
+def line_start(handle: BinaryIO, size: int, lines: int) -> int:
+    """Return the offset of the start of the `lines`th line from the end.
+
+    A final newline ends the last line rather than starting another.
+    """
+
+    position = size
+    trailing = True
+    while position > 0:
+        start = max(position - READ_SIZE, 0)
+        handle.seek(start)
+        chunk = handle.read(position - start)
+        end = len(chunk)
+        if trailing and chunk.endswith(b"\n"):
+            end -= 1
+        trailing = False
+        while (end := chunk.rfind(b"\n", 0, end)) >= 0:
+            lines -= 1
+            if lines == 0:
+                return start + end + 1
+        position = start
+    return 0
+
+
+def _read_tail(
+    reader: Reader, lines: int, count: int
+) -> tuple[collections.deque[Payload], bool]:
+    """Read the last `count` payloads of the last `lines` lines.
+
+    Also returns whether those lines are the whole file.
+    """
+
+    if reader.format_type is None:
+        raise ValueError("Couldn't determine format.")
+    container = reader.container
+    if isinstance(container, containers.Gzip):
+        start = max(container.index().lines - lines, 0)
+        handle_context = container.handle_at_line(start)
+    else:
+        with container.handle() as handle:
+            start = line_start(handle, container.path.stat().st_size, lines)
+        handle_context = container.handle_at(start)
+
+    with handle_context as handle:
+        format = reader.format_type(handle, reader.fields, reader.prefilter)
+        payloads = collections.deque(format.reader, maxlen=count)
+    return payloads, start == 0
+
+
+def read(reader: Reader, count: int) -> Generator[Payload, None, None]:
+    """Yield the last `count` payloads of a tailable source, in order."""
+
+    if count <= 0:
+        return
+    lines = count
+    while True:
+        tail, whole = _read_tail(reader, lines, count)
+        if len(tail) == count or whole:
+            yield from tail
+            return
+        lines *= 2
@@ -2,12 +2,27 @@
 
 import contextlib
 import pathlib
-from typing import Callable, Generator, Iterator, Optional
+from typing import Any, BinaryIO, Callable, Generator, Iterable, Iterator, Optional
 
 from wingline.files import containers, formats
 from wingline.types import Payload
 
 
+class _CountingHandle:
+    """Write handle counting the bytes written through it."""
+
+    def __init__(self, handle: BinaryIO):
+        self._handle = handle
+        self.count = 0
+
+    def write(self, data: bytes) -> int:
+        self.count += len(data)
+        return self._handle.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._handle, name)
+
+
 class Writer:
     """An abstract writer that can write data to any format in any container."""
 
@@ -24,6 +39,13 @@ class Writer:
             else containers.Container(path)
         )
         self.format = format
+        self._counter: Optional[_CountingHandle] = None
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes written so far, before any compression or buffering."""
+
+        return self._counter.count if self._counter is not None else 0
 
     @contextlib.contextmanager
     def _get_write_handle(self):
@@ -33,8 +55,14 @@ class Writer:
     @contextlib.contextmanager
     def _get_writer(self) -> Generator[Callable[[Payload], None], None, None]:
         with self._get_write_handle() as _handle:
-            writer = self.format(_handle).writer
-            yield writer
+            self._counter = _CountingHandle(_handle)
+            self._format = self.format(self._counter)  # type: ignore[arg-type]
+            yield self._format.writer
+
+    def write_many(self, payloads: Iterable[Payload]) -> None:
+        """Write a batch of payloads in one go."""
+
+        self._format.batch_writer(payloads)
 
     def __enter__(self):
         """Context manager entrypoint."""
@@ -4,8 +4,6 @@ import hashlib
 import pathlib
 from typing import Any, Callable
 
-import dill as pickle  # nosec B403
-
 DIGEST_SIZE = 8
 HASH_BLOCK_SIZE = 4096
 
@@ -25,8 +23,14 @@ def hash_file(path: pathlib.Path) -> str:
 
 
 def hash_callable(callable: Callable[..., Any]) -> str:
-    """Hash a callable."""
+    """Hash a callable.
+
+    Dill is only imported here, when a pipeline is first hashed, as it
+    takes a while to import.
+    """
+
+    import dill  # nosec B403
 
-    callable_pickle = pickle.dumps(callable)
+    callable_pickle = dill.dumps(callable)
     callable_hash = hasher(callable_pickle).hexdigest()
     return callable_hash
@@ -1,10 +1,98 @@
-"""Helper operations."""
+"""Helper operations.
+
+Each helper's module is imported when the helper is first used, so
+importing one doesn't import the others (and what they depend on).
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from wingline.helpers.aggregation import (
+        count,
+        distinct,
+        group_by,
+        maximum,
+        mean,
+        minimum,
+        total,
+    )
+    from wingline.helpers.deduplication import dedupe
+    from wingline.helpers.joins import join
+    from wingline.helpers.predicates import equals, exists, one_of, prefix, where
+    from wingline.helpers.printers import pretty
+    from wingline.helpers.projections import select
+    from wingline.helpers.ranges import head, tail
+    from wingline.helpers.sampling import sample, sample_fraction, sample_stratified
+    from wingline.helpers.sketches import quantiles, top_k
+    from wingline.helpers.sorting import sort
+    from wingline.helpers.windows import session, sliding, tumbling
+
+_MODULES = {
+    "aggregation": (
+        "count",
+        "distinct",
+        "group_by",
+        "maximum",
+        "mean",
+        "minimum",
+        "total",
+    ),
+    "deduplication": ("dedupe",),
+    "joins": ("join",),
+    "predicates": ("equals", "exists", "one_of", "prefix", "where"),
+    "printers": ("pretty",),
+    "projections": ("select",),
+    "ranges": ("head", "tail"),
+    "sampling": ("sample", "sample_fraction", "sample_stratified"),
+    "sketches": ("quantiles", "top_k"),
+    "sorting": ("sort",),
+    "windows": ("session", "sliding", "tumbling"),
+}
+_HELPERS = {name: module for module, names in _MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module = _HELPERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_HELPERS})
 
-from wingline.helpers.printers import pretty
-from wingline.helpers.ranges import head, tail
 
 __all__ = [
+    "count",
+    "dedupe",
+    "distinct",
+    "equals",
+    "exists",
+    "group_by",
     "pretty",
     "head",
+    "join",
+    "maximum",
+    "mean",
+    "minimum",
+    "one_of",
+    "prefix",
+    "quantiles",
+    "sample",
+    "sample_fraction",
+    "sample_stratified",
+    "select",
+    "session",
+    "sliding",
+    "sort",
     "tail",
+    "top_k",
+    "total",
+    "tumbling",
+    "where",
 ]
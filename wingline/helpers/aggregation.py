@@ -0,0 +1,378 @@
+"""Grouping and aggregation."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import math
+import pathlib
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+import msgpack
+
+from wingline import hasher, records
+from wingline.types import Payload, PayloadIterable
+
+# Groups held in memory before partial aggregates are spilled to disk.
+MAX_GROUPS = 1_000_000
+
+# Files partial aggregates are spread across when spilled. Each is
+# then rolled up on its own, spilling again if it's still too big.
+PARTITIONS = 16
+
+Key = Union[str, tuple[str, ...]]
+States = list[Any]
+
+
+def _spill_default(value: Any) -> Any:
+    # States hold sets (distinct values) and payloads (top-k).
+    if isinstance(value, records.Record):
+        return value.as_dict()
+    return list(value)
+
+
+def _hash64(value: Any) -> int:
+    digest = hasher.hasher(msgpack.packb(value, default=str)).digest()
+    return int.from_bytes(digest, "big")
+
+
+class Aggregator:
+    """A combinable aggregate of one field (or of whole payloads).
+
+    The state of an aggregate must survive a round trip through
+    msgpack, and partial states of the same group must combine with
+    `merge`, so groups can be rolled up a part at a time.
+    """
+
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+
+    def _value(self, payload: Payload) -> Any:
+        return payload.get(self.field)  # type: ignore[arg-type]
+
+    def initial(self) -> Any:
+        """The state of an empty group."""
+
+        raise NotImplementedError
+
+    def add(self, state: Any, payload: Payload) -> Any:
+        """Return the state with a payload added."""
+
+        raise NotImplementedError
+
+    def merge(self, state: Any, other: Any) -> Any:
+        """Return two partial states of a group combined."""
+
+        raise NotImplementedError
+
+    def result(self, state: Any) -> Any:
+        """The aggregate value for a state."""
+
+        return state
+
+
+class Count(Aggregator):
+    """Count payloads, or only those with a value for `field`."""
+
+    def initial(self) -> int:
+        return 0
+
+    def add(self, state: int, payload: Payload) -> int:
+        if self.field is None or self._value(payload) is not None:
+            return state + 1
+        return state
+
+    def merge(self, state: int, other: int) -> int:
+        return state + other
+
+
+class Total(Aggregator):
+    """Sum a field, skipping payloads without it."""
+
+    def initial(self) -> Any:
+        return 0
+
+    def add(self, state: Any, payload: Payload) -> Any:
+        value = self._value(payload)
+        return state if value is None else state + value
+
+    def merge(self, state: Any, other: Any) -> Any:
+        return state + other
+
+
+class Minimum(Aggregator):
+    """Smallest value of a field, or None if it's never present."""
+
+    def initial(self) -> Any:
+        return None
+
+    def add(self, state: Any, payload: Payload) -> Any:
+        return self.merge(state, self._value(payload))
+
+    def merge(self, state: Any, other: Any) -> Any:
+        if state is None or (other is not None and other < state):
+            return other
+        return state
+
+
+class Maximum(Minimum):
+    """Largest value of a field, or None if it's never present."""
+
+    def merge(self, state: Any, other: Any) -> Any:
+        if state is None or (other is not None and other > state):
+            return other
+        return state
+
+
+class Mean(Aggregator):
+    """Mean of a field, or None if it's never present."""
+
+    def initial(self) -> tuple[Any, int]:
+        return (0, 0)
+
+    def add(self, state: tuple[Any, int], payload: Payload) -> tuple[Any, int]:
+        value = self._value(payload)
+        if value is None:
+            return state
+        return (state[0] + value, state[1] + 1)
+
+    def merge(self, state: tuple[Any, int], other: tuple[Any, int]) -> tuple[Any, int]:
+        return (state[0] + other[0], state[1] + other[1])
+
+    def result(self, state: tuple[Any, int]) -> Optional[float]:
+        return state[0] / state[1] if state[1] else None
+
+
+class Distinct(Aggregator):
+    """Approximate number of distinct values of a field (HyperLogLog).
+
+    Small groups keep the exact set of value hashes, so their counts
+    are exact; past `2 ** precision / 16` values a group switches to
+    `2 ** precision` one-byte registers, with a standard error of about
+    `1.04 / sqrt(2 ** precision)` (0.8% at the default precision).
+    """
+
+    def __init__(self, field: str, precision: int = 14):
+        super().__init__(field)
+        if not 4 <= precision <= 18:
+            raise ValueError("Precision must be between 4 and 18.")
+        self.precision = precision
+        self._registers = 1 << precision
+        self._sparse_limit = self._registers // 16
+
+    def _dense(self, state: Any) -> bytearray:
+        if isinstance(state, bytearray):
+            return state
+        if isinstance(state, bytes):
+            return bytearray(state)
+        registers = bytearray(self._registers)
+        for value_hash in state:
+            self._update(registers, value_hash)
+        return registers
+
+    def _update(self, registers: bytearray, value_hash: int) -> None:
+        index = value_hash >> (64 - self.precision)
+        remainder = value_hash & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - remainder.bit_length() + 1
+        if rank > registers[index]:
+            registers[index] = rank
+
+    def initial(self) -> set[int]:
+        return set()
+
+    def add(self, state: Any, payload: Payload) -> Any:
+        value = self._value(payload)
+        if value is None:
+            return state
+        value_hash = _hash64(value)
+        if isinstance(state, (bytes, bytearray)):
+            state = self._dense(state)
+            self._update(state, value_hash)
+            return state
+        if not isinstance(state, set):
+            state = set(state)
+        state.add(value_hash)
+        return self._dense(state) if len(state) > self._sparse_limit else state
+
+    def merge(self, state: Any, other: Any) -> Any:
+        if isinstance(state, (bytes, bytearray)) or isinstance(
+            other, (bytes, bytearray)
+        ):
+            state, other = self._dense(state), self._dense(other)
+            return bytearray(map(max, state, other))
+        merged = set(state) | set(other)
+        return self._dense(merged) if len(merged) > self._sparse_limit else merged
+
+    def result(self, state: Any) -> int:
+        if not isinstance(state, (bytes, bytearray)):
+            return len(state)
+        registers = self._registers
+        alpha = 0.7213 / (1 + 1.079 / registers)
+        estimate = alpha * registers**2 / sum(2.0**-rank for rank in state)
+        zeros = state.count(0)
+        if estimate <= 2.5 * registers and zeros:
+            estimate = registers * math.log(registers / zeros)
+        return round(estimate)
+
+
+count = Count
+total = Total
+minimum = Minimum
+maximum = Maximum
+mean = Mean
+distinct = Distinct
+
+
+class _Spill:
+    """Partial aggregates spread across partition files."""
+
+    def __init__(self, directory: pathlib.Path, depth: int):
+        directory = pathlib.Path(tempfile.mkdtemp(dir=directory))
+        self.paths = [
+            directory / f"{partition}.msgpack" for partition in range(PARTITIONS)
+        ]
+        self.depth = depth
+        self._handles = [path.open("wb") for path in self.paths]
+        self._packer = msgpack.Packer(autoreset=True, default=_spill_default)
+
+    def write(self, table: dict[Any, States]) -> None:
+        for key, states in table.items():
+            # Salt the hash with the depth so a partition spilled
+            # again splits differently.
+            partition = _hash64([self.depth, key]) % PARTITIONS
+            self._handles[partition].write(self._packer.pack([key, states]))
+
+    def close(self) -> None:
+        for handle in self._handles:
+            handle.close()
+
+    @staticmethod
+    def read(path: pathlib.Path) -> Iterator[tuple[Any, States]]:
+        with path.open("rb") as handle:
+            # Keys must come back hashable: tuples, not lists.
+            yield from msgpack.Unpacker(handle, use_list=False)
+        path.unlink()
+
+
+class Aggregate:
+    """Roll payloads up into one payload per group.
+
+    Each output payload has the group's key field(s) and one field per
+    aggregator. At most `max_groups` groups are held in memory; past
+    that, partial aggregates are spilled to partition files in a
+    temporary directory, and each partition is rolled up in turn.
+    Groups come out in no particular order.
+    """
+
+    def __init__(
+        self,
+        key: Key,
+        aggregators: dict[str, Aggregator],
+        max_groups: int = MAX_GROUPS,
+        temp_dir: Optional[pathlib.Path] = None,
+    ):
+        if not aggregators:
+            raise ValueError("At least one aggregator is needed.")
+        self.key = key
+        self.aggregators = aggregators
+        self.max_groups = max_groups
+        self.temp_dir = temp_dir
+
+    def _keyed(self, parent: PayloadIterable) -> Iterator[tuple[Any, Payload]]:
+        key = self.key
+        if isinstance(key, str):
+            return ((payload.get(key), payload) for payload in parent)
+        return (
+            (tuple(payload.get(field) for field in key), payload) for payload in parent
+        )
+
+    def _add(self, states: States, payload: Payload) -> None:
+        for index, aggregator in enumerate(self.aggregators.values()):
+            states[index] = aggregator.add(states[index], payload)
+
+    def _merge(self, states: States, other: States) -> None:
+        for index, aggregator in enumerate(self.aggregators.values()):
+            states[index] = aggregator.merge(states[index], other[index])
+
+    def _roll_up(
+        self,
+        items: Iterable[tuple[Any, Any]],
+        combine: Callable[[States, Any], None],
+        directory: Callable[[], pathlib.Path],
+        depth: int = 0,
+    ) -> Iterator[tuple[Any, States]]:
+        aggregators = list(self.aggregators.values())
+        table: dict[Any, States] = {}
+        spill: Optional[_Spill] = None
+        for key, item in items:
+            states = table.get(key)
+            if states is None:
+                if len(table) >= self.max_groups:
+                    if spill is None:
+                        spill = _Spill(directory(), depth)
+                    spill.write(table)
+                    table = {}
+                states = table[key] = [
+                    aggregator.initial() for aggregator in aggregators
+                ]
+            combine(states, item)
+
+        if spill is None:
+            yield from table.items()
+            return
+        spill.write(table)
+        spill.close()
+        del table
+        for path in spill.paths:
+            yield from self._roll_up(
+                _Spill.read(path), self._merge, directory, depth + 1
+            )
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        with contextlib.ExitStack() as stack:
+
+            @functools.lru_cache(maxsize=None)
+            def directory() -> pathlib.Path:
+                return pathlib.Path(
+                    stack.enter_context(
+                        tempfile.TemporaryDirectory(
+                            prefix="wingline-group-", dir=self.temp_dir
+                        )
+                    )
+                )
+
+            groups = self._roll_up(self._keyed(parent), self._add, directory)
+            names = list(self.aggregators)
+            aggregators = list(self.aggregators.values())
+            for key, states in groups:
+                if isinstance(self.key, str):
+                    payload = {self.key: key}
+                else:
+                    payload = dict(zip(self.key, key))
+                for name, aggregator, state in zip(names, aggregators, states):
+                    payload[name] = aggregator.result(state)
+                yield payload
+
+
+class GroupBy:
+    """Group payloads by the value of a field, or of several fields.
+
+    `group_by(key).aggregate(name=aggregator, ...)` is the operation.
+    """
+
+    def __init__(
+        self,
+        key: Key,
+        max_groups: int = MAX_GROUPS,
+        temp_dir: Optional[pathlib.Path] = None,
+    ):
+        self.key = key
+        self.max_groups = max_groups
+        self.temp_dir = temp_dir
+
+    def aggregate(self, **aggregators: Aggregator) -> Aggregate:
+        return Aggregate(self.key, aggregators, self.max_groups, self.temp_dir)
+
+
+group_by = GroupBy
@@ -0,0 +1,165 @@
+"""Deduplication."""
+
+from __future__ import annotations
+
+import array
+import math
+from typing import Any, Callable, Iterator, Optional, Union
+
+import msgpack
+
+from wingline import hasher, records
+from wingline.types import Payload, PayloadIterable
+
+MODES = ("exact", "bloom")
+
+# Expected distinct keys, used to size a bloom filter up front.
+CAPACITY = 10_000_000
+ERROR_RATE = 0.001
+
+# Slots in a new digest set, and how full it gets before doubling.
+INITIAL_SLOTS = 1 << 16
+MAX_LOAD = 0.7
+
+Key = Union[str, tuple[str, ...], Callable[[Payload], Any]]
+
+
+class DigestSet:
+    """An open-addressing hash set of 64-bit digests.
+
+    Digests are stored unboxed in an array, 8 bytes a slot, which is
+    several times smaller than a Python set of the same ints. Zero
+    marks an empty slot, so a zero digest is stored as one.
+    """
+
+    def __init__(self, slots: int = INITIAL_SLOTS):
+        self._slots = array.array("Q", bytes(8 * slots))
+        self._mask = slots - 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._slots = array.array("Q", bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        self._size = 0
+        for digest in old:
+            if digest:
+                self.add(digest)
+
+    def add(self, digest: int) -> bool:
+        """Add a digest, returning False if it was already there."""
+
+        digest = digest or 1
+        slots, mask = self._slots, self._mask
+        index = digest & mask
+        while True:
+            found = slots[index]
+            if found == digest:
+                return False
+            if not found:
+                break
+            index = (index + 1) & mask
+        slots[index] = digest
+        self._size += 1
+        if self._size > MAX_LOAD * len(slots):
+            self._grow()
+        return True
+
+
+class BloomFilter:
+    """A bloom filter sized for `capacity` items at `error_rate`.
+
+    Past its capacity the false positive rate climbs.
+    """
+
+    def __init__(self, capacity: int = CAPACITY, error_rate: float = ERROR_RATE):
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate must be between 0 and 1.")
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._bits = bytearray((bits + 7) // 8)
+        self._size = len(self._bits) * 8
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+
+    def _positions(self, digest: int) -> Iterator[tuple[int, int]]:
+        # Double hashing: the digest's halves give all the positions.
+        size = self._size
+        first, second = digest >> 64, digest & 0xFFFFFFFFFFFFFFFF
+        for number in range(self._hashes):
+            position = (first + number * second) % size
+            yield position >> 3, 1 << (position & 7)
+
+    def __contains__(self, digest: int) -> bool:
+        bits = self._bits
+        return all(bits[byte] & mask for byte, mask in self._positions(digest))
+
+    def add(self, digest: int) -> bool:
+        """Add a 128-bit digest, returning False if it may have been there."""
+
+        bits = self._bits
+        new = False
+        for byte, mask in self._positions(digest):
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        return new
+
+
+class Dedupe:
+    """Drop payloads whose key has been seen before, keeping the first.
+
+    The key is a field name, a tuple of field names, a callable, or
+    None for the whole payload. Keys are hashed with blake2b, and only
+    the digests are kept:
+
+    - "exact" keeps 8-byte digests in a `DigestSet`. Two different
+      keys colliding is astronomically unlikely at 64 bits.
+    - "bloom" keeps a `BloomFilter` sized for `capacity` keys, in
+      about 1.8 bytes a key at the default error rate. A false
+      positive drops a payload that wasn't a duplicate, at a rate of
+      about `error_rate`.
+    """
+
+    def __init__(
+        self,
+        key: Optional[Key] = None,
+        mode: str = "exact",
+        capacity: int = CAPACITY,
+        error_rate: float = ERROR_RATE,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}: use one of {MODES}.")
+        self.key = key
+        self.mode = mode
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+    def _key_function(self) -> Callable[[Payload], Any]:
+        key = self.key
+        if key is None:
+            return lambda payload: payload
+        if callable(key):
+            return key
+        if isinstance(key, str):
+            return lambda payload: payload.get(key)
+        return lambda payload: [payload.get(field) for field in key]
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        key = self._key_function()
+        packer = msgpack.Packer(autoreset=True, default=records.default_str)
+        seen: Union[DigestSet, BloomFilter]
+        if self.mode == "exact":
+            seen, digest_size = DigestSet(), 8
+        else:
+            seen, digest_size = BloomFilter(self.capacity, self.error_rate), 16
+        add = seen.add
+        for payload in parent:
+            packed = packer.pack(key(payload))
+            digest = hasher.hasher(packed, digest_size=digest_size).digest()
+            if add(int.from_bytes(digest, "big")):
+                yield payload
+
+
+dedupe = Dedupe
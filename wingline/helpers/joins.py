@@ -0,0 +1,211 @@
+"""Hash joins against a side source."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import itertools
+import os
+import pathlib
+import sqlite3
+import tempfile
+from typing import Any, Callable, Collection, Iterable, Iterator, Optional, Union
+
+import msgpack
+
+from wingline import hasher, records
+from wingline.files import file
+from wingline.types import Payload, PayloadIterable
+
+HOWS = ("inner", "left")
+
+# Side rows loaded into a dict to probe in memory. Bigger sides are
+# probed on disk through the index, a batch of stream payloads at a time.
+MEMORY_ROWS = 1_000_000
+
+# Side rows inserted, and stream payloads probed, per statement. The
+# probe batch stays under SQLite's oldest limit on query parameters.
+BUILD_BATCH_SIZE = 10_000
+PROBE_BATCH_SIZE = 500
+
+Key = Union[str, tuple[str, ...]]
+
+
+def _key_function(on: Key) -> Callable[[Payload], Optional[bytes]]:
+    """Return a function packing a payload's key, or None if it's missing."""
+
+    if isinstance(on, str):
+
+        def _key(payload: Payload) -> Optional[bytes]:
+            value = payload.get(on)
+            return None if value is None else msgpack.packb(value)
+
+        return _key
+
+    def _keys(payload: Payload) -> Optional[bytes]:
+        values = [payload.get(field) for field in on]
+        return None if None in values else msgpack.packb(values)
+
+    return _keys
+
+
+class Join:
+    """Enrich each payload with the matching payloads of a side source.
+
+    The side is a path, a wingline source (such as a `Pipeline` or a
+    tap) or an iterable of payloads. Sides with a `hash` are known by
+    it; others are hashed by their content, and any that can't be read
+    twice (taps and pipelines with no hash, iterators) are first read
+    into memory, once. The side is read once into a SQLite index on
+    the `on` field(s). With a `cache_dir`, the index is kept there,
+    named by the side's content hash, so later runs skip the build.
+    Sides of up to `memory_rows` rows are then loaded into memory;
+    bigger ones are probed on disk.
+
+    Each match gives one output payload, the stream payload's fields
+    taking precedence over the side's. With `how="left"`, payloads with
+    no match are passed through as they are. Missing keys never match.
+
+    Only the side's hash is pickled, so hashing the operation doesn't
+    drag the side's content along.
+    """
+
+    def __init__(
+        self,
+        other: Union[pathlib.Path, PayloadIterable],
+        on: Key,
+        how: str = "inner",
+        cache_dir: Optional[pathlib.Path] = None,
+        memory_rows: int = MEMORY_ROWS,
+    ):
+        if how not in HOWS:
+            raise ValueError(f"Unknown join {how!r}: use one of {HOWS}.")
+        if isinstance(other, pathlib.Path):
+            other = file.File(other)
+        self.other = other
+        self.on = on
+        self.how = how
+        self.cache_dir = cache_dir
+        self.memory_rows = memory_rows
+        self._temp_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        other_hash = self.other_hash
+        state = self.__dict__.copy()
+        state["other"] = other_hash
+        state.pop("_temp_dir", None)
+        state.pop("index_path", None)
+        return state
+
+    @functools.cached_property
+    def other_hash(self) -> str:
+        """The content hash of the side source."""
+
+        try:
+            other_hash = getattr(self.other, "content_hash", None) or getattr(
+                self.other, "hash", None
+            )
+        except RuntimeError:
+            # A pipeline from a source with no hash (e.g. a list).
+            other_hash = None
+        if other_hash is not None:
+            return other_hash
+        if not isinstance(self.other, Collection):
+            # Taps, pipelines and iterators run only once: keep their
+            # output to both hash and index.
+            self.other = list(self.other)
+        content_hash = hasher.hasher()
+        for payload in self.other:
+            content_hash.update(msgpack.packb(payload, default=records.default))
+        return content_hash.hexdigest()
+
+    @functools.cached_property
+    def index_path(self) -> pathlib.Path:
+        """The path of the side's index, built if it doesn't exist yet."""
+
+        if self.cache_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="wingline-join-")
+            directory = pathlib.Path(self._temp_dir.name)
+        else:
+            directory = self.cache_dir / self.other_hash[:2]
+        on = self.on if isinstance(self.on, str) else "+".join(self.on)
+        path = directory / f"{self.other_hash}.{on}.join"
+        if not path.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            self._build(path)
+        return path
+
+    def _build(self, path: pathlib.Path) -> None:
+        # Hashing first reads a one-shot side into memory, so it's
+        # still there to hash after the index is built.
+        self.other_hash  # pylint: disable=pointless-statement
+        key = _key_function(self.on)
+        # Build beside the index and move it into place once done, so
+        # a half-built index is never found.
+        building = path.with_name(f"{path.name}.{os.getpid()}")
+        with contextlib.closing(sqlite3.connect(building)) as connection:
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute("CREATE TABLE side (key BLOB, payload BLOB)")
+            rows = (
+                (packed_key, msgpack.packb(payload, default=records.default))
+                for payload in self.other
+                if (packed_key := key(payload)) is not None
+            )
+            while batch := list(itertools.islice(rows, BUILD_BATCH_SIZE)):
+                connection.executemany("INSERT INTO side VALUES (?, ?)", batch)
+            connection.execute("CREATE INDEX side_key ON side (key)")
+            connection.commit()
+        building.replace(path)
+
+    def _emit(
+        self,
+        payload: Payload,
+        packed_key: Optional[bytes],
+        side: dict[bytes, list[Payload]],
+    ) -> Iterator[Payload]:
+        matches = side.get(packed_key, []) if packed_key is not None else []
+        if not matches:
+            if self.how == "left":
+                yield payload
+            return
+        for match in matches:
+            yield {**match, **payload}
+
+    def _probe_memory(
+        self, connection: sqlite3.Connection, payloads: Iterable[Payload]
+    ) -> Iterator[Payload]:
+        side: dict[bytes, list[Payload]] = {}
+        for packed_key, packed in connection.execute("SELECT key, payload FROM side"):
+            side.setdefault(packed_key, []).append(msgpack.unpackb(packed))
+        key = _key_function(self.on)
+        for payload in payloads:
+            yield from self._emit(payload, key(payload), side)
+
+    def _probe_disk(
+        self, connection: sqlite3.Connection, payloads: Iterable[Payload]
+    ) -> Iterator[Payload]:
+        key = _key_function(self.on)
+        iterator = iter(payloads)
+        while batch := list(itertools.islice(iterator, PROBE_BATCH_SIZE)):
+            keys = [key(payload) for payload in batch]
+            distinct = list(set(keys) - {None})
+            query = "SELECT key, payload FROM side WHERE key IN ({})".format(
+                ", ".join("?" * len(distinct))
+            )
+            side: dict[bytes, list[Payload]] = {}
+            for packed_key, packed in connection.execute(query, distinct):
+                side.setdefault(packed_key, []).append(msgpack.unpackb(packed))
+            for payload, packed_key in zip(batch, keys):
+                yield from self._emit(payload, packed_key, side)
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        with contextlib.closing(sqlite3.connect(self.index_path)) as connection:
+            (rows,) = connection.execute("SELECT COUNT(*) FROM side").fetchone()
+            if rows <= self.memory_rows:
+                yield from self._probe_memory(connection, parent)
+            else:
+                yield from self._probe_disk(connection, parent)
+
+
+join = Join
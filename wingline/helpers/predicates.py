@@ -0,0 +1,185 @@
+"""Declarative filters."""
+
+from __future__ import annotations
+
+import string
+from typing import Any, Iterable, Optional, Union
+
+from wingline import records
+from wingline.types import Payload, PayloadIterable
+
+Key = Union[str, tuple[str, ...]]
+
+_MISSING = object()
+
+# Characters a JSON encoder has no reason to escape (some escape <, >
+# and & for HTML safety). Needles are only built from these, so a raw
+# bytes search can't miss an escaped variant.
+_PLAIN_CHARACTERS = frozenset(
+    string.ascii_letters + string.digits + " !#$%'()*+,-.:;=?@[]^_`{|}~"
+)
+
+
+def _get(payload: Payload, key: Key) -> Any:
+    """Get a (possibly nested) value from a payload."""
+
+    if isinstance(key, str):
+        return payload.get(key, _MISSING)
+    value: Any = payload
+    for part in key:
+        if not isinstance(value, (dict, records.Record)):
+            return _MISSING
+        value = value.get(part, _MISSING)
+    return value
+
+
+def _needle(value: Any) -> Optional[bytes]:
+    """Return the bytes a JSON line must contain if it contains the value."""
+
+    if value is None:
+        return b"null"
+    if isinstance(value, str) and _PLAIN_CHARACTERS.issuperset(value):
+        return f'"{value}"'.encode("ascii")
+    # Numbers can be written many ways (1, 1.0, 1e0) so they get no
+    # needle, and neither do booleans, which equal 1 and 0.
+    return None
+
+
+class Predicate:
+    """A test against a single (possibly nested) key of a payload."""
+
+    def __init__(self, key: Key):
+        self.key = key
+        parts = (key,) if isinstance(key, str) else key
+        key_needles = [_needle(part) for part in parts]
+        self._key_needles = tuple(
+            needle for needle in key_needles if needle is not None
+        )
+
+    def test(self, value: Any) -> bool:
+        """Test the value found at the key."""
+
+        raise NotImplementedError
+
+    def value_needles(self) -> Optional[tuple[bytes, ...]]:
+        """Raw substrings, one of which a matching JSON line must contain."""
+
+        return None
+
+    def __call__(self, payload: Payload) -> bool:
+        value = _get(payload, self.key)
+        return value is not _MISSING and self.test(value)
+
+    def prefilter(self, line: bytes) -> bool:
+        """Cheaply rule out a raw JSON line before it's decoded.
+
+        False means the line can't match; True means it might.
+        """
+
+        for needle in self._key_needles:
+            if needle not in line:
+                return False
+        value_needles = self.value_needles()
+        if value_needles is None:
+            return True
+        return any(needle in line for needle in value_needles)
+
+
+class Equals(Predicate):
+    """The key equals a value."""
+
+    def __init__(self, key: Key, value: Any):
+        super().__init__(key)
+        self.value = value
+
+    def test(self, value: Any) -> bool:
+        return bool(value == self.value)
+
+    def value_needles(self) -> Optional[tuple[bytes, ...]]:
+        needle = _needle(self.value)
+        return None if needle is None else (needle,)
+
+
+class OneOf(Predicate):
+    """The key equals any of a collection of values."""
+
+    def __init__(self, key: Key, values: Iterable[Any]):
+        super().__init__(key)
+        self.values = tuple(values)
+
+    def test(self, value: Any) -> bool:
+        return value in self.values
+
+    def value_needles(self) -> Optional[tuple[bytes, ...]]:
+        needles = tuple(_needle(value) for value in self.values)
+        if any(needle is None for needle in needles):
+            return None
+        return needles  # type: ignore
+
+
+class Exists(Predicate):
+    """The key is present."""
+
+    def test(self, value: Any) -> bool:
+        return True
+
+
+class Prefix(Predicate):
+    """The key is a string starting with a prefix."""
+
+    def __init__(self, key: Key, prefix: str):
+        super().__init__(key)
+        self.prefix = prefix
+
+    def test(self, value: Any) -> bool:
+        return isinstance(value, str) and value.startswith(self.prefix)
+
+    def value_needles(self) -> Optional[tuple[bytes, ...]]:
+        needle = _needle(self.prefix)
+        # Drop the closing quote: the value carries on after the prefix.
+        return None if needle is None else (needle[:-1],)
+
+
+class Where:
+    """Keep only the payloads matching every predicate.
+
+    Keyword arguments are shorthand for `Equals` predicates. When a
+    `Where` directly follows a file source the execution plan pushes
+    its prefilter into the reader, so most non-matching JSON lines are
+    discarded before they're decoded.
+    """
+
+    def __init__(self, *predicates: Predicate, **equalities: Any):
+        self.predicates = predicates + tuple(
+            Equals(key, value) for key, value in equalities.items()
+        )
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        predicates = self.predicates
+        for payload in parent:
+            if all(predicate(payload) for predicate in predicates):
+                yield payload
+
+    @property
+    def fields(self) -> frozenset[str]:
+        """The top-level fields the predicates look at."""
+
+        return frozenset(
+            predicate.key if isinstance(predicate.key, str) else predicate.key[0]
+            for predicate in self.predicates
+        )
+
+    def prefilter(self, line: bytes) -> bool:
+        """False if a raw JSON line can't possibly match."""
+
+        return all(predicate.prefilter(line) for predicate in self.predicates)
+
+    def __and__(self, other: Where) -> Where:
+        return Where(*self.predicates, *other.predicates)
+
+
+where = Where
+equals = Equals
+one_of = OneOf
+exists = Exists
+prefix = Prefix
@@ -0,0 +1,25 @@
+"""Field projections."""
+
+from wingline.types import PayloadIterable
+
+
+class Select:
+    """Keep only the given top-level fields of each payload.
+
+    When a select directly follows a file source the execution plan
+    pushes the fields down into the reader, so unused fields are never
+    kept (and for some formats never decoded).
+    """
+
+    def __init__(self, *fields: str):
+        # A tuple rather than a set keeps the output key order, and
+        # the operation hash, stable between runs.
+        self.fields = tuple(dict.fromkeys(fields))
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        fields = self.fields
+        for payload in parent:
+            yield {key: payload[key] for key in fields if key in payload}
+
+
+select = Select
@@ -1,22 +1,23 @@
 """Head and tail ranges."""
 
 import collections
+import itertools
 
 from wingline.types import PayloadIterable
 
 
 class Head:
+    """Take the first `count` payloads.
+
+    Stopping early lets the plumbing upstream stop too, so the rest of
+    the source is never read.
+    """
+
     def __init__(self, count=10):
         self.count = count
-        self.seen = 0
 
     def __call__(self, parent: PayloadIterable) -> PayloadIterable:
-        for payload in parent:
-            if self.seen < self.count:
-                yield payload
-                self.seen += 1
-            else:
-                return
+        return itertools.islice(parent, self.count)
 
 
 head = Head
@@ -24,13 +25,10 @@ head = Head
 
 class Tail:
     def __init__(self, count: int = 10):
-        self.deque = collections.deque(maxlen=count)
+        self.count = count
 
     def __call__(self, parent: PayloadIterable) -> PayloadIterable:
-        for payload in parent:
-            self.deque.append(payload)
-        for payload in self.deque:
-            yield payload
+        yield from collections.deque(parent, maxlen=self.count)
 
 
 tail = Tail
@@ -0,0 +1,171 @@
+"""Seeded samplers.
+
+Every sampler is deterministic given its seed and its input, so a
+sampled pipeline hashes (and caches) like any other.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import random
+from typing import Any, Callable, Iterator, Optional, Union
+
+import msgpack
+
+from wingline import hasher
+from wingline.types import Payload, PayloadIterable
+
+Key = Union[str, Callable[[Payload], Any]]
+
+_HASH_RANGE = 1 << 64
+
+
+def _key_function(key: Key) -> Callable[[Payload], Any]:
+    if callable(key):
+        return key
+    return lambda payload: payload.get(key)
+
+
+def _uniform(generator: random.Random) -> float:
+    """A random number in the open interval (0, 1)."""
+
+    while not (number := generator.random()):
+        pass
+    return number
+
+
+def _reservoir(
+    payloads: Iterator[Payload], size: int, generator: random.Random
+) -> list[Payload]:
+    """Sample `size` payloads uniformly, in their original order.
+
+    This is Algorithm L, which draws random numbers only for the
+    payloads it keeps and skips over the rest.
+    """
+
+    if size <= 0:
+        return []
+    reservoir = list(enumerate(itertools.islice(payloads, size)))
+    if len(reservoir) < size:
+        return [payload for _, payload in reservoir]
+    index = size
+    weight = math.exp(math.log(_uniform(generator)) / size)
+    while True:
+        skip = math.floor(math.log(_uniform(generator)) / math.log1p(-weight))
+        index += skip
+        payload = next(itertools.islice(payloads, skip, None), None)
+        if payload is None:
+            break
+        reservoir[generator.randrange(size)] = (index, payload)
+        index += 1
+        weight *= math.exp(math.log(_uniform(generator)) / size)
+    return [payload for _, payload in sorted(reservoir, key=lambda item: item[0])]
+
+
+class Sample:
+    """A uniform sample of `n` payloads, kept in their original order.
+
+    Reads the input once, holding no more than `n` payloads.
+    """
+
+    def __init__(self, n: int, seed: int = 0):
+        self.n = n
+        self.seed = seed
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        yield from _reservoir(iter(parent), self.n, random.Random(self.seed))
+
+
+class SampleFraction:
+    """Keep each payload with probability `p`.
+
+    Without a `key`, payloads are picked by a seeded random generator
+    that skips straight to the next pick, so a small fraction costs
+    little more than reading the input. With a `key` (a field name or
+    a callable), a payload is picked by a hash of its key and the seed:
+    the same keys are picked whatever the order or source, so, say,
+    shows and their casts can be sampled alike.
+    """
+
+    def __init__(self, p: float, seed: int = 0, key: Optional[Key] = None):
+        if not 0 <= p <= 1:
+            raise ValueError("The fraction must be between 0 and 1.")
+        self.p = p
+        self.seed = seed
+        self.key = key
+
+    def _by_key(self, parent: PayloadIterable) -> Iterator[Payload]:
+        key = _key_function(self.key)  # type: ignore[arg-type]
+        threshold = self.p * _HASH_RANGE
+        salt = self.seed.to_bytes(16, "big", signed=True)
+        packer = msgpack.Packer(autoreset=True, default=str)
+        for payload in parent:
+            digest = hasher.hasher(packer.pack(key(payload)), salt=salt).digest()
+            if int.from_bytes(digest, "big") < threshold:
+                yield payload
+
+    def _by_skip(self, parent: PayloadIterable) -> Iterator[Payload]:
+        payloads = iter(parent)
+        if self.p == 1:
+            yield from payloads
+            return
+        generator = random.Random(self.seed)
+        log_q = math.log1p(-self.p)
+        while True:
+            # The gap to the next pick is geometrically distributed.
+            skip = math.floor(math.log(_uniform(generator)) / log_q)
+            payload = next(itertools.islice(payloads, skip, None), None)
+            if payload is None:
+                return
+            yield payload
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        if self.p == 0:
+            return iter(())
+        if self.key is not None:
+            return self._by_key(parent)
+        return self._by_skip(parent)
+
+
+class SampleStratified:
+    """A uniform sample of `n` payloads from each value of a key.
+
+    Holds up to `n` payloads per key value, and yields the samples
+    in their original order once the input is exhausted.
+    """
+
+    def __init__(self, key: Key, n: int, seed: int = 0):
+        self.key = key
+        self.n = n
+        self.seed = seed
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        if self.n <= 0:
+            # Like `Sample`, no room means an empty sample.
+            return
+        key = _key_function(self.key)
+        packer = msgpack.Packer(autoreset=True, default=str)
+        # Give each payload a seeded random priority and keep the `n`
+        # highest per stratum: a uniform sample without replacement.
+        generator = random.Random(self.seed)
+        strata: dict[bytes, list[tuple[float, int, Payload]]] = {}
+        for index, payload in enumerate(parent):
+            entry = (generator.random(), index, payload)
+            stratum = strata.setdefault(packer.pack(key(payload)), [])
+            if len(stratum) < self.n:
+                heapq.heappush(stratum, entry)
+            elif entry[0] > stratum[0][0]:
+                heapq.heapreplace(stratum, entry)
+        entries = sorted(
+            (entry for stratum in strata.values() for entry in stratum),
+            key=lambda entry: entry[1],
+        )
+        for _, _, payload in entries:
+            yield payload
+
+
+sample = Sample
+sample_fraction = SampleFraction
+sample_stratified = SampleStratified
@@ -0,0 +1,182 @@
+"""Bounded-memory summaries: top-k and quantiles.
+
+Both are aggregators, so they can summarise each group of a
+`group_by` or each window, and their partial states merge, so parts
+of a stream can be summarised separately and combined. Used as an
+operation, each summarises the whole stream.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import zlib
+from typing import Any, Callable, Iterable, Union
+
+from wingline.helpers.aggregation import Aggregator
+from wingline.types import Payload, PayloadIterable
+
+Key = Union[str, Callable[[Payload], Any]]
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# KLL accuracy: the top compactor's capacity. Rank error is about
+# 1.7 / K, so 200 gives answers within about 1% of the true rank.
+K = 200
+_SHRINK = 2 / 3
+
+
+def _key_function(key: Key) -> Callable[[Payload], Any]:
+    if callable(key):
+        return key
+    return lambda payload: payload.get(key)
+
+
+class TopK(Aggregator):
+    """The `n` payloads with the largest (or smallest) values of a key.
+
+    The key is a field name or a callable; payloads without a value
+    are skipped. As an operation, yields the payloads best first; as
+    an aggregator, its result is that list. Ties keep input order.
+    """
+
+    def __init__(self, n: int, key: Key, smallest: bool = False):
+        super().__init__()
+        self.n = n
+        self.key = key
+        self.smallest = smallest
+        self._key = _key_function(key)
+
+    def _trim(self, entries: list[Any]) -> list[Any]:
+        return sorted(entries, key=lambda entry: entry[0], reverse=not self.smallest)[
+            : self.n
+        ]
+
+    def initial(self) -> list[Any]:
+        return []
+
+    def add(self, state: list[Any], payload: Payload) -> list[Any]:
+        value = self._key(payload)
+        if value is None:
+            return state
+        if not isinstance(state, list):
+            state = list(state)
+        state.append((value, payload))
+        # Trim only once the state doubles, so each add is cheap.
+        return self._trim(state) if len(state) >= 2 * self.n else state
+
+    def merge(self, state: list[Any], other: list[Any]) -> list[Any]:
+        return self._trim([*state, *other])
+
+    def result(self, state: list[Any]) -> list[Payload]:
+        return [payload for _, payload in self._trim(state)]
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        key = self._key
+        select = heapq.nsmallest if self.smallest else heapq.nlargest
+        valued = (payload for payload in parent if key(payload) is not None)
+        yield from select(self.n, valued, key=key)
+
+
+class Quantiles(Aggregator):
+    """Approximate quantiles of a numeric field, from a KLL sketch.
+
+    The sketch keeps a stack of compactors, each item in level `h`
+    standing for `2 ** h` values; when a level fills up, it's sorted
+    and every other item is promoted. It holds O(k) values however
+    long the stream, and two sketches merge level by level.
+    Which items are promoted is decided by the items themselves, so
+    the same input always gives the same answers.
+
+    The result maps labels like "p50" and "p99.9" to values (None for
+    an empty stream). As an operation, yields the one summary payload.
+    """
+
+    def __init__(self, field: str, quantiles: Iterable[float] = QUANTILES, k: int = K):
+        super().__init__(field)
+        self.quantiles = tuple(quantiles)
+        if not all(0 <= quantile <= 1 for quantile in self.quantiles):
+            raise ValueError("Quantiles must be between 0 and 1.")
+        self.k = k
+
+    @staticmethod
+    def _levels(state: Any) -> list[list[Any]]:
+        # States come back from msgpack spills as tuples.
+        if isinstance(state, list) and all(isinstance(level, list) for level in state):
+            return state
+        return [list(level) for level in state]
+
+    def _capacity(self, level: int, height: int) -> int:
+        return max(2, math.ceil(self.k * _SHRINK ** (height - level - 1)))
+
+    def _compress(self, levels: list[list[Any]]) -> list[list[Any]]:
+        level = 0
+        while level < len(levels):
+            items = levels[level]
+            if len(items) >= self._capacity(level, len(levels)):
+                if level + 1 == len(levels):
+                    levels.append([])
+                items.sort()
+                # An odd item out stays; of the rest, every other one
+                # is promoted. Whether the odd or even ones go is a coin
+                # flip seeded by the items themselves, so it's unbiased
+                # but repeatable.
+                keep = items[:1] if len(items) % 2 else []
+                pairs = items[len(keep) :]
+                offset = zlib.crc32(repr((pairs[0], pairs[-1])).encode()) & 1
+                levels[level + 1].extend(pairs[offset::2])
+                levels[level] = keep
+            level += 1
+        return levels
+
+    def initial(self) -> list[list[Any]]:
+        return [[]]
+
+    def add(self, state: Any, payload: Payload) -> list[list[Any]]:
+        value = self._value(payload)
+        levels = self._levels(state)
+        if value is None:
+            return levels
+        levels[0].append(value)
+        if len(levels[0]) >= self._capacity(0, len(levels)):
+            self._compress(levels)
+        return levels
+
+    def merge(self, state: Any, other: Any) -> list[list[Any]]:
+        levels = [list(level) for level in self._levels(state)]
+        for height, items in enumerate(self._levels(other)):
+            if height == len(levels):
+                levels.append([])
+            levels[height].extend(items)
+        return self._compress(levels)
+
+    def result(self, state: Any) -> dict[str, Any]:
+        weighted = sorted(
+            (value, 1 << height)
+            for height, items in enumerate(self._levels(state))
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        result: dict[str, Any] = {}
+        for quantile in self.quantiles:
+            label = f"p{quantile * 100:g}"
+            if not total:
+                result[label] = None
+                continue
+            rank, seen = quantile * total, 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= rank:
+                    break
+            result[label] = value
+        return result
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        state = self.initial()
+        for payload in parent:
+            state = self.add(state, payload)
+        yield self.result(state)
+
+
+top_k = TopK
+quantiles = Quantiles
@@ -0,0 +1,126 @@
+"""External merge sort."""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import pathlib
+import tempfile
+from typing import Any, Callable, Iterator, Optional, Union
+
+import msgpack
+
+from wingline import records
+from wingline.files import formats
+from wingline.types import Payload, PayloadIterable
+
+# Encoded bytes of payloads held in memory before a sorted run is spilled.
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Runs merged at once: more are merged a batch at a time into new
+# runs first, so the number of open files stays bounded.
+MERGE_WIDTH = 64
+
+Key = Union[str, Callable[[Payload], Any]]
+
+
+def _key_function(key: Key) -> Callable[[Payload], Any]:
+    if callable(key):
+        return key
+    return lambda payload: payload[key]
+
+
+class Sort:
+    """Sort payloads by a key, in bounded memory.
+
+    The key is a field name or a callable (e.g. `operator.itemgetter`
+    for several fields). Payloads are buffered until their encoded size
+    reaches `memory_limit` bytes, then sorted and spilled to a msgpack
+    run in a temporary directory; the runs are then merged. Input that
+    fits in the budget is sorted in memory without touching the disk.
+    The sort is stable.
+    """
+
+    def __init__(
+        self,
+        key: Key,
+        reverse: bool = False,
+        memory_limit: int = MEMORY_LIMIT,
+        temp_dir: Optional[pathlib.Path] = None,
+    ):
+        self.key = key
+        self.reverse = reverse
+        self.memory_limit = memory_limit
+        self.temp_dir = temp_dir
+
+    def _spill(self, run: list[Payload], path: pathlib.Path) -> pathlib.Path:
+        with path.open("wb") as handle:
+            formats.Msgpack(handle).batch_writer(run)
+        return path
+
+    @staticmethod
+    def _read(path: pathlib.Path) -> Iterator[Payload]:
+        with path.open("rb") as handle:
+            yield from formats.Msgpack(handle).reader
+
+    def _merge(self, runs: list[pathlib.Path]) -> Iterator[Payload]:
+        return heapq.merge(
+            *map(self._read, runs),
+            key=_key_function(self.key),
+            reverse=self.reverse,
+        )
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        key = _key_function(self.key)
+        packer = msgpack.Packer(autoreset=True, default=records.default)
+        run: list[Payload] = []
+        size = 0
+        with contextlib.ExitStack() as stack:
+            runs: list[pathlib.Path] = []
+            directory: Optional[pathlib.Path] = None
+            for payload in parent:
+                run.append(payload)
+                size += len(packer.pack(payload))
+                if size < self.memory_limit:
+                    continue
+                if directory is None:
+                    directory = pathlib.Path(
+                        stack.enter_context(
+                            tempfile.TemporaryDirectory(
+                                prefix="wingline-sort-", dir=self.temp_dir
+                            )
+                        )
+                    )
+                run.sort(key=key, reverse=self.reverse)
+                runs.append(self._spill(run, directory / f"{len(runs)}.msgpack"))
+                run, size = [], 0
+
+            run.sort(key=key, reverse=self.reverse)
+            if directory is None:
+                yield from run
+                return
+            if run:
+                runs.append(self._spill(run, directory / f"{len(runs)}.msgpack"))
+            del run
+
+            # Runs are merged in the order they were written, so
+            # merging whole batches of neighbours keeps the sort stable.
+            generation = 0
+            while len(runs) > MERGE_WIDTH:
+                generation += 1
+                merged: list[pathlib.Path] = []
+                for start in range(0, len(runs), MERGE_WIDTH):
+                    batch = runs[start : start + MERGE_WIDTH]
+                    path = directory / f"{generation}-{len(merged)}.msgpack"
+                    with path.open("wb") as handle:
+                        msgpack_format = formats.Msgpack(handle)
+                        for payload in self._merge(batch):
+                            msgpack_format.writer(payload)
+                    for run_path in batch:
+                        run_path.unlink()
+                    merged.append(path)
+                runs = merged
+            yield from self._merge(runs)
+
+
+sort = Sort
@@ -0,0 +1,340 @@
+"""Windowed aggregation over a timestamp field."""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+import itertools
+import logging
+import math
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from wingline.helpers.aggregation import Aggregator
+from wingline.types import Payload, PayloadIterable
+
+logger = logging.getLogger(__name__)
+
+Key = Union[str, tuple[str, ...]]
+Duration = Union[int, float, datetime.timedelta]
+# A closed window: start, end, group key and aggregate states.
+Closed = tuple[float, float, Any, list[Any]]
+
+
+def _duration(duration: Duration) -> float:
+    if isinstance(duration, datetime.timedelta):
+        return duration.total_seconds()
+    return duration
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """Convert a timestamp (epoch seconds or ISO 8601) to epoch seconds."""
+
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        # Python 3.10's parser doesn't take a "Z" for UTC.
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def _formatter(value: Any) -> Callable[[float], Any]:
+    """Return a function writing seconds in the style of a timestamp."""
+
+    if isinstance(value, (int, float)):
+        return lambda seconds: seconds
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    timezone = value.tzinfo
+    if timezone is None:
+        return (
+            lambda seconds: datetime.datetime.fromtimestamp(
+                seconds, datetime.timezone.utc
+            )
+            .replace(tzinfo=None)
+            .isoformat()
+        )
+    return lambda seconds: datetime.datetime.fromtimestamp(
+        seconds, timezone
+    ).isoformat()
+
+
+class Windows:
+    """Base class for windows over a timestamp field.
+
+    Timestamps are epoch seconds or ISO 8601 strings (naive ones are
+    taken as UTC); window bounds come out in the style of the first
+    timestamp seen. Payloads without a timestamp are skipped.
+
+    Input may be out of order by up to `lateness` (seconds or a
+    timedelta): a window is only closed, and its aggregates emitted,
+    once the watermark (the latest timestamp seen, less `lateness`)
+    has passed it. Payloads for windows already closed are dropped
+    and counted in a warning. Only open windows are held in memory.
+    """
+
+    def __init__(self, time: str, key: Optional[Key] = None, lateness: Duration = 0):
+        self.time = time
+        self.key = key
+        self.lateness = _duration(lateness)
+
+    def aggregate(self, **aggregators: Aggregator) -> WindowAggregate:
+        return WindowAggregate(self, aggregators)
+
+    def run(
+        self,
+        events: Iterable[tuple[float, Any, Payload]],
+        aggregators: list[Aggregator],
+    ) -> Iterator[Closed]:
+        """Aggregate (seconds, key, payload) events into closed windows."""
+
+        raise NotImplementedError
+
+
+class _Fixed(Windows):
+    """Windows with fixed bounds, each payload falling in one or more."""
+
+    def assign(self, seconds: float) -> Iterable[tuple[float, float]]:
+        """Return the bounds of the windows a timestamp falls in."""
+
+        raise NotImplementedError
+
+    def run(
+        self,
+        events: Iterable[tuple[float, Any, Payload]],
+        aggregators: list[Aggregator],
+    ) -> Iterator[Closed]:
+        windows: dict[tuple[float, float, Any], list[Any]] = {}
+        # Windows by end, so the earliest to close is always first.
+        closing: list[tuple[float, float, int, Any]] = []
+        order = itertools.count()
+        watermark = -math.inf
+        late = 0
+        for seconds, key, payload in events:
+            added = False
+            for start, end in self.assign(seconds):
+                if end <= watermark:
+                    continue
+                states = windows.get((start, end, key))
+                if states is None:
+                    states = windows[start, end, key] = [
+                        aggregator.initial() for aggregator in aggregators
+                    ]
+                    heapq.heappush(closing, (end, start, next(order), key))
+                for index, aggregator in enumerate(aggregators):
+                    states[index] = aggregator.add(states[index], payload)
+                added = True
+            late += not added
+            if seconds - self.lateness > watermark:
+                watermark = seconds - self.lateness
+                while closing and closing[0][0] <= watermark:
+                    end, start, _, key = heapq.heappop(closing)
+                    yield start, end, key, windows.pop((start, end, key))
+        while closing:
+            end, start, _, key = heapq.heappop(closing)
+            yield start, end, key, windows.pop((start, end, key))
+        if late:
+            logger.warning("Dropped %s payloads for windows already closed.", late)
+
+
+class Tumbling(_Fixed):
+    """Back-to-back windows of `size` (seconds or a timedelta).
+
+    Windows are aligned to the epoch, so hourly windows start on the
+    hour (in UTC).
+    """
+
+    def __init__(
+        self,
+        time: str,
+        size: Duration,
+        key: Optional[Key] = None,
+        lateness: Duration = 0,
+    ):
+        super().__init__(time, key, lateness)
+        self.size = _duration(size)
+
+    def assign(self, seconds: float) -> Iterable[tuple[float, float]]:
+        start = math.floor(seconds / self.size) * self.size
+        return ((start, start + self.size),)
+
+
+class Sliding(_Fixed):
+    """Overlapping windows of `size`, starting every `step`."""
+
+    def __init__(
+        self,
+        time: str,
+        size: Duration,
+        step: Duration,
+        key: Optional[Key] = None,
+        lateness: Duration = 0,
+    ):
+        super().__init__(time, key, lateness)
+        self.size = _duration(size)
+        self.step = _duration(step)
+        if self.step <= 0 or self.step > self.size:
+            raise ValueError("The step must be positive and no more than the size.")
+
+    def assign(self, seconds: float) -> Iterable[tuple[float, float]]:
+        # Windows start on multiples of the step in (seconds - size, seconds].
+        step = self.step
+        first = (math.floor((seconds - self.size) / step) + 1) * step
+        count = math.floor(seconds / step) - round(first / step) + 1
+        starts = (first + step * index for index in range(count))
+        return [(start, start + self.size) for start in starts]
+
+
+class _Session:
+    __slots__ = ("start", "last", "states")
+
+    def __init__(self, start: float, last: float, states: list[Any]):
+        self.start = start
+        self.last = last
+        self.states = states
+
+
+class Session(Windows):
+    """Runs of payloads per key with no more than `gap` between them.
+
+    A session's bounds are its first and last timestamps.
+    """
+
+    def __init__(
+        self,
+        time: str,
+        gap: Duration,
+        key: Optional[Key] = None,
+        lateness: Duration = 0,
+    ):
+        super().__init__(time, key, lateness)
+        self.gap = _duration(gap)
+
+    def run(
+        self,
+        events: Iterable[tuple[float, Any, Payload]],
+        aggregators: list[Aggregator],
+    ) -> Iterator[Closed]:
+        gap = self.gap
+        sessions: dict[Any, list[_Session]] = {}
+        # Sessions by when they'd close; entries for sessions since
+        # extended or merged are skipped when they come up.
+        closing: list[tuple[float, int, Any, _Session]] = []
+        order = itertools.count()
+        watermark = -math.inf
+        late = 0
+
+        def close(key: Any, session: _Session) -> Closed:
+            sessions[key].remove(session)
+            if not sessions[key]:
+                del sessions[key]
+            return session.start, session.last, key, session.states
+
+        for seconds, key, payload in events:
+            open_sessions = sessions.setdefault(key, [])
+            touching = [
+                session
+                for session in open_sessions
+                if session.start - gap <= seconds <= session.last + gap
+            ]
+            if not touching and seconds + gap <= watermark:
+                late += 1
+                if not open_sessions:
+                    del sessions[key]
+                continue
+            if touching:
+                session = touching[0]
+                # A payload between two sessions joins them up.
+                for other in touching[1:]:
+                    open_sessions.remove(other)
+                    session.start = min(session.start, other.start)
+                    session.last = max(session.last, other.last)
+                    for index, aggregator in enumerate(aggregators):
+                        session.states[index] = aggregator.merge(
+                            session.states[index], other.states[index]
+                        )
+                session.start = min(session.start, seconds)
+                session.last = max(session.last, seconds)
+            else:
+                session = _Session(
+                    seconds,
+                    seconds,
+                    [aggregator.initial() for aggregator in aggregators],
+                )
+                open_sessions.append(session)
+            for index, aggregator in enumerate(aggregators):
+                session.states[index] = aggregator.add(session.states[index], payload)
+            heapq.heappush(closing, (session.last + gap, next(order), key, session))
+
+            if seconds - self.lateness > watermark:
+                watermark = seconds - self.lateness
+                while closing and closing[0][0] <= watermark:
+                    closes, _, key, session = heapq.heappop(closing)
+                    if closes == session.last + gap and session in sessions.get(
+                        key, ()
+                    ):
+                        yield close(key, session)
+        while closing:
+            closes, _, key, session = heapq.heappop(closing)
+            if closes == session.last + gap and session in sessions.get(key, ()):
+                yield close(key, session)
+        if late:
+            logger.warning("Dropped %s payloads for sessions already closed.", late)
+
+
+class WindowAggregate:
+    """Aggregate payloads per window (and per key, if there is one).
+
+    Each output payload has `window_start` and `window_end`, the key
+    field(s) and one field per aggregator, emitted as windows close.
+    """
+
+    def __init__(self, windows: Windows, aggregators: dict[str, Aggregator]):
+        if not aggregators:
+            raise ValueError("At least one aggregator is needed.")
+        self.windows = windows
+        self.aggregators = aggregators
+
+    def _events(
+        self, parent: PayloadIterable, first: list[Any]
+    ) -> Iterator[tuple[float, Any, Payload]]:
+        time, key = self.windows.time, self.windows.key
+        for payload in parent:
+            value = payload.get(time)
+            seconds = _seconds(value)
+            if seconds is None:
+                continue
+            if not first:
+                first.append(value)
+            if key is None:
+                group = None
+            elif isinstance(key, str):
+                group = payload.get(key)
+            else:
+                group = tuple(payload.get(field) for field in key)
+            yield seconds, group, payload
+
+    def __call__(self, parent: PayloadIterable) -> PayloadIterable:
+        first: list[Any] = []
+        names = list(self.aggregators)
+        aggregators = list(self.aggregators.values())
+        key = self.windows.key
+        closed = self.windows.run(self._events(parent, first), aggregators)
+        formatter = None
+        for start, end, group, states in closed:
+            if formatter is None:
+                formatter = _formatter(first[0])
+            payload = {"window_start": formatter(start), "window_end": formatter(end)}
+            if isinstance(key, str):
+                payload[key] = group
+            elif key is not None:
+                payload.update(zip(key, group))
+            for name, aggregator, state in zip(names, aggregators, states):
+                payload[name] = aggregator.result(state)
+            yield payload
+
+
+tumbling = Tumbling
+sliding = Sliding
+session = Session
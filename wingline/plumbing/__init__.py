@@ -1,17 +1,42 @@
-"""Core plumbing threads."""
-import pathlib
-from typing import Callable
-
-from wingline.files import containers, formats
-from wingline.plumbing import base
-from wingline.plumbing.file import IntermediateCacheFile
-from wingline.plumbing.pipe import Pipe
-from wingline.plumbing.pipeline import Pipeline
-from wingline.plumbing.writer import Writer
+"""Core plumbing threads.
+
+The plumbing classes are imported on first use, so importing a single
+plumbing module doesn't import the rest (and their file formats and
+containers) with it.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Callable
+
 from wingline.types import PayloadIterator
 
-PlumbingHook = Callable[[base.BasePlumbing], None]
-PayloadIteratorHook = Callable[[base.BasePlumbing, PayloadIterator], PayloadIterator]
+if TYPE_CHECKING:
+    from wingline.plumbing import base
+    from wingline.plumbing.file import IntermediateCacheFile
+    from wingline.plumbing.pipe import Pipe
+    from wingline.plumbing.pipeline import Pipeline
+    from wingline.plumbing.writer import Writer
+
+PlumbingHook = Callable[["base.BasePlumbing"], None]
+PayloadIteratorHook = Callable[["base.BasePlumbing", PayloadIterator], PayloadIterator]
+
+_LAZY = {
+    "IntermediateCacheFile": "file",
+    "Pipe": "pipe",
+    "Pipeline": "pipeline",
+    "Writer": "writer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
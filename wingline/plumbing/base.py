@@ -4,19 +4,36 @@ from __future__ import annotations
 import abc
 import logging
 import threading
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+from wingline.plumbing import hooks
+from wingline.types import SENTINEL, PayloadIterator
 
 logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
-    from wingline.plumbing import pipe, sink
+    from wingline.plumbing import PayloadIteratorHook, pipe, sink
+
+
+def close(iterator: Iterator[Any]) -> None:
+    """Close an iterator early, if it's the kind that can be closed."""
+
+    close_iterator = getattr(iterator, "close", None)
+    if close_iterator is not None:
+        close_iterator()
 
 
 class BasePlumbing(abc.ABC, threading.Thread):
-    """Abstract base class for plumbing elements."""
+    """Abstract base class for plumbing elements.
+
+    An element that wants no more input is cancelled. Cancellation
+    flows upstream: once all of an element's subscribers are cancelled,
+    it's cancelled too, so a tap stops reading as soon as nothing
+    downstream needs its payloads.
+    """
 
     _name: str
     hash: Optional[str] = None
-    parent: Optional[BasePlumbing] = None
+    parent: Optional[BasePlumbing]
     is_disabled: bool = False
     is_cached: bool = False
     will_cache: bool = False
@@ -25,19 +42,81 @@ class BasePlumbing(abc.ABC, threading.Thread):
     def __init__(self) -> None:
 
         # Initialize thread and basic ID.
-        super().__init__()
+        # Daemonic, so an abandoned pipeline can't keep the process alive.
+        super().__init__(daemon=True)
         self.name = self._name
+        self.parent = None
 
         # Initialize subscribers (downstream plumbing)
         self.subscribers: list[Union[pipe.Pipe, sink.Sink]] = []
 
+        # Initialize cancellation and error reporting.
+        self.cancelled = threading.Event()
+        self.input_exhausted = False
+        self.error: Optional[BaseException] = None
+
     def join(self):
+        if self.ident is not None:
+            # Started: wait for the thread's own end hooks (e.g. a
+            # writer flushing its last batch) as well as the subscribers.
+            threading.Thread.join(self)
         self._debug("Joining. Subscribers: %s", self.subscribers)
         for subscriber in self.subscribers:
             self._debug("   Waiting to join: %s", subscriber)
             subscriber.join()
         self._debug("      All subscribers joined.")
 
+    def cancel(self) -> None:
+        """Stop taking input, and cancel the parent if nothing else needs it."""
+
+        if self.cancelled.is_set():
+            return
+        self._debug("Cancelled.")
+        self.cancelled.set()
+        parent = self.parent
+        if parent is not None and all(
+            subscriber.cancelled.is_set() for subscriber in parent.subscribers
+        ):
+            parent.cancel()
+
+    def _iter_input(self) -> Iterator[Any]:
+        """Yield payloads from the input queue until the end or cancellation."""
+
+        get = self.input_queue.get  # type: ignore[attr-defined]
+        is_cancelled = self.cancelled.is_set
+        while not is_cancelled():
+            payload = get()
+            if payload is SENTINEL:
+                self.input_exhausted = True
+                return
+            yield payload
+
+    def chain(
+        self,
+        payloads: PayloadIterator,
+        payload_hooks: Iterable[PayloadIteratorHook],
+        label: str,
+    ) -> PayloadIterator:
+        """Wrap payloads in a chain of payload hooks, once per run.
+
+        Payloads are only logged one by one with debug logging on, so
+        otherwise they pass through no more generators than the hooks.
+        """
+
+        for hook in payload_hooks:
+            payloads = hook(self, payloads)
+        if hooks.logger.isEnabledFor(logging.DEBUG):
+            payloads = hooks.log_payloads(label)(self, payloads)
+        return payloads
+
+    def errors(self) -> Iterator[BaseException]:
+        """Yield errors raised in this element's thread or downstream."""
+
+        if self.error is not None:
+            yield self.error
+        for subscriber in self.subscribers:
+            yield from subscriber.errors()
+
     def subscribe(self, other: Union[pipe.Pipe, sink.Sink]) -> None:
         self.subscribers.append(other)
 
@@ -54,7 +54,8 @@ class ExecutionPlan:
             return self._steps
 
         if self.cache is None:
-            self._steps = self._raw_steps
+            self._steps = list(reversed(self._raw_steps))
+            self._push_down()
             return self._steps
 
         new_steps = []
@@ -68,8 +69,32 @@ class ExecutionPlan:
 
         new_steps.reverse()
         self._steps = new_steps
+        self._push_down()
         return self._steps
 
+    def _push_down(self) -> None:
+        """Let the source absorb the work of the operations that follow it.
+
+        Walks the chain of pipes downstream of the source for as long as
+        the source can take on each operation (e.g. a field projection).
+        Every element before the last absorbed pipe must have a single
+        subscriber, otherwise a sibling branch would see pushed-down
+        output it didn't ask for.
+        """
+
+        source = self._steps[0]
+        push_down = getattr(source, "push_down", None)
+        if push_down is None:
+            return
+        step = source
+        while len(step.subscribers) == 1:
+            step = step.subscribers[0]
+            if not isinstance(step, pipe.Pipe) or step.is_disabled:
+                return
+            if not push_down(step.operation):
+                return
+            step._debug("Pushed down into %s.", source)
+
     def _resolve_cache_steps(self, step: pipe.Pipe) -> Iterator[base.BasePlumbing]:
         """Determine if a cached copy exists or one should be made."""
 
@@ -107,6 +132,6 @@ class ExecutionPlan:
         """Pretty print the step graph."""
 
         output = ""
-        for i, step in enumerate(reversed(self.steps)):
+        for i, step in enumerate(self.steps):
             output = f"{output}\n{' ' * i} ↳ {step}"
         return output
@@ -3,22 +3,123 @@
 from __future__ import annotations
 
 import pathlib
+from typing import TYPE_CHECKING, Iterable, Optional, Union
 
-from wingline.files import file
+from wingline import hasher
+from wingline.files import file, file_set, sharding
+from wingline.files.reader import Reader
+from wingline.helpers import predicates, projections, ranges
 from wingline.plumbing import tap
 
+if TYPE_CHECKING:
+    from wingline.types import PipeOperation
+
 
 class File(tap.Tap):
+    """Tap reading a file.
+
+    Large plain or blocked gzip line files can be decoded by `workers`
+    processes in parallel. Unordered output from such a file isn't the
+    same stream as the file, so it gets its own hash. With `compact`, payloads come
+    out as records (see `wingline.records`): the same stream, so the
+    same hash.
+    """
 
     emoji = "📄"
 
-    def __init__(self, path: pathlib.Path):
+    def __init__(
+        self,
+        path: pathlib.Path,
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        compact: bool = False,
+    ):
         self._name = path.name
         if not path.exists():
             raise ValueError("%s doesn't exist", path)
-        self.file = file.File(path)
+        self.file = file.File(path, workers, ordered, compact)
         super().__init__(self.file, (str(self.file)))
         self._hash = self.file.content_hash
+        if workers and not ordered and sharding.is_splittable(self.file.reader):
+            self._hash = hasher.hasher(
+                f"{self._hash}|unordered".encode("utf-8")
+            ).hexdigest()
+        self._where: Optional[predicates.Where] = None
+
+    @property
+    def reader(self) -> Union[Reader, file_set.FileSet]:
+        """Whatever takes pushed-down fields and prefilters."""
+
+        return self.file.reader
+
+    def push_down(self, operation: PipeOperation) -> bool:
+        """Absorb what the reader can of an operation that follows this tap.
+
+        Returns True if the reader took on the operation's requirements,
+        in which case the planner may try the next operation too. The
+        operation itself still runs, so this is purely an optimisation.
+        """
+
+        reader = self.reader
+        if isinstance(operation, ranges.Tail):
+            if not isinstance(reader, Reader) or reader.prefilter is not None:
+                # A prefiltered tail isn't the tail of the whole file.
+                return False
+            reader.tail = operation.count
+            # Nothing that follows may be pushed below the tail.
+            return False
+        if isinstance(operation, projections.Select):
+            fields = frozenset(operation.fields)
+            if self._where is not None:
+                # The where runs on what the reader yields, so it must
+                # still see its fields; the select drops them after.
+                fields |= self._where.fields
+            if reader.fields is not None:
+                fields &= reader.fields
+            reader.fields = fields
+            return True
+        if isinstance(operation, predicates.Where):
+            where = operation if self._where is None else self._where & operation
+            self._where = where
+            reader.prefilter = where.prefilter
+            return True
+        return False
+
+
+class Files(File):
+    """Tap reading a set of files as one stream.
+
+    The source is a directory, a glob pattern, a manifest file or an
+    iterable of paths (see `file_set.expand`). Up to `readers` files
+    are read at once; `progress` reports how far each has got.
+    """
+
+    emoji = "🗂"
+
+    def __init__(
+        self,
+        source: Union[str, pathlib.Path, Iterable[pathlib.Path]],
+        readers: int = file_set.READERS,
+        ordered: bool = True,
+        compact: bool = False,
+    ):
+        self.file_set = file_set.FileSet(source, readers, ordered, compact)
+        self._name = str(self.file_set)
+        tap.Tap.__init__(self, self.file_set, self._name)
+        self._hash = self.file_set.content_hash
+        if not ordered:
+            self._hash = hasher.hasher(
+                f"{self._hash}|unordered".encode("utf-8")
+            ).hexdigest()
+        self._where = None
+
+    @property
+    def reader(self) -> file_set.FileSet:
+        return self.file_set
+
+    @property
+    def progress(self) -> dict[pathlib.Path, file_set.Progress]:
+        return self.file_set.progress
 
 
 class IntermediateCacheFile(File):
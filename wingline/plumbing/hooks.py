@@ -4,9 +4,6 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-import msgpack
-
-from wingline import hasher
 from wingline.types import PayloadIterator
 
 logger = logging.getLogger(__name__)
@@ -21,26 +18,21 @@ def log_payloads(
     def _inner(
         plumbing: base.BasePlumbing, payloads: PayloadIterator
     ) -> PayloadIterator:
-        for payload in payloads:
-            _inner.lines += 1
-            payload_hash = hasher.hasher(msgpack.packb(payload)).hexdigest()
+        for lines, payload in enumerate(payloads, 1):
             try:
                 qsize = plumbing.input_queue.qsize()
             except:
                 qsize = "??"
             logger.debug(
-                "%s: Ls%s|Qs%s %s |%s| %.10s",
+                "%s: Ls%s|Qs%s %s %.40s",
                 plumbing,
-                _inner.lines,
+                lines,
                 qsize,
                 message,
-                payload_hash,
                 payload,
             )
             yield payload
 
-    _inner.lines = 0
-
     return _inner
 
 
@@ -3,19 +3,14 @@ from __future__ import annotations
 
 import logging
 import pathlib
-from typing import TYPE_CHECKING, Optional
-
-import msgpack
+from typing import Optional
 
 from wingline import hasher, plumbing
-from wingline.plumbing import base, hooks, queue
-from wingline.types import SENTINEL, Payload, PayloadIterator, PipeOperation
+from wingline.plumbing import base, queue
+from wingline.types import SENTINEL, PayloadIterator, PipeOperation
 
 logger = logging.getLogger(__name__)
 
-if TYPE_CHECKING:
-    from wingline.plumbing import PayloadIteratorHook
-
 
 class Pipe(base.BasePlumbing):
     def __init__(
@@ -36,6 +31,7 @@ class Pipe(base.BasePlumbing):
 
         # Initialize hashing/caching
         self._hash: Optional[str] = None
+        self._cache_path: Optional[pathlib.Path] = None
         self.cache_dir: Optional[pathlib.Path] = cache_dir
 
         # Initialize queues.
@@ -48,78 +44,69 @@ class Pipe(base.BasePlumbing):
         self.start_hooks: list[plumbing.PlumbingHook] = []
         self.end_hooks: list[plumbing.PlumbingHook] = []
 
-    def run_payload_hook(
-        self, hook: PayloadIteratorHook, pipe: Pipe, payloads: PayloadIterator
-    ):
-        return hook(pipe, (payload for payload in payloads if payload is not SENTINEL))
-
     def run(self):
-        try:
-            self._debug("Starting?")
-            self.output_hooks.append(hooks.log_payloads("output"))
-            self.input_hooks.append(hooks.log_payloads("input"))
-            self.start_hooks.append(hooks.log_plumbing("Started."))
-            self.end_hooks.append(hooks.log_plumbing("Finished."))
-            self._debug("Starthooks added?")
-            self._debug("Starthooks calling subscribers %s", self.subscribers)
+        self._debug("Starting subscribers %s", self.subscribers)
 
-            [subscriber.start() for subscriber in self.subscribers]
+        [subscriber.start() for subscriber in self.subscribers]
 
-            self._debug("Started subscribers: %s", self.subscribers)
+        self._debug("Started subscribers: %s", self.subscribers)
 
+        payloads: PayloadIterator = iter(())
+        try:
             # Start hooks are called when a pipe or tap
             # starts generating items
             for hook in self.start_hooks:
                 hook(self)
-
-            terminate = False
-            logger.debug("Loop starting")
-            while True:
-                payload: Payload = self.input_queue.get(timeout=5)
-                logger.debug("Got payload %.20s", payload)
-                if payload is SENTINEL:
-                    terminate = True
-
-                iter_payload: PayloadIterator = iter([payload])
-                # Input hooks can read the input iter
-                # but should not modify it.
-                for hook in self.input_hooks:
-                    iter_payload = self.run_payload_hook(hook, self, iter_payload)
-
-                # The main operation hook takes the iterable of input items and
-                # return an iterable of output items.
-                #
-                # These may be, for example:
-                #   - the items unchanged
-                #   - the items modified in any way
-                #   - multiple new items adding to or replacing any input items
-                #   - the input filtered for specific items
-                #   - an empty iterable (if the input is to be discarded)
-                #
-                # Only a single operations is permitted per pipe
-                # So intermediate caches can be isolated.
-                if payload is not SENTINEL:
-                    iter_payload = self.operation(iter_payload)
-
-                # Output hooks can again read the iterable
-                # of processed output but must not modify it.
-                for hook in self.output_hooks:
-                    iter_payload = self.run_payload_hook(hook, self, iter_payload)
-
-                for payload in iter_payload:
-                    self.propagate(payload)
-                self.input_queue.task_done()
-                if terminate:
-                    self.propagate(SENTINEL)
+            self._debug("Started.")
+
+            # The input is streamed through the hooks and the operation
+            # once, rather than item by item, so an operation can keep
+            # state between items and stop early (e.g. `head`).
+            # Input hooks can read the input iter
+            # but should not modify it.
+            payloads = self.chain(self._iter_input(), self.input_hooks, "input")
+
+            # The main operation hook takes the iterable of input items and
+            # return an iterable of output items.
+            #
+            # These may be, for example:
+            #   - the items unchanged
+            #   - the items modified in any way
+            #   - multiple new items adding to or replacing any input items
+            #   - the input filtered for specific items
+            #   - an empty iterable (if the input is to be discarded)
+            #
+            # Only a single operations is permitted per pipe
+            # So intermediate caches can be isolated.
+            payloads = self.operation(payloads)
+
+            # Output hooks can again read the iterable
+            # of processed output but must not modify it.
+            payloads = self.chain(payloads, self.output_hooks, "output")
+
+            is_cancelled = self.cancelled.is_set
+            propagate = self.propagate
+            for payload in payloads:
+                if is_cancelled():
                     break
+                propagate(payload)
+
             # End hooks are called when a pipe or tap
             # finishes generating items
             for hook in self.end_hooks:
                 hook(self)
+            self._debug("Finished.")
         except Exception as exc:
             logger.error(exc)
             logger.exception(exc)
-            raise
+            self.error = exc
+        finally:
+            base.close(payloads)
+            self.propagate(SENTINEL)
+            if not self.input_exhausted:
+                # The operation stopped early or failed:
+                # nothing upstream is needed any more.
+                self.cancel()
 
     @property
     def hash(self):
@@ -174,25 +161,12 @@ class Pipe(base.BasePlumbing):
         return Pipe(self, operation, name=name)
 
     def propagate(self, item) -> None:
-        payload_hash = hasher.hasher(msgpack.packb(item)).hexdigest()
+        # This runs for every payload at every stage, so it does no more
+        # than hand the payload on (see `chain` for logging payloads).
         for subscriber in self.subscribers:
-            self._debug(
-                "Propagating |%s| to %s (%s)",
-                payload_hash,
-                subscriber,
-                subscriber.input_queue,
-            )
-            self._debug(
-                "Subscriber %s input qsize before: %s",
-                subscriber,
-                subscriber.input_queue.qsize(),
-            )
+            if subscriber.cancelled.is_set() and item is not SENTINEL:
+                continue
             subscriber.input_queue.put(item)
-            self._debug(
-                "Subscriber %s input qsize after: %s",
-                subscriber,
-                subscriber.input_queue.qsize(),
-            )
 
 
 def get_cache_path(hash: str, base_dir: pathlib.Path) -> pathlib.Path:
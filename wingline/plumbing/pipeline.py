@@ -1,16 +1,17 @@
 """High-level pipeline interface."""
 import logging
 import pathlib
-from time import sleep
-from typing import Optional
+from typing import Iterable, Optional
 
 from wingline.files import containers, formats
+from wingline.helpers import projections
 from wingline.plumbing import (
     base,
     execution,
     intermediate_cache,
     pipe,
     queue,
+    sharded_writer,
     sink,
     tap,
     utils,
@@ -32,6 +33,10 @@ class Pipeline:
 
     It also accepts multiple operations, and instantiates
     one ancestor pipe for each.
+
+    If `fields` is given, only those top-level fields of the source
+    are kept. For file sources the projection is pushed down into the
+    reader.
     """
 
     name: str
@@ -45,12 +50,15 @@ class Pipeline:
         *operations: PipeOperation,
         name: Optional[str] = None,
         cache_dir: Optional[pathlib.Path] = None,
+        fields: Optional[Iterable[str]] = None,
     ):
         # Basic init and id
         super().__init__()
         self.name = name if name is not None else self.__class__.__name__
         self.input_queue = queue.Queue()
         self.operations = list(operations)
+        if fields is not None:
+            self.operations.insert(0, projections.select(*fields))
 
         # If the source is not a wingline-native plumbing element
         # then wrap it in a tap (a one-ended pipe without an upstream
@@ -85,7 +93,9 @@ class Pipeline:
         sink: base.BasePlumbing = self.source
         for i, operation in enumerate(operations):
             operation_name = (
-                f"{self.name}" f"-{i+1}/{operations_count}" f"-{operation.__name__}"
+                f"{self.name}"
+                f"-{i+1}/{operations_count}"
+                f"-{getattr(operation, '__name__', operation.__class__.__name__)}"
             )
             sink = pipe.Pipe(parent=sink, operation=operation, name=operation_name)
 
@@ -111,6 +121,23 @@ class Pipeline:
         self.sink = writer.Writer(self.sink, path, format, container)
         return self
 
+    def write_sharded(
+        self,
+        directory: pathlib.Path,
+        format: type[formats.Format],
+        container: Optional[type[containers.Container]] = None,
+        **options,
+    ):
+        """Write the output across files in a directory.
+
+        See `sharded_writer.ShardedWriter` for the options.
+        """
+
+        self.sink = sharded_writer.ShardedWriter(
+            self.sink, directory, format, container, **options
+        )
+        return self
+
     @property
     def execution_plan(self):
         """Build an return an execution plan for the pipeline.
@@ -124,18 +151,19 @@ class Pipeline:
         return execution.ExecutionPlan(self.sink, self.cache)
 
     def start(self):
-        """Start the pipeline running."""
+        """Start the pipeline running, without waiting for it to finish."""
         plan = self.execution_plan
         logger.debug("Starting pipeline with the following execution plan:")
         logger.debug(plan.pretty())
         self.source = plan.source
         # utils.ThreadMonitor(self.source).start()
         self.source.start()
-        sleep(1)
-        self.source.join()
 
     def join(self) -> None:
+        """Wait for the pipeline to finish, raising the first error in it."""
         self.source.join()
+        for error in self.source.errors():
+            raise error
 
     def __iter__(self) -> PayloadIterator:
 
@@ -158,6 +186,14 @@ class Pipeline:
         else:
             iter_sink = self.sink
         self.start()
-        for payload in iter_sink:
-            yield payload
+        finished = False
+        try:
+            yield from iter_sink
+            finished = True
+        finally:
+            if not finished and iter_sink is not self.sink:
+                # Iteration stopped early: let the pipeline wind down
+                # rather than run to the end for nobody. Sinks doing
+                # their own work (e.g. writers) are left to finish.
+                iter_sink.cancel()
         self.join()
@@ -1,13 +1,17 @@
-"""A wrapper around Queue to give it a name and better repr."""
+"""A wrapper around SimpleQueue to give it a name and better repr.
+
+Plumbing queues are unbounded and nothing waits on them to drain, so
+the simpler `SimpleQueue` does, without the bookkeeping `Queue` pays
+for `task_done` and `join` on every item.
+"""
 
 import queue
-from typing import Optional
+from typing import Any, Optional
 
 
-class Queue(queue.Queue):
-    def __init__(self, *args, name: Optional[str] = None, **kwargs):
+class Queue(queue.SimpleQueue[Any]):
+    def __init__(self, name: Optional[str] = None):
         self.name = name
-        super().__init__(*args, **kwargs)
 
     def __str__(self) -> str:
         if self.name:
@@ -0,0 +1,213 @@
+"""Plumbed writer splitting output across several files."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import pathlib
+import queue
+import threading
+from typing import Any, Callable, Optional, Union
+
+import msgpack
+
+from wingline import hasher, json
+from wingline.files import containers, formats, writer
+from wingline.plumbing import base, sink
+from wingline.plumbing.writer import BATCH_SIZE
+from wingline.types import SENTINEL, Payload, PayloadIterator
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+TEMPLATE = "part-{shard:04}-{part:04}{suffix}"
+# Batches waiting for each shard's thread before the sink waits.
+QUEUE_SIZE = 4
+
+FORMAT_SUFFIXES: dict[type[formats.Format], str] = {
+    formats.JsonLines: ".jsonl",
+    formats.Msgpack: ".msgpack",
+}
+CONTAINER_SUFFIXES: dict[type[containers.Container], str] = {
+    containers.Bz2: ".bz2",
+    containers.Gzip: ".gz",
+    containers.Lz4: ".lz4",
+    containers.Xz: ".xz",
+    containers.Zstd: ".zst",
+}
+
+Key = Union[str, Callable[[Payload], Any]]
+
+
+def partition(value: Any, shards: int) -> int:
+    """Return a shard for a key value, stable across runs."""
+
+    digest = hasher.hasher(msgpack.packb(value, default=str)).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+class _Shard(threading.Thread):
+    """Thread writing one shard's batches, rotating files as they fill."""
+
+    def __init__(self, owner: ShardedWriter, number: int):
+        super().__init__(name=f"{owner._name}|shard-{number}", daemon=True)
+        self.owner = owner
+        self.number = number
+        self.batches: queue.Queue[Optional[list[Payload]]] = queue.Queue(QUEUE_SIZE)
+        self.files: list[dict[str, Any]] = []
+        self.error: Optional[BaseException] = None
+        self._writer: Optional[writer.Writer] = None
+
+    def _open(self) -> None:
+        owner = self.owner
+        name = owner.template.format(
+            shard=self.number, part=len(self.files), suffix=owner.suffix
+        )
+        path = owner.directory / name
+        self._writer = writer.Writer(path, owner.format, owner.container)
+        self._writer.__enter__()
+        self.files.append({"path": name, "shard": self.number, "records": 0})
+
+    def _close(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.__exit__(None, None, None)
+        entry = self.files[-1]
+        path = self.owner.directory / entry["path"]
+        entry["bytes"] = path.stat().st_size
+        entry["hash"] = hasher.hash_file(path)
+        self._writer = None
+
+    def _full(self) -> bool:
+        owner = self.owner
+        entry = self.files[-1]
+        if owner.max_records and entry["records"] >= owner.max_records:
+            return True
+        if owner.max_bytes:
+            # The file on disk lags behind what's been written, so
+            # count the bytes handed to the writer instead.
+            written = self._writer.bytes_written  # type: ignore[union-attr]
+            return written >= owner.max_bytes
+        return False
+
+    def _write(self, batch: list[Payload]) -> None:
+        max_records = self.owner.max_records
+        while batch:
+            if self._writer is None:
+                self._open()
+            entry = self.files[-1]
+            room = max_records - entry["records"] if max_records else len(batch)
+            chunk, batch = batch[:room], batch[room:]
+            self._writer.write_many(chunk)  # type: ignore[union-attr]
+            entry["records"] += len(chunk)
+            if self._full():
+                self._close()
+
+    def run(self) -> None:
+        try:
+            while (batch := self.batches.get()) is not None:
+                self._write(batch)
+            self._close()
+        except BaseException as exc:  # pylint: disable=broad-except
+            self.error = exc
+            # Keep draining so the sink never blocks on a dead shard.
+            while self.batches.get() is not None:
+                pass
+
+
+class ShardedWriter(sink.Sink):
+    """Sink writing payloads across several files in a directory.
+
+    Payloads go to `shards` shards round-robin, or by the hash of
+    `key` (a field name or a callable) so equal keys share a shard.
+    Each shard is written (and compressed) by its own thread, and
+    starts a new file once it holds `max_records` payloads or
+    `max_bytes` bytes have been written to it, before compression
+    (checked after each batch). When done,
+    a manifest of the files, with their record counts, sizes and
+    hashes, is written alongside them.
+    """
+
+    def __init__(
+        self,
+        parent: base.BasePlumbing,
+        directory: pathlib.Path,
+        format: type[formats.Format],
+        container: Optional[type[containers.Container]] = None,
+        shards: int = 1,
+        key: Optional[Key] = None,
+        max_records: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        template: str = TEMPLATE,
+        name: Optional[str] = None,
+        batch_size: int = BATCH_SIZE,
+    ):
+        name = name if name is not None else f"ShardedWriter|{directory.name}"
+        super().__init__(parent, name)
+        if shards < 1:
+            raise ValueError("At least one shard is needed.")
+        self.directory = directory
+        self.format = format
+        self.container = container
+        self.shards = shards
+        self.key = key
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.template = template
+        self.suffix = FORMAT_SUFFIXES.get(format, "") + CONTAINER_SUFFIXES.get(
+            container, ""  # type: ignore[arg-type]
+        )
+        self.batch_size = batch_size
+        self.manifest: list[dict[str, Any]] = []
+        self._round_robin = itertools.cycle(range(shards))
+        self._batches: list[list[Payload]] = [[] for _ in range(shards)]
+        self._shards: list[_Shard] = []
+        self.start_hooks.append(self.open_shards)
+        self.end_hooks.append(self.close_shards)
+        self.input_hooks.append(self.write)
+
+    def _shard_for(self, payload: Payload) -> int:
+        if self.key is None:
+            return next(self._round_robin)
+        if callable(self.key):
+            value = self.key(payload)
+        else:
+            value = payload.get(self.key)
+        return partition(value, self.shards)
+
+    def open_shards(self, *_: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._shards = [_Shard(self, number) for number in range(self.shards)]
+        for shard in self._shards:
+            shard.start()
+
+    def flush(self, number: int) -> None:
+        """Hand a shard's buffered payloads to its thread."""
+
+        if self._batches[number]:
+            self._shards[number].batches.put(self._batches[number])
+            self._batches[number] = []
+
+    def close_shards(self, *_: Any) -> None:
+        for number, shard in enumerate(self._shards):
+            self.flush(number)
+            shard.batches.put(None)
+        for shard in self._shards:
+            shard.join()
+        for shard in self._shards:
+            if shard.error is not None:
+                raise shard.error
+        self.manifest = [entry for shard in self._shards for entry in shard.files]
+        manifest_path = self.directory / MANIFEST_NAME
+        manifest_path.write_text(json.dumps({"files": self.manifest}, indent=2))
+
+    def write(self, _: base.BasePlumbing, payloads: PayloadIterator) -> PayloadIterator:
+        """Buffer items to write to their shards."""
+        for payload in payloads:
+            if payload is not SENTINEL:
+                number = self._shard_for(payload)
+                batch = self._batches[number]
+                batch.append(payload)
+                if len(batch) >= self.batch_size:
+                    self.flush(number)
+            yield payload
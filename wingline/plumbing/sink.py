@@ -1,14 +1,14 @@
 """Sink class"""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+import logging
+from typing import Optional
 
 from wingline import plumbing
-from wingline.plumbing import base, hooks, queue
+from wingline.plumbing import base, queue
 from wingline.types import SENTINEL, PayloadIterator
 
-if TYPE_CHECKING:
-    from wingline.plumbing import PayloadIteratorHook
+logger = logging.getLogger(__name__)
 
 
 class Sink(base.BasePlumbing):
@@ -41,55 +41,41 @@ class Sink(base.BasePlumbing):
         self.start_hooks: list[plumbing.PlumbingHook] = []
         self.end_hooks: list[plumbing.PlumbingHook] = []
 
-    def run_payload_hook(
-        self,
-        hook: PayloadIteratorHook,
-        pipe: base.BasePlumbing,
-        payloads: PayloadIterator,
-    ):
-        return hook(pipe, (payload for payload in payloads if payload is not SENTINEL))
-
     def run(self):
-        self.input_hooks.append(hooks.log_payloads("input"))
-        self.start_hooks.append(hooks.log_plumbing("Started."))
-        self.end_hooks.append(hooks.log_plumbing("Finished."))
+        payloads: PayloadIterator = iter(())
+        try:
+            # Start hooks are called when a pipe or tap
+            # starts generating items
+            for hook in self.start_hooks:
+                hook(self)
+            self._debug("Started.")
 
-        # Start hooks are called when a pipe or tap
-        # starts generating items
-        for hook in self.start_hooks:
-            hook(self)
-
-        terminate = False
-        while True:
-            payload = self.input_queue.get(timeout=30)
-            if payload is SENTINEL:
-                terminate = True
-
-            iter_payload = iter((payload,))
             # Input hooks can read the input iter
             # but should not modify it.
-            for hook in self.input_hooks:
-                iter_payload = self.run_payload_hook(hook, self, iter_payload)
-
-            for payload in iter_payload:
-                self.iter_queue.put(payload)
-            self.input_queue.task_done()
-            if terminate:
-                self.iter_queue.put(SENTINEL)
-                break
-        # End hooks are called when a pipe or tap
-        # finishes generating items
-        for hook in self.end_hooks:
-            hook(self)
+            payloads = self.chain(self._iter_input(), self.input_hooks, "input")
+
+            put = self.iter_queue.put
+            for payload in payloads:
+                put(payload)
+
+            # End hooks are called when a pipe or tap
+            # finishes generating items
+            for hook in self.end_hooks:
+                hook(self)
+            self._debug("Finished.")
+        except Exception as exc:
+            logger.exception(exc)
+            self.error = exc
+        finally:
+            base.close(payloads)
+            self.iter_queue.put(SENTINEL)
+            if not self.input_exhausted:
+                self.cancel()
 
     def __iter__(self):
-        terminate = False
+        get = self.iter_queue.get
         while True:
-            payload = self.iter_queue.get(timeout=5)
-            self.iter_queue.task_done()
+            payload = get()
             if payload is SENTINEL:
-                terminate = True
-            else:
-                yield payload
-            if terminate:
                 break
+            yield payload
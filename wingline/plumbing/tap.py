@@ -7,8 +7,8 @@ from typing import TYPE_CHECKING, Optional
 
 import msgpack
 
-from wingline import hasher
-from wingline.plumbing import base, hooks, pipe
+from wingline import hasher, records
+from wingline.plumbing import base, pipe
 from wingline.types import SENTINEL, PayloadIterable, PayloadIterator
 
 if TYPE_CHECKING:
@@ -30,39 +30,48 @@ class Tap(base.BasePlumbing):
         self.output_hooks: list[PayloadIteratorHook] = []
 
     def run(self) -> None:
-        self.output_hooks.append(hooks.log_payloads("output"))
         self._debug("Starting subscribers %s", self.subscribers)
         [subscriber.start() for subscriber in self.subscribers]
         self._debug("Subscribers started")
-        for payload in self._iter_input():
-            # Output hooks can again read the iterable
-            # of processed output but must not modify it.
-            iter_payload = iter((payload,))
-            for hook in self.output_hooks:
-                iter_payload = hook(self, iter_payload)
-            for payload in iter_payload:
-                self.propagate(payload)
+        # Output hooks can again read the iterable
+        # of processed output but must not modify it.
+        payloads = self.chain(self._iter_input(), self.output_hooks, "output")
+        propagate = self.propagate
+        try:
+            for payload in payloads:
+                propagate(payload)
+        except Exception as exc:
+            logger.exception(exc)
+            self.error = exc
+        finally:
+            base.close(payloads)
+            logger.debug("Content iterator finished: passing SENTINEL.")
+            self.propagate(SENTINEL)
 
     def _iter_input(self) -> PayloadIterator:
         # Progressively hash the content
         # if it has not been provided by
         # a subclass (e.g. the file hash
         # in the case of a File tap.
+        # Stopping early (when cancelled) closes the source,
+        # and leaves the hash of partly read content unset.
         content_hash = hasher.hasher() if self._hash is None else None
 
-        for item in self._input_iterator:
+        try:
+            for item in self._input_iterator:
+                if self.cancelled.is_set():
+                    self._debug("Cancelled: closing the source.")
+                    return
+                if content_hash is not None:
+                    content_hash.update(msgpack.packb(item, default=records.default))
+                yield item
             if content_hash is not None:
-                content_hash.update(msgpack.packb(item))
-            yield item
-        if content_hash is not None:
-            self._hash = content_hash.hexdigest()
-        logger.debug("Content iterator exhausted: passing SENTINEL.")
-        yield SENTINEL
+                self._hash = content_hash.hexdigest()
+        finally:
+            base.close(self._input_iterator)
 
     def __iter__(self) -> PayloadIterator:
-        for payload in self._iter_input():
-            if payload is not SENTINEL:
-                yield payload
+        yield from self._iter_input()
 
     @property
     def hash(self):
@@ -73,5 +82,6 @@ class Tap(base.BasePlumbing):
 
     def propagate(self, item) -> None:
         for subscriber in self.subscribers:
-            self._debug("Propagating %.20s to %s", item, subscriber)
+            if subscriber.cancelled.is_set() and item is not SENTINEL:
+                continue
             subscriber.input_queue.put(item)
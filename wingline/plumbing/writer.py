@@ -8,12 +8,21 @@ from typing import Optional
 
 from wingline.files import containers, formats, writer
 from wingline.plumbing import base, sink
-from wingline.types import SENTINEL, PayloadIterator
+from wingline.types import SENTINEL, Payload, PayloadIterator
 
 logger = logging.getLogger(__name__)
 
+# Payloads encoded and written at a time.
+BATCH_SIZE = 4096
+
 
 class Writer(sink.Sink):
+    """Sink writing payloads to a file.
+
+    Payloads are buffered and handed to the format in batches of
+    `batch_size`, so each batch is encoded and written in one go.
+    """
+
     def __init__(
         self,
         parent: base.BasePlumbing,
@@ -21,12 +30,15 @@ class Writer(sink.Sink):
         format: type[formats.Format],
         container: Optional[type[containers.Container]] = None,
         name: Optional[str] = None,
+        batch_size: int = BATCH_SIZE,
     ):
         name = name if name is not None else self.__class__.name
         super().__init__(parent, name)
         self.path = path
         self.format = format
         self.container = container
+        self.batch_size = batch_size
+        self._batch: list[Payload] = []
         self.start_hooks.append(self.open_writer)
         self.end_hooks.append(self.close_writer)
         self.input_hooks.append(self.write)
@@ -35,12 +47,22 @@ class Writer(sink.Sink):
         self._writer = writer.Writer(self.path, self.format, self.container)
         self._write = self._writer.__enter__()
 
+    def flush(self) -> None:
+        """Write out the buffered payloads."""
+
+        if self._batch:
+            self._writer.write_many(self._batch)
+            self._batch = []
+
     def close_writer(self, *_):
+        self.flush()
         self._writer.__exit__(None, None, None)
 
     def write(self, _, payloads: PayloadIterator) -> PayloadIterator:
-        """Write an item to the file."""
+        """Buffer items to write to the file."""
         for payload in payloads:
             if payload is not SENTINEL:
-                self._write(payload)
+                self._batch.append(payload)
+                if len(self._batch) >= self.batch_size:
+                    self.flush()
             yield payload
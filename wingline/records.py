@@ -0,0 +1,120 @@
+"""Compact, read-only payloads.
+
+A `Record` holds its values in a tuple and its field names in a shared
+`Schema`, so a million records with the same fields keep one copy of
+the names and no hash table each. Records are mappings, so operations
+that read payloads (`payload["id"]`, `payload.get`, `{**payload}`,
+`dict(payload)`) work on them unchanged; operations that change a
+payload make a new dict instead, e.g. `{**payload, "seen": True}`.
+
+Readers emit records when asked to (`compact=True`) and the formats
+write them without first copying them into dicts.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+from wingline.types import Payload
+
+# Schemas interned at most. Past this, data with ever-changing field
+# sets still gets records, just with schemas of their own.
+MAX_SCHEMAS = 10_000
+
+_SCHEMAS: dict[tuple[str, ...], Schema] = {}
+
+
+class Schema:
+    """The field names of a record, in order."""
+
+    __slots__ = ("fields", "index")
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = fields
+        self.index = {field: position for position, field in enumerate(fields)}
+
+    @classmethod
+    def of(cls, fields: tuple[str, ...]) -> Schema:
+        """Return the shared schema for these fields."""
+
+        schema = _SCHEMAS.get(fields)
+        if schema is None:
+            schema = cls(tuple(map(sys.intern, fields)))
+            if len(_SCHEMAS) < MAX_SCHEMAS:
+                _SCHEMAS[fields] = schema
+        return schema
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Schema.of, (self.fields,)
+
+    def __repr__(self) -> str:
+        return f"Schema{self.fields!r}"
+
+
+class Record(Mapping[str, Any]):
+    """A read-only payload: a schema and a tuple of values."""
+
+    __slots__ = ("schema", "_values")
+
+    def __init__(self, schema: Schema, values: tuple[Any, ...]):
+        self.schema = schema
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self.schema.index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.schema.index.get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.fields)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record) and other.schema is self.schema:
+            return other._values == self._values
+        return super().__eq__(other)
+
+    def pairs(self) -> list[tuple[str, Any]]:
+        return list(zip(self.schema.fields, self._values))
+
+    def as_dict(self) -> Payload:
+        return dict(zip(self.schema.fields, self._values))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Record, (self.schema, self._values)
+
+    def __repr__(self) -> str:
+        return f"Record({self.as_dict()!r})"
+
+
+def compact(payload: Payload) -> Record:
+    """Return a payload as a record, sharing its schema with its kind."""
+
+    if isinstance(payload, Record):
+        return payload
+    return Record(Schema.of(tuple(payload)), tuple(payload.values()))
+
+
+def default(value: Any) -> Any:
+    """Serialise records nested in values; a `default` for msgpack."""
+
+    if isinstance(value, Record):
+        return value.as_dict()
+    raise TypeError(f"Can't serialise {type(value).__name__}.")
+
+
+def default_str(value: Any) -> Any:
+    """Serialise records nested in values, and anything else as a string."""
+
+    if isinstance(value, Record):
+        return value.as_dict()
+    return str(value)
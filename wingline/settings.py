@@ -1,25 +1,70 @@
-"""Settings."""
+"""Settings.
+
+Read from `WL_`-prefixed environment variables (in any case), e.g.
+`WL_DEBUG=1` or `WL_LOG_DIR=/var/log/wingline`. Parsed by hand rather
+than with pydantic, which takes longer to import than a short run of
+the CLI takes to do its work.
+"""
 
 # pylint: disable=too-few-public-methods
 
+import os
 import pathlib
-from typing import Optional
+from typing import Any, Callable, Mapping, Optional
+
+ENV_PREFIX = "WL_"
+
+_TRUE = {"1", "on", "t", "true", "y", "yes"}
+_FALSE = {"0", "off", "f", "false", "n", "no"}
 
-import pydantic
 
+def _boolean(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
 
-class Settings(pydantic.BaseSettings):
+
+class Settings:
     """Application settings class."""
 
     debug = False
     testing = False
     log_dir: Optional[pathlib.Path] = None
+    # Where gzip random-access indexes are kept (see `gzip_index`).
+    index_dir: Optional[pathlib.Path] = None
+    # Whether to save gzip indexes at all. Saving one on a first read
+    # costs a hash of the whole file.
+    gzip_index = True
+
+    _parsers: dict[str, Callable[[str], Any]] = {
+        "debug": _boolean,
+        "testing": _boolean,
+        "log_dir": pathlib.Path,
+        "index_dir": pathlib.Path,
+        "gzip_index": _boolean,
+    }
 
-    class Config:
-        """Config metadata for the settings."""
+    def __init__(self, environ: Optional[Mapping[str, str]] = None):
+        environ = os.environ if environ is None else environ
+        variables = {name.upper(): value for name, value in environ.items()}
+        for field, parse in self._parsers.items():
+            value = variables.get(f"{ENV_PREFIX}{field}".upper())
+            if value is not None:
+                try:
+                    setattr(self, field, parse(value))
+                except ValueError as exc:
+                    raise ValueError(
+                        f"Invalid {ENV_PREFIX}{field.upper()}: {exc}"
+                    ) from exc
 
-        case_sensitive = False
-        env_prefix = "WL_"
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._parsers
+        )
+        return f"Settings({fields})"
 
 
 settings = Settings()